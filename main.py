@@ -8,22 +8,50 @@ filters for fantasy-relevant items, and generates a daily digest.
 Usage:
     python main.py                    # Use LLM if API key available, otherwise simple digest
     python main.py --no-llm          # Force simple digest (no LLM API calls)
+    python main.py --league ID       # Only players available in a Sleeper league (repeatable)
+    python main.py --min-score 2.5   # Only items scoring at least 2.5 for relevance
+    python main.py --top-k 40        # Only the 40 most relevant items
+    python main.py --map-reduce      # Summarize big news days in parallel chunks
+    python main.py --stream          # Write the LLM digest section by section as it arrives
+    python main.py --no-cache        # Call the LLM without reading or writing its caches
+    python main.py --refresh-cache   # Call the LLM again and replace its cached responses
+    python main.py --deadline 45     # Have a digest on disk within 45 seconds, upgrade it later
+    python main.py --no-cluster      # Keep every report instead of one item per story
+    python main.py --format html     # Write the local digest as HTML (or json)
+    python main.py --incremental     # Only process what changed since the last run today
+    python main.py --daemon          # Keep running: incremental digests every 30 minutes
+    python main.py --daemon --interval 15  # ... every 15 minutes
+    python main.py --watchlists      # Also write a digest per user from watchlists.json
     python main.py --help            # Show this help message
 """
 
 import sys
 import os
 import argparse
+import itertools
+import time
 from datetime import datetime
 
 # Add src to path so we can import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.data_fetchers import fetch_all_news
-from src.news_filter import filter_relevant_news, categorize_news
-from src.llm_integration import generate_digest, generate_simple_digest
-from src.digest_formatter import write_digest
-from src.config import OPENAI_API_KEY
+from src.pipeline import build_pipeline
+from src.relevance_scoring import score_news_batch, select_by_score
+from src.llm_integration import generate_digest, generate_digest_by_deadline, generate_simple_digest, stream_digest
+from src.digest_formatter import (write_digest, write_digest_stream, write_digest_progressive,
+                                  render_simple_digest, digest_filepath, delta_digest_filepath)
+from src.league_ingestion import LeagueRosterIngestor
+from src.story_clustering import cluster_stories, compact_stories
+from src.digest_renderer import DIGEST_FORMATS, render_digest
+from src.run_state import RunState
+from src.run_coordination import FileLease
+from src.player_timeline import get_player_timeline
+from src.data_fetchers import poll_sleeper_trending, fetch_sleeper_player_details
+from src.watchlists import WatchlistIndex, write_watchlist_digests
+from src.daemon import Scheduler, run_daemon
+from src.config import (OPENAI_API_KEY, LLM_TIMEOUT_SECONDS, DAEMON_DIGEST_INTERVAL_SECONDS,
+                        DAEMON_TRENDING_INTERVAL_SECONDS, WATCHLISTS_FILE, WATCHLIST_OUTPUT_DIR,
+                        SLEEPER_LEAGUE_IDS)
 
 
 def main():
@@ -36,6 +64,21 @@ def main():
 Examples:
   python main.py                    # Use LLM if API key available, otherwise simple digest
   python main.py --no-llm          # Force simple digest (no LLM API calls)
+  python main.py --league 123456   # Only players available in a Sleeper league
+  python main.py --league 1 --league 2  # Only players available in at least one of them
+  python main.py --min-score 2.5   # Only items scoring at least 2.5 for relevance
+  python main.py --top-k 40        # Only the 40 most relevant items
+  python main.py --map-reduce      # Summarize big news days in parallel chunks
+  python main.py --no-cache        # Call the LLM without reading or writing its caches
+  python main.py --refresh-cache   # Call the LLM again and replace its cached responses
+  python main.py --stream          # Write the LLM digest section by section as it arrives
+  python main.py --deadline 45     # Have a digest on disk within 45 seconds, upgrade it later
+  python main.py --no-cluster      # Keep every report instead of one item per story
+  python main.py --format html     # Write the local digest as HTML (or json)
+  python main.py --incremental     # Only process what changed since the last run today
+  python main.py --daemon          # Keep running: incremental digests every 30 minutes
+  python main.py --daemon --interval 15  # ... every 15 minutes
+  python main.py --watchlists      # Also write a digest per user from watchlists.json
   python main.py --help            # Show this help message
         """
     )
@@ -46,16 +89,135 @@ Examples:
         help='Force simple digest generation without LLM API calls (saves API costs)'
     )
     
+    parser.add_argument(
+        '--league',
+        metavar='LEAGUE_ID',
+        action='append',
+        help='Only include players available on the waiver wire in this Sleeper league; repeat '
+             'to keep players available in any of several leagues (default: SLEEPER_LEAGUE_IDS). '
+             'Items without a Sleeper player ID, such as FantasyPros articles, are always kept'
+    )
+    
+    parser.add_argument(
+        '--min-score',
+        type=float,
+        help='Only keep news items with at least this relevance score'
+    )
+    
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        help='Only keep the K highest-scoring news items'
+    )
+    
+    llm_mode = parser.add_mutually_exclusive_group()
+    llm_mode.add_argument(
+        '--map-reduce',
+        action='store_true',
+        help='Summarize news in concurrent LLM chunks and merge them (faster on big news days)'
+    )
+    llm_mode.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream the LLM digest into the file section by section as it is generated'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the LLM caches: call the LLM for the digest and article summaries '
+             'without reading or writing cached responses'
+    )
+    
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        help='Call the LLM for the digest and article summaries again and replace the cached responses'
+    )
+    
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        metavar='SECONDS',
+        help='Write the best digest available within SECONDS of starting (the local digest '
+             'if the LLM is not done), then upgrade it in place when the LLM finishes'
+    )
+    
+    parser.add_argument(
+        '--no-cluster',
+        action='store_true',
+        help='Keep every report of a story instead of collapsing near-duplicates into one item '
+             '(with --no-llm, also streams the simple digest with constant memory)'
+    )
+    
+    parser.add_argument(
+        '--format',
+        dest='digest_format',
+        choices=list(DIGEST_FORMATS),
+        default='markdown',
+        help='Output format; html and json render the local digest (the LLM digest is Markdown)'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only process news that is new or updated since the last run today; write a '
+             '"what changed" digest and update the cumulative daily digest'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and build incremental digests on a schedule, reusing loaded '
+             'player data, scraped-URL history and connections between cycles'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=float,
+        metavar='MINUTES',
+        help=f'Minutes between digest cycles with --daemon (default: {DAEMON_DIGEST_INTERVAL_SECONDS / 60:.0f})'
+    )
+    
+    parser.add_argument(
+        '--watchlists',
+        nargs='?',
+        const=WATCHLISTS_FILE,
+        metavar='FILE',
+        help=f'Also write each user a digest of the news about the players and teams on their '
+             f'watchlist (default file: {WATCHLISTS_FILE})'
+    )
+    
     args = parser.parse_args()
+    if args.interval is not None and not args.daemon:
+        parser.error("--interval only applies with --daemon")
+    # Each daemon cycle is an incremental run
+    args.incremental = args.incremental or args.daemon
+    if args.incremental and (args.stream or args.map_reduce or args.deadline is not None):
+        parser.error("--incremental and --daemon build local digests and cannot be combined with "
+                     "--stream, --map-reduce or --deadline")
+    if args.deadline is not None and args.stream:
+        parser.error("--deadline cannot be combined with --stream")
+    if args.digest_format != "markdown" and (args.stream or args.map_reduce or args.deadline is not None):
+        parser.error(f"--format {args.digest_format} renders the local digest and cannot be combined "
+                     "with --stream, --map-reduce or --deadline")
+    run_start = time.monotonic()
     
     print("NFL Fantasy Waiver Digest Generator (with Web Scraping)")
     print("=" * 60)
     
     # Determine whether to use LLM
-    use_llm = OPENAI_API_KEY and not args.no_llm
+    use_llm = OPENAI_API_KEY and not args.no_llm and args.digest_format == "markdown" and not args.incremental
     
-    if args.no_llm:
+    if args.daemon:
+        interval = args.interval * 60 if args.interval is not None else DAEMON_DIGEST_INTERVAL_SECONDS
+        print(f"Mode: Daemon (incremental digest every {interval / 60:.0f} min, Ctrl+C to stop)")
+    elif args.incremental:
+        print("Mode: Incremental (what changed since the last run, plus the cumulative daily digest)")
+    elif args.no_llm:
         print("Mode: Simple digest (LLM disabled by --no-llm flag)")
+    elif args.digest_format != "markdown":
+        print(f"Mode: Simple digest ({args.digest_format} output)")
     elif not OPENAI_API_KEY:
         print("Mode: Simple digest (no OpenAI API key found)")
         print("   To get LLM-powered insights, add your OpenAI API key to the .env file.")
@@ -64,44 +226,163 @@ Examples:
     
     print()
     
+    if not args.daemon:
+        run_digest(args, use_llm, run_start)
+        return
+    
+    # Everything loaded during a cycle (player table, scraped-URL set, keyword
+    # matcher, trend history, HTTP connections) stays in memory for the next
+    scheduler = Scheduler()
+    scheduler.add("digest", interval, lambda: run_digest(args, use_llm, time.monotonic()))
+    scheduler.add("trending poll", DAEMON_TRENDING_INTERVAL_SECONDS,
+                  lambda: print(f"  Recorded {poll_sleeper_trending()} trending entries"),
+                  first_delay=scheduler.next_delay(DAEMON_TRENDING_INTERVAL_SECONDS))
+    run_daemon(scheduler)
+    get_player_timeline().close()
+    print("Daemon stopped.")
+
+
+def run_digest(args: argparse.Namespace, use_llm: bool, run_start: float):
+    """
+    Fetch, process and write one digest.
+    
+    Args:
+        args: Parsed command line arguments
+        use_llm: Whether to generate the digest with the LLM
+        run_start: time.monotonic() at the start of the run (for --deadline)
+    """
+    run_lock = None
     try:
-        # Step 1: Fetch news from all sources (including web scraping)
+        # Steps 1-2: Lazily fetch, filter and categorize news from all sources;
+        # items flow through one at a time as each source produces them
         print("Fetching news from all sources (including FantasyPros web scraping)...")
-        all_news = fetch_all_news()
+        news_stream = build_pipeline()
         
-        if not all_news:
-            print("No news items found. Exiting.")
-            return
+        # Optional: drop players who are already rostered in the league
+        league_ids = args.league or SLEEPER_LEAGUE_IDS
+        if league_ids:
+            print(f"Filtering to players available in league(s) {', '.join(league_ids)}...")
+            availability = LeagueRosterIngestor().ingest(league_ids)
+            # Items with no player ID (FantasyPros articles) can't be checked and pass through
+            news_stream = availability.iter_available(news_stream, league_ids)
         
-        # Step 2: Filter for fantasy relevance
-        print("Filtering for fantasy-relevant news...")
-        relevant_news = filter_relevant_news(all_news)
+        # Optional: skip everything an earlier run today already processed
+        if args.incremental:
+            # One incremental run at a time, each starting from the state the last one saved
+            run_lock = FileLease("run_state")
+            run_lock.acquire()
+            run_state = RunState()
+            news_stream = run_state.changed(news_stream)
         
-        if not relevant_news:
+        first_item = next(news_stream, None)
+        if first_item is None and not args.incremental:
             print("No fantasy-relevant news found. Exiting.")
             return
+        news_stream = itertools.chain([first_item] if first_item is not None else [], news_stream)
         
-        # Step 3: Generate digest
+        # Story clustering, the LLM prompt and relevance ranking need every
+        # item at once; otherwise the simple digest streams straight into the file
+        if not args.no_cluster and not use_llm and not args.incremental:
+            # Only local stages follow, so hold just the part of each article they read
+            news_stream = compact_stories(news_stream)
+        if (not args.no_cluster or use_llm or args.min_score is not None or args.top_k is not None
+                or args.watchlists):
+            news_stream = list(news_stream)
+            print(f"Collected {len(news_stream)} fantasy-relevant items")
+        
+        # Collapse reports of the same story into one item before ranking,
+        # so duplicates don't crowd out other news
+        if not args.no_cluster:
+            collected = len(news_stream)
+            news_stream = cluster_stories(news_stream)
+            print(f"Clustered into {len(news_stream)} stories ({collected - len(news_stream)} duplicate reports merged)")
+            if args.incremental:
+                # Reports of stories an earlier run today already covered update those stories
+                folded = run_state.match_reported(news_stream)
+                if folded:
+                    print(f"  {folded} new reports of stories already in today's digest")
+        
+        # Optional: keep only the highest-scoring items for the expensive stages
+        if args.min_score is not None or args.top_k is not None:
+            scores = score_news_batch(news_stream)
+            news_stream = select_by_score(news_stream, scores, threshold=args.min_score, top_k=args.top_k)
+            print(f"Kept {len(news_stream)} items after relevance scoring")
+        
+        # Add each player's earlier news from the timeline, and record this
+        # run's news, trends and digest mentions in it
+        tracked = get_player_timeline().track(news_stream, digest_ref=datetime.now().strftime("%Y-%m-%d"))
+        news_stream = list(tracked) if isinstance(news_stream, list) else tracked
+        
+        # Steps 3-4: Generate digest and write it to file
         print("Generating digest...")
-        if use_llm:
+        if args.incremental:
+            news_stream = list(news_stream)
+            print(f"  {len(run_state.new)} new, {len(run_state.updated)} updated, "
+                  f"{run_state.skipped} unchanged since the last run")
+            run_state.record(news_stream)
+            with run_state.delta_digest() as delta:
+                if delta.item_count:
+                    write_digest_stream(render_digest(delta, args.digest_format), args.digest_format,
+                                        filepath=delta_digest_filepath(args.digest_format))
+                else:
+                    print("  Nothing changed since the last run")
+            with run_state.daily_digest() as daily:
+                filepath = write_digest_stream(render_digest(daily, args.digest_format), args.digest_format)
+            run_state.save()
+        elif use_llm and args.stream:
+            print("  Using LLM for enhanced insights (streaming to file)...")
+            filepath = write_digest_progressive(stream_digest(news_stream, use_cache=not args.no_cache,
+                                                                   refresh_cache=args.refresh_cache))
+            if not filepath:
+                print("Falling back to simple digest...")
+                filepath = write_digest(generate_simple_digest(news_stream))
+        elif use_llm and args.deadline is not None:
+            print(f"  Racing the LLM against the local digest ({args.deadline:.0f}s deadline)...")
+            digest_content, pending = generate_digest_by_deadline(
+                news_stream, run_start + args.deadline,
+                map_reduce=args.map_reduce, use_cache=not args.no_cache,
+                refresh_cache=args.refresh_cache)
+            print("Writing digest to file...")
+            filepath = write_digest(digest_content)
+            if filepath and pending is not None:
+                print("  Waiting for the LLM digest to upgrade the file...")
+                try:
+                    filepath = write_digest(pending.result(timeout=LLM_TIMEOUT_SECONDS)) or filepath
+                    print("  Upgraded digest with LLM insights")
+                except Exception as e:
+                    print(f"  LLM digest not available ({str(e) or 'timed out'}), keeping the local digest")
+        elif use_llm:
             print("  Using LLM for enhanced insights...")
-            digest_content = generate_digest(relevant_news)
+            digest_content = generate_digest(news_stream, map_reduce=args.map_reduce,
+                                             use_cache=not args.no_cache,
+                                             refresh_cache=args.refresh_cache)
+            print("Writing digest to file...")
+            filepath = write_digest(digest_content)
         else:
-            print("  Using simple digest format...")
-            digest_content = generate_simple_digest(relevant_news)
-        
-        # Step 4: Write digest to file
-        print("Writing digest to file...")
-        filepath = write_digest(digest_content)
+            print(f"  Using simple digest format ({args.digest_format}, streaming to file)...")
+            filepath = write_digest_stream(render_simple_digest(news_stream, args.digest_format),
+                                           args.digest_format)
         
         if filepath:
             print(f"Digest successfully generated: {filepath}")
         else:
             print("Failed to write digest file.")
+        
+        # Optional: each user's share of this run's news, matched once per item
+        if args.watchlists:
+            index = WatchlistIndex.load(fetch_sleeper_player_details(), args.watchlists)
+            routes = index.route(news_stream)
+            path = delta_digest_filepath(args.digest_format) if args.incremental else digest_filepath(args.digest_format)
+            written = write_watchlist_digests(routes, os.path.basename(path), args.digest_format)
+            print(f"Watchlist digests: {written} of {len(index.watchlists)} users had matching news "
+                  f"(written to {WATCHLIST_OUTPUT_DIR}/)")
             
     except Exception as e:
         print(f"Error: {e}")
         return
+    finally:
+        if run_lock is not None:
+            run_lock.release()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Show what the news, trending lists and our digests said about a player.
+
+Usage:
+    python player_history.py "Brock Bowers"            # Last 28 days
+    python player_history.py "Brock Bowers" --days 7   # Last week
+    python player_history.py 4866 --kind trend         # By Sleeper player ID, trends only
+"""
+
+import sys
+import os
+import argparse
+import time
+from datetime import datetime
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.player_timeline import get_player_timeline, EVENT_KINDS
+from src.config import PLAYER_CONTEXT_DAYS
+
+
+def main():
+    """Print a player's timeline."""
+    parser = argparse.ArgumentParser(description="Show a player's news, trend and digest history")
+    parser.add_argument('player', help='Player full name or Sleeper player ID')
+    parser.add_argument('--days', type=float, default=PLAYER_CONTEXT_DAYS, help='How many days back to show')
+    parser.add_argument('--kind', choices=EVENT_KINDS, action='append', help='Only these event kinds (repeatable)')
+    args = parser.parse_args()
+
+    timeline = get_player_timeline()
+    item = {"player_id": args.player} if args.player.isdigit() else {"player_name": args.player}
+    key = timeline.player_key(item)
+    if key is None:
+        print("Give the player's full name (e.g. \"Brock Bowers\") or Sleeper player ID.")
+        return
+
+    events = timeline.events(key, start=time.time() - args.days * 86400, kinds=args.kind or EVENT_KINDS)
+    print(f"{args.player}: {len(events)} events in the last {args.days:g} days")
+    print("=" * 60)
+    for event in events:
+        when = datetime.fromtimestamp(event["ts"]).strftime("%Y-%m-%d %H:%M")
+        if event["kind"] == "trend":
+            direction = event["ref"].split(":")[0]
+            print(f"{when}  [trend]  {event['detail']} {direction}s in 24h")
+        else:
+            print(f"{when}  [{event['kind']}]  {event['headline']} ({event['source']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Watch Sleeper and FantasyPros and raise alerts within seconds of breaking news.
+
+Usage:
+    python run_alerts.py                 # Poll until interrupted
+    python run_alerts.py --once          # One poll of each source, then exit
+    python run_alerts.py --news 30       # Poll the news listing every 30 seconds
+
+Alerts are printed and appended to alerts.jsonl. A latency histogram is
+printed every few minutes and on exit.
+"""
+
+import sys
+import os
+import argparse
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.alerts import AlertMonitor
+from src.daemon import Scheduler, run_daemon
+from src.run_coordination import FileLease, LockTimeout
+from src.config import ALERT_TRENDING_POLL_SECONDS, ALERT_NEWS_POLL_SECONDS, ALERT_PLAYERS_POLL_SECONDS
+
+REPORT_INTERVAL_SECONDS = 15 * 60
+
+
+def main():
+    """Run the alert monitor."""
+    parser = argparse.ArgumentParser(description="Raise real-time injury, transaction, trending and status alerts")
+    parser.add_argument('--once', action='store_true', help='Poll each source once and exit')
+    parser.add_argument('--trending', type=float, default=ALERT_TRENDING_POLL_SECONDS, metavar='SECONDS',
+                        help='Seconds between Sleeper trending polls')
+    parser.add_argument('--news', type=float, default=ALERT_NEWS_POLL_SECONDS, metavar='SECONDS',
+                        help='Seconds between FantasyPros news listing polls')
+    parser.add_argument('--players', type=float, default=ALERT_PLAYERS_POLL_SECONDS, metavar='SECONDS',
+                        help='Seconds between checks of the shared Sleeper player cache for status changes '
+                             '(the cache itself is refreshed at most once a day)')
+    args = parser.parse_args()
+
+    instance = FileLease("alerts")
+    try:
+        # A short wait lets a lock left by a crashed monitor be taken over
+        instance.acquire(timeout=1)
+    except LockTimeout as e:
+        print(f"Another alert monitor is running. {e}")
+        sys.exit(1)
+
+    # A single pass has no later poll to compare against, so it reports the listing as it stands
+    monitor = AlertMonitor(news_baseline=not args.once)
+    try:
+        # The player table comes first: it names the players in the other alerts
+        monitor.poll_players()
+        if args.once:
+            monitor.poll_trending()
+            monitor.poll_news()
+        else:
+            print("Watching for alerts (first news and player polls only set the baseline)...")
+            scheduler = Scheduler()
+            scheduler.add("trending poll", args.trending, monitor.poll_trending)
+            scheduler.add("news poll", args.news, monitor.poll_news)
+            scheduler.add("player poll", args.players, monitor.poll_players, first_delay=args.players)
+            scheduler.add("latency report", REPORT_INTERVAL_SECONDS, lambda: print(monitor.latency_report()),
+                          first_delay=REPORT_INTERVAL_SECONDS)
+            run_daemon(scheduler)
+    finally:
+        print(monitor.latency_report())
+        instance.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hot paths of the digest pipeline.
+
+Usage:
+    python run_benchmarks.py              # Run every benchmark
+    python run_benchmarks.py anomaly      # Run a single benchmark by name
+"""
+
+import sys
+import os
+import asyncio
+import multiprocessing
+import time
+import tracemalloc
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.config import FANTASY_KEYWORDS, FANTASY_TERMS, NEWS_CATEGORY_KEYWORDS
+from src.data_fetchers import load_existing_scraped_articles
+from src.digest_renderer import DIGEST_FORMATS, DigestModel, render_digest
+from src.extractive_summarizer import summarize
+from src.keyword_matcher import get_news_matcher
+from src.news_item import NewsItem
+from src.query_api import QueryIndex, QueryServer, QueryStore
+from src.relevance_scoring import extract_features, score_features, select_by_score
+from src.story_clustering import find_story_clusters
+from src.trend_anomaly import score_trend_anomalies, top_k_anomalies
+from src.watchlists import WatchlistIndex
+
+
+def timed(func, repeat: int = 5) -> float:
+    """Return the best wall-clock time of several runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_anomaly():
+    """Rescore ~11k players against 48 polls of history."""
+    rng = np.random.default_rng(0)
+    n_players, n_polls = 11000, 48
+    counts = rng.poisson(rng.gamma(0.5, 200, size=(n_players, 1)), size=(n_players, n_polls)).astype(float)
+    positions = rng.choice(["QB", "RB", "WR", "TE", "K", "DEF"], size=n_players)
+
+    def run():
+        scores = score_trend_anomalies(counts, positions)
+        top_k_anomalies(scores, 10)
+
+    print(f"anomaly: scored {n_players} players x {n_polls} polls in {timed(run):.2f} ms")
+
+
+def legacy_keyword_scan(text: str):
+    """The substring scans news_filter used before the compiled matcher (for comparison)."""
+    text = text.lower()
+    relevant = any(keyword.lower() in text for keyword in FANTASY_KEYWORDS) or \
+        any(term in text for term in FANTASY_TERMS)
+    category = "other"
+    for name, keywords in NEWS_CATEGORY_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            category = name
+            break
+    return relevant, category
+
+
+def bench_keywords():
+    """Relevance + categorization over every scraped article: substring scans vs. compiled matcher."""
+    articles = load_existing_scraped_articles()
+    texts = [f"{a['title']} {a['content']}" for a in articles]
+    if not texts:
+        print("keywords: no scraped articles to benchmark")
+        return
+    matcher = get_news_matcher()
+
+    def legacy():
+        for text in texts:
+            legacy_keyword_scan(text)
+
+    def two_passes():
+        for text in texts:
+            matcher.matches_any(text)
+            matcher.first_label(text, order=category_order)
+
+    def one_scan():
+        # What the pipeline does: relevance and category from a single scan
+        for text in texts:
+            hits = matcher.scan(text, stop_at=category_order[0])
+            bool(hits) and next((c for c in category_order if hits.get(c)), "other")
+
+    category_order = list(NEWS_CATEGORY_KEYWORDS)
+    total_kb = sum(len(t) for t in texts) / 1024
+    print(f"keywords: {len(texts)} articles ({total_kb:.0f} KB) "
+          f"legacy {timed(legacy):.2f} ms, compiled two passes {timed(two_passes):.2f} ms, "
+          f"compiled one scan {timed(one_scan):.2f} ms")
+
+
+def bench_scoring():
+    """Score and select 10k news items."""
+    rng = np.random.default_rng(0)
+    headlines = ["Questionable with a hamstring injury", "Promoted to starter", "Signed to practice squad",
+                 "Career high in targets", "Attends charity event"]
+    items = [
+        {
+            "headline": headlines[i % len(headlines)],
+            "summary": "Coach said he expects a full practice by Friday. " * 5,
+            "source": "sleeper" if i % 3 == 0 else "fantasypros_scraped",
+            "url": "https://www.fantasypros.com/nfl/news/123/",
+            "trend_count": int(rng.integers(0, 5000)) if i % 3 == 0 else 0,
+            "timestamp": time.time() - float(rng.uniform(0, 86400)),
+        }
+        for i in range(10000)
+    ]
+    features = extract_features(items)
+
+    print(f"scoring: 10000 items, features {timed(lambda: extract_features(items), repeat=1):.2f} ms, "
+          f"score + top-100 {timed(lambda: select_by_score(items, score_features(features), top_k=100)):.2f} ms")
+
+
+def bench_summarizer():
+    """Extractive summaries for every scraped article (repeated to 300 articles)."""
+    articles = load_existing_scraped_articles()
+    if not articles:
+        print("summarizer: no scraped articles to benchmark")
+        return
+    texts = [a["content"] for a in articles] * (300 // len(articles) + 1)
+    texts = texts[:300]
+    total_kb = sum(len(t) for t in texts) / 1024
+
+    print(f"summarizer: {len(texts)} articles ({total_kb:.0f} KB) "
+          f"in {timed(lambda: [summarize(t) for t in texts], repeat=3):.2f} ms")
+
+
+def bench_cluster():
+    """Cluster 2000 items: 500 stories, each reported four times with small rewrites."""
+    rng = np.random.default_rng(0)
+    vocabulary = ["practice", "limited", "hamstring", "coach", "expects", "snaps", "targets", "week",
+                  "starter", "depth", "chart", "return", "questionable", "ruled", "out", "game"]
+    items = []
+    for story in range(500):
+        words = list(rng.choice(vocabulary, size=40))
+        for report in range(4):
+            rewrite = list(words)
+            rewrite[int(rng.integers(0, 40))] = "reportedly"
+            items.append({
+                "player_name": f"Player {story}",
+                "headline": f"Player {story} update",
+                "summary": " ".join(rewrite),
+                "source": "sleeper" if report % 2 else "fantasypros_scraped",
+            })
+    stories = find_story_clusters(items)
+
+    print(f"cluster: {len(items)} items -> {len(stories)} stories "
+          f"in {timed(lambda: find_story_clusters(items), repeat=3):.2f} ms")
+
+
+def bench_render():
+    """Group 20k items once, then render the digest in every format."""
+    items = [
+        {"source": "sleeper", "player_name": f"Player {i}", "team": "KC", "trend_count": i,
+         "trend_type": "add" if i % 3 else "drop", "trend_velocity": float(i % 50)}
+        if i % 2 else
+        {"source": "sleeper", "player_name": f"Player {i}", "team": "BUF", "headline": f"Player {i} limited in practice"}
+        for i in range(20000)
+    ]
+    grouping = timed(lambda: DigestModel(items).close(), repeat=3)
+    with DigestModel(items) as model:
+        times = {name: timed(lambda: sum(map(len, render_digest(model, name))), repeat=3)
+                 for name in DIGEST_FORMATS}
+    print(f"render: 20000 items, grouping {grouping:.2f} ms, "
+          + ", ".join(f"{name} {ms:.2f} ms" for name, ms in times.items()))
+
+
+def _serve_benchmark_index(documents, port_queue):
+    """Run the query API over documents in this (child) process."""
+    store = QueryStore()
+    store.index = QueryIndex(documents)
+
+    async def run():
+        listener = await QueryServer(store).start("127.0.0.1", 0)
+        port_queue.put(listener.sockets[0].getsockname()[1])
+        await listener.serve_forever()
+
+    asyncio.run(run())
+
+
+def bench_api():
+    """Query API over 20k documents: 200 keep-alive clients, each sending a request every 50 ms."""
+    teams = ["KC", "BUF", "SF", "PHI", "DAL", "DET"]
+    words = ["hamstring", "ankle", "limited", "questionable", "waiver", "breakout", "returns", "practice"]
+    documents = [
+        ({"id": f"news:{i}", "kind": "news" if i % 3 else "trend", "ts": 1.76e9 + i * 60,
+          "date": f"2025-10-{1 + i % 28:02d}", "source": "sleeper", "player": f"Player {i % 2000}",
+          "team": teams[i % len(teams)], "headline": f"Player {i % 2000} {words[i % len(words)]}"},
+         {words[i % len(words)], words[(i * 7) % len(words)], "player"})
+        for i in range(20000)
+    ]
+    # The server gets its own process, so client work doesn't count as server latency
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve_benchmark_index, args=(documents, port_queue), daemon=True)
+    server.start()
+    port = port_queue.get()
+    latencies = []
+
+    async def client(n: int):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await asyncio.sleep(n * 0.05 / 200)  # Spread clients across the interval
+        for j in range(40):
+            # Even requests repeat a popular query; odd ones page through keyword searches
+            target = (f"/news?team={teams[n % len(teams)]}" if j % 2 == 0 else
+                      f"/search?q={words[n % len(words)]}&team={teams[j % len(teams)]}&offset={j * 10}&limit=10")
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(max(0.0, 0.05 - (time.perf_counter() - start)))
+        writer.close()
+
+    async def run():
+        start = time.perf_counter()
+        await asyncio.gather(*(client(n) for n in range(200)))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    server.terminate()
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"api: {len(latencies)} requests from 200 clients in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:.0f} req/s), p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+
+def bench_newsitem():
+    """Memory held by 20k news items as plain dicts vs. NewsItem records."""
+    teams = ["KC", "BUF", "SF", "PHI", "DAL", "DET"]
+    raw = [
+        {
+            "player_name": f"Player {i}",
+            "team": "".join(teams[i % len(teams)]),
+            "position": "".join(["W", "R"]),
+            "headline": f"Player {i} trending up",
+            "summary": "",
+            "source": "".join(["sleep", "er"]),
+            "timestamp": "2024-01-01T12:00:00",
+            "trend_type": "".join(["ad", "d"]),
+            "trend_count": i,
+            "player_id": str(i),
+        }
+        for i in range(20000)
+    ]
+
+    def measure(build):
+        tracemalloc.start()
+        items = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del items
+        return size / 1024 / 1024
+
+    dict_mb = measure(lambda: [dict(d) for d in raw])
+    record_mb = measure(lambda: [NewsItem.from_dict(d) for d in raw])
+    print(f"newsitem: 20000 items, dicts {dict_mb:.2f} MB, NewsItem {record_mb:.2f} MB")
+
+
+def bench_watchlists():
+    """Route 2000 items to 10k users watching 8 players and a team each: per-user loop vs. inverted index."""
+    rng = np.random.default_rng(0)
+    teams = [f"T{t:02d}" for t in range(32)]
+    players = {f"p{i}": {"first_name": f"First{i}", "last_name": f"Last{i}", "team": teams[i % 32], "position": "WR"}
+               for i in range(2500)}
+    players.update({team: {"first_name": f"City{team}", "last_name": f"Nick{team}", "team": team, "position": "DEF"}
+                    for team in teams})
+    watchlists = {f"user{u}": ([f"p{i}" for i in rng.choice(2500, size=8, replace=False)], [teams[u % 32]])
+                  for u in range(10000)}
+    items = [{"headline": f"First{i} Last{i} limited in practice, Nick{teams[(i * 7) % 32]} add depth",
+              "summary": "Coach said he expects a full practice by Friday. " * 3}
+             for i in rng.integers(0, 2500, size=2000)]
+
+    def per_user_loop(sample):
+        # What routing looks like without the index: every user's list against every item
+        routes = {}
+        for item in sample:
+            text = f"{item['headline']} {item['summary']}".lower()
+            for user, (pids, user_teams) in watchlists.items():
+                names = [f"{players[p]['first_name']} {players[p]['last_name']}".lower() for p in pids]
+                names += [f"nick{t}".lower() for t in user_teams]
+                if any(name in text for name in names):
+                    routes.setdefault(user, []).append(item)
+        return routes
+
+    def build():
+        index = WatchlistIndex(players)
+        for user, (pids, user_teams) in watchlists.items():
+            index.subscribe(user, pids, user_teams)
+        return index
+
+    index = build()
+    routed = sum(map(len, index.route(items).values()))
+    loop_ms = timed(lambda: per_user_loop(items[:20]), repeat=1) / 20 * len(items)
+    print(f"watchlists: {len(items)} items x {len(watchlists)} users -> {routed} deliveries, "
+          f"index build {timed(build, repeat=1):.2f} ms, routing {timed(lambda: index.route(items), repeat=3):.2f} ms "
+          f"(per-user loop ~{loop_ms:.0f} ms, extrapolated from 20 items)")
+
+
+BENCHMARKS = {
+    "anomaly": bench_anomaly,
+    "keywords": bench_keywords,
+    "scoring": bench_scoring,
+    "newsitem": bench_newsitem,
+    "summarizer": bench_summarizer,
+    "cluster": bench_cluster,
+    "render": bench_render,
+    "api": bench_api,
+    "watchlists": bench_watchlists,
+}
+
+
+def main():
+    """Run the selected benchmarks."""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Serve scraped articles, news, trends and digests as a local JSON API.
+
+Usage:
+    python serve_api.py                  # http://127.0.0.1:8765
+    python serve_api.py --port 9000      # Another port
+    python serve_api.py --host 0.0.0.0   # Listen on every interface
+
+Examples:
+    curl "http://127.0.0.1:8765/news?team=KC&date=2025-10-08"
+    curl "http://127.0.0.1:8765/articles?q=hamstring&limit=10&offset=10"
+    curl "http://127.0.0.1:8765/trends?player=Brock%20Bowers"
+    curl "http://127.0.0.1:8765/digests/daily_digest_20251008.md"
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.query_api import serve
+from src.config import API_HOST, API_PORT, API_REFRESH_SECONDS
+
+
+def main():
+    """Run the query API until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve news, trends and digests as a local JSON API")
+    parser.add_argument('--host', default=API_HOST, help='Interface to bind')
+    parser.add_argument('--port', type=int, default=API_PORT, help='TCP port')
+    parser.add_argument('--refresh', type=float, default=API_REFRESH_SECONDS, metavar='SECONDS',
+                        help='How often to pick up new articles, timeline events and digests')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.refresh))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+"""Real-time alerts from short-interval polls of Sleeper and the FantasyPros news listing."""
+
+import bisect
+import hashlib
+import json
+import math
+import os
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Callable, Iterable, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from .config import (
+    SLEEPER_BASE_URL, SLEEPER_TRENDING_LOOKBACK_HOURS, SLEEPER_TRENDING_LIMIT,
+    ALERT_LOG_FILE, ALERT_NEWS_URL, ALERT_NEWS_CATEGORIES, ALERT_SPIKE_MIN_COUNT,
+    ALERT_POSITIONS, ALERT_DEDUP_HOURS,
+)
+from .data_fetchers import fetch_sleeper_player_details
+from .http_clients import get_session
+from .keyword_matcher import KeywordMatcher, get_news_matcher
+
+
+# Alert kind for each keyword category in ALERT_NEWS_CATEGORIES
+NEWS_ALERT_KINDS = {"injuries": "injury", "transactions": "transaction", "role_changes": "role_change"}
+
+
+class ConditionalFetcher:
+    """
+    GETs URLs, skipping responses that haven't changed since the last poll.
+
+    The ETag and Last-Modified of each URL's last response are sent back
+    as If-None-Match / If-Modified-Since, so an unchanged resource costs a
+    304 with no body. Servers that ignore those headers still send the
+    body; it is then compared by hash and dropped if identical, so
+    unchanged data never reaches the detectors either way.
+    """
+
+    def __init__(self, session: requests.Session):
+        """
+        Args:
+            session: Session to send requests with
+        """
+        self.session = session
+        self._validators: Dict[str, Dict[str, Optional[str]]] = {}
+        self.not_modified = 0
+        self.unchanged = 0
+
+    def fetch(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Tuple[bytes, Optional[float]]]:
+        """
+        Fetch a URL if it changed.
+
+        Args:
+            url: URL to fetch
+            params: Query parameters
+
+        Returns:
+            Tuple of (body, Last-Modified as epoch seconds or None), or None if unchanged
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        key = requests.Request("GET", url, params=params).prepare().url
+        known = self._validators.get(key, {})
+        headers = {}
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            self.not_modified += 1
+            return None
+        response.raise_for_status()
+
+        digest = hashlib.sha1(response.content).hexdigest()
+        self._validators[key] = {"etag": response.headers.get("ETag"),
+                                 "last_modified": response.headers.get("Last-Modified"), "digest": digest}
+        if digest == known.get("digest"):
+            self.unchanged += 1
+            return None
+        return response.content, _http_date(response.headers.get("Last-Modified"))
+
+
+class LatencyHistogram:
+    """
+    Counts of latencies in fixed, roughly logarithmic buckets.
+
+    Percentiles are reported as the upper bound of the bucket they fall
+    in, so memory stays constant however long the monitor runs.
+    """
+
+    BOUNDS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Add one latency, in seconds."""
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.total += 1
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """
+        Get a latency percentile.
+
+        Args:
+            p: Percentile (0-100)
+
+        Returns:
+            Upper bound of the bucket holding that percentile (the maximum for
+            the overflow bucket), or 0 if nothing was recorded
+        """
+        if not self.total:
+            return 0.0
+        rank = math.ceil(p / 100 * self.total)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.BOUNDS[i] if i < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> str:
+        """Percentiles plus a bar per non-empty bucket."""
+        if not self.total:
+            return "no samples"
+        lines = [f"n={self.total}  p50<={self.percentile(50):g}s  p90<={self.percentile(90):g}s  "
+                 f"p99<={self.percentile(99):g}s  max={self.max:.2f}s"]
+        labels = [f"<={bound:g}s" for bound in self.BOUNDS] + [f">{self.BOUNDS[-1]:g}s"]
+        for label, count in zip(labels, self.counts):
+            if count:
+                lines.append(f"  {label:>7} {count:6d} {'#' * max(1, round(40 * count / self.total))}")
+        return "\n".join(lines)
+
+
+class AlertLog:
+    """
+    Emitted alerts, appended to a JSON-lines file.
+
+    Also the deduplication memory: an alert key raised within the window
+    (including by an earlier run) is not raised again.
+    """
+
+    def __init__(self, path: Optional[str] = ALERT_LOG_FILE, window_hours: float = ALERT_DEDUP_HOURS):
+        """
+        Args:
+            path: Log file (None keeps alerts in memory only)
+            window_hours: Deduplication window
+        """
+        self.path = path
+        self.window = window_hours * 3600
+        self._emitted: Dict[str, float] = {}
+        if path and os.path.exists(path):
+            cutoff = time.time() - self.window
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            alert = json.loads(line)
+                        except ValueError:
+                            continue  # A line cut short by a crash
+                        if alert.get("emitted_at", 0) >= cutoff:
+                            self._emitted[alert["key"]] = alert["emitted_at"]
+            except OSError as e:
+                print(f"Error loading alert log: {e}")
+
+    def is_duplicate(self, key: str, now: float) -> bool:
+        """Whether an alert with this key was raised within the window."""
+        emitted_at = self._emitted.get(key)
+        return emitted_at is not None and now - emitted_at < self.window
+
+    def append(self, alert: Dict[str, Any]):
+        """Record an emitted alert."""
+        self._emitted[alert["key"]] = alert["emitted_at"]
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(alert) + "\n")
+        except OSError as e:
+            print(f"Error writing alert log: {e}")
+
+
+def print_alert(alert: Dict[str, Any]):
+    """Default alert sink: one line on stdout."""
+    who = alert.get("player") or "League news"
+    if alert.get("team"):
+        who += f" ({alert['team']})"
+    when = datetime.fromtimestamp(alert["emitted_at"]).strftime("%H:%M:%S")
+    print(f"[ALERT {when}] {alert['kind']} - {who}: {alert['headline']} [{alert['latency']:.1f}s]")
+
+
+class AlertMonitor:
+    """
+    Detects alert-worthy events in each poll and emits each one once.
+
+    - News: new links on the FantasyPros news listing whose headline hits
+      one of ALERT_NEWS_CATEGORIES in the keyword taxonomy.
+    - Trending spikes: a Sleeper trending count reaching
+      ALERT_SPIKE_MIN_COUNT, and again at every doubling.
+    - Status changes: a player's injury or roster status changing between
+      refreshes of the shared Sleeper player table. Sleeper asks for that
+      5 MB table to be fetched at most once a day, so the monitor reads it
+      through fetch_sleeper_player_details() (sleeper_players_cache.json)
+      and only sees status changes as often as that cache is refreshed.
+
+    The first read of the player table (and by default the first poll of
+    the news listing) only sets the baseline, so starting the monitor
+    doesn't replay old news. Every alert's latency is measured from when
+    its data appeared (the response's Last-Modified time when the server
+    sends one, otherwise the start of the previous poll of the same source,
+    the earliest it could have appeared unseen) to when it was emitted.
+    """
+
+    def __init__(self, log: Optional[AlertLog] = None,
+                 sinks: Iterable[Callable[[Dict[str, Any]], None]] = (print_alert,),
+                 sleeper_session: Optional[requests.Session] = None,
+                 news_session: Optional[requests.Session] = None,
+                 news_baseline: bool = True,
+                 player_table: Callable[[], Dict[str, Dict[str, Any]]] = fetch_sleeper_player_details):
+        """
+        Args:
+            log: Alert log and dedup memory (defaults to ALERT_LOG_FILE)
+            sinks: Callables each emitted alert is passed to
+            sleeper_session: Session for Sleeper requests
+            news_session: Session for FantasyPros requests
+            news_baseline: Whether the first news poll only sets the baseline (if False,
+                headlines already on the listing alert unless logged within the dedup window)
+            player_table: Returns the current Sleeper player table (a new dict when it was refreshed)
+        """
+        self.log = log if log is not None else AlertLog()
+        self.sinks = list(sinks)
+        self.sleeper = ConditionalFetcher(sleeper_session or get_session("sleeper"))
+        self.player_table = player_table
+        self.news = ConditionalFetcher(news_session or get_session("fantasypros"))
+        self.detection_latency = LatencyHistogram()
+        self.poll_latency: Dict[str, LatencyHistogram] = {}
+        self._poll_started: Dict[str, float] = {}
+        self.players: Dict[str, Dict[str, Any]] = {}
+        self._player_matcher: Optional[KeywordMatcher] = None
+        self._statuses: Optional[Dict[str, Tuple[Any, Any]]] = None
+        self._news_urls: Optional[Set[str]] = None if news_baseline else set()
+
+    def _emit(self, key: str, kind: str, headline: str, observed_at: float,
+              player_id: Optional[str] = None, **fields: Any) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        if self.log.is_duplicate(key, now):
+            return None
+        player = self.players.get(player_id or "", {})
+        alert = {
+            "key": key, "kind": kind, "headline": headline,
+            "player": _full_name(player) or fields.pop("player", None), "player_id": player_id,
+            "team": player.get("team"), **fields,
+            "observed_at": observed_at, "emitted_at": now, "latency": max(0.0, now - observed_at),
+        }
+        self.log.append(alert)
+        self.detection_latency.record(alert["latency"])
+        for sink in self.sinks:
+            try:
+                sink(alert)
+            except Exception as e:
+                print(f"Error in alert sink: {e}")
+        return alert
+
+    def _timed(self, name: str, poll: Callable[[float], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Run a poll, passing it the start of the previous poll of the source (of this one, the first time)."""
+        started = time.time()
+        since, self._poll_started[name] = self._poll_started.get(name, started), started
+        try:
+            return poll(since)
+        except requests.RequestException as e:
+            print(f"Error polling {name}: {e}")
+            return []
+        finally:
+            self.poll_latency.setdefault(name, LatencyHistogram()).record(time.time() - started)
+
+    def poll_players(self) -> List[Dict[str, Any]]:
+        """Check the shared Sleeper player table and alert on injury/roster status changes since its last refresh."""
+        return self._timed("players", self._poll_players)
+
+    def _poll_players(self, since: float) -> List[Dict[str, Any]]:
+        players = self.player_table()
+        if not players or players is self.players:
+            return []  # Unavailable, or the cache hasn't been refreshed since the last check
+        self.players = players
+        self._player_matcher = None
+
+        statuses = {pid: (player.get("injury_status"), player.get("status"))
+                    for pid, player in self.players.items()
+                    if player.get("team") and player.get("position") in ALERT_POSITIONS}
+        previous, self._statuses = self._statuses, statuses
+        if previous is None:
+            return []
+        alerts = []
+        for pid, (injury, status) in statuses.items():
+            before = previous.get(pid)
+            if before is None or before == (injury, status):
+                continue
+            changes = [f"{label} {old or 'none'} -> {new or 'none'}"
+                       for label, old, new in (("injury", before[0], injury), ("status", before[1], status))
+                       if old != new]
+            alert = self._emit(f"status:{pid}:{injury}:{status}", "status_change", "; ".join(changes),
+                               since, pid, source="sleeper", injury_status=injury, status=status)
+            if alert:
+                alerts.append(alert)
+        return alerts
+
+    def poll_trending(self) -> List[Dict[str, Any]]:
+        """Poll Sleeper trending adds and drops and alert on spikes."""
+        return self._timed("trending", self._poll_trending)
+
+    def _poll_trending(self, since: float) -> List[Dict[str, Any]]:
+        alerts = []
+        for trend_type in ("add", "drop"):
+            fetched = self.sleeper.fetch(f"{SLEEPER_BASE_URL}/players/nfl/trending/{trend_type}",
+                                         params={"lookback_hours": SLEEPER_TRENDING_LOOKBACK_HOURS,
+                                                 "limit": SLEEPER_TRENDING_LIMIT})
+            if fetched is None:
+                continue
+            body, last_modified = fetched
+            for trend in json.loads(body):
+                count = int(trend.get("count", 0))
+                if count < ALERT_SPIKE_MIN_COUNT:
+                    continue
+                level = int(math.log2(count / ALERT_SPIKE_MIN_COUNT))
+                pid = str(trend["player_id"])
+                alert = self._emit(f"trend:{trend_type}:{pid}:{level}", "trend_spike",
+                                   f"Trending {'up' if trend_type == 'add' else 'down'}: {count:,} "
+                                   f"{trend_type}s in {SLEEPER_TRENDING_LOOKBACK_HOURS}h",
+                                   last_modified or since, pid, source="sleeper",
+                                   trend_type=trend_type, trend_count=count)
+                if alert:
+                    alerts.append(alert)
+        return alerts
+
+    def poll_news(self) -> List[Dict[str, Any]]:
+        """Poll the FantasyPros news listing and alert on new injury, transaction and role news."""
+        return self._timed("news", self._poll_news)
+
+    def _poll_news(self, since: float) -> List[Dict[str, Any]]:
+        fetched = self.news.fetch(ALERT_NEWS_URL)
+        if fetched is None:
+            return []
+        body, last_modified = fetched
+        headlines = news_listing_headlines(body, ALERT_NEWS_URL)
+        baseline, self._news_urls = self._news_urls, (self._news_urls or set()) | set(headlines)
+        if baseline is None:
+            return []
+
+        alerts = []
+        news_matcher = get_news_matcher()
+        for url, headline in headlines.items():
+            if url in baseline:
+                continue
+            category = news_matcher.first_label(headline, order=ALERT_NEWS_CATEGORIES)
+            if category is None:
+                continue
+            player_ids = self.player_matcher().scan(headline)
+            alert = self._emit(f"news:{url}", NEWS_ALERT_KINDS.get(category, category), headline,
+                               last_modified or since, next(iter(player_ids), None),
+                               source="fantasypros", url=url,
+                               terms=news_matcher.terms_found(headline))
+            if alert:
+                alerts.append(alert)
+        return alerts
+
+    def player_matcher(self) -> KeywordMatcher:
+        """Matcher from player full names to Sleeper IDs (built from the current player table)."""
+        if self._player_matcher is None:
+            self._player_matcher = KeywordMatcher({
+                pid: [_full_name(player)] for pid, player in self.players.items()
+                if player.get("team") and player.get("position") in ALERT_POSITIONS and _full_name(player)
+            })
+        return self._player_matcher
+
+    def latency_report(self) -> str:
+        """Detection and per-source poll latency histograms."""
+        lines = ["Detection latency (data appeared -> alert emitted):", self.detection_latency.summary()]
+        for name, histogram in self.poll_latency.items():
+            lines += [f"Poll latency ({name}):", histogram.summary()]
+        lines.append(f"Conditional requests: {self.sleeper.not_modified + self.news.not_modified} not modified, "
+                     f"{self.sleeper.unchanged + self.news.unchanged} unchanged bodies skipped")
+        return "\n".join(lines)
+
+
+def news_listing_headlines(html: bytes, base_url: str) -> Dict[str, str]:
+    """
+    Extract news links and their headlines from a FantasyPros news listing.
+
+    Args:
+        html: Listing page
+        base_url: URL the page was fetched from
+
+    Returns:
+        Dictionary mapping article URL to headline, in page order
+    """
+    headlines: Dict[str, str] = {}
+    for link in BeautifulSoup(html, "html.parser").select('a[href*="/news/"]'):
+        url = urljoin(base_url, link["href"]).split("#")[0]
+        headline = " ".join(link.get_text(" ").split())
+        path = urlparse(url).path.strip("/").split("/")
+        if "fantasypros.com" not in url or len(path) < 3 or len(headline) < 15:
+            continue
+        headlines.setdefault(url, headline)
+    return headlines
+
+
+def _full_name(player: Dict[str, Any]) -> Optional[str]:
+    name = f"{player.get('first_name') or ''} {player.get('last_name') or ''}".strip()
+    return name or None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
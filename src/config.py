@@ -37,9 +37,165 @@ FANTASY_KEYWORDS = [
     "hot", "cold", "streak", "trending"
 ]
 
+# Keyword taxonomy used to categorize news (checked in this order)
+NEWS_CATEGORY_KEYWORDS = {
+    "injuries": [
+        "injured", "injury", "out", "questionable", "doubtful", "probable",
+        "hamstring", "knee", "ankle", "concussion", "shoulder", "back",
+        "limited", "full", "practice", "rehab", "recovery"
+    ],
+    "role_changes": [
+        "promoted", "demoted", "starter", "backup", "depth chart", "depth",
+        "snap count", "snaps", "targets", "carries", "touches"
+    ],
+    "transactions": [
+        "signed", "released", "traded", "waived", "claimed",
+        "contract", "extension", "restructure"
+    ],
+    "performance": [
+        "breakout", "breakout game", "career high", "season high",
+        "struggling", "struggles", "slumping", "slump",
+        "hot", "cold", "streak", "trending"
+    ],
+}
+
+# General fantasy football terms that also mark news as relevant
+FANTASY_TERMS = [
+    "fantasy football", "fantasy", "waiver wire", "start/sit",
+    "sleepers", "busts", "rankings", "projections", "advice",
+    "analysis", "pickup", "drop", "trade", "dynasty", "redraft"
+]
+
 # Output configuration
 OUTPUT_DIR = "digests"
 DIGEST_FILENAME_TEMPLATE = "daily_digest_{date}.md"
+DELTA_DIGEST_FILENAME_TEMPLATE = "digest_update_{date}_{time}.md"  # --incremental "what changed" digests
+
+# Player timeline (history of news, trends and digest mentions per player)
+PLAYER_TIMELINE_DB = "player_timeline.db"
+PLAYER_CONTEXT_DAYS = 28  # How far back the digest looks for a player's earlier news
+PLAYER_CONTEXT_MAX_EVENTS = 3  # Earlier headlines shown per player
+
+# Incremental runs
+RUN_STATE_FILE = "run_state.json"
+RUN_TREND_CHANGE_RATIO = 0.25  # A trending count must move this much (relative) to be reported as updated
+
+# Run coordination (several main.py / run_scraper.py processes on one host)
+RUN_LOCK_DIR = ".locks"
+RUN_LOCK_LEASE_SECONDS = 60  # A lock whose holder stops renewing it is free again after this long
+RUN_LOCK_WAIT_SECONDS = 120  # How long to wait for a shared-state lock before giving up
+
+# Daemon mode (main.py --daemon)
+DAEMON_DIGEST_INTERVAL_SECONDS = 30 * 60  # Incremental fetch + digest cycle
+DAEMON_TRENDING_INTERVAL_SECONDS = 10 * 60  # Extra Sleeper trending polls between digests
+DAEMON_JITTER_RATIO = 0.1  # Each wait is randomized by up to this fraction of the interval
+
+# Local query API (serve_api.py)
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_REFRESH_SECONDS = 15  # How often changed files and the player timeline are reindexed
+API_DEFAULT_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+API_RESPONSE_CACHE_SIZE = 2048  # Rendered responses kept per index snapshot
+API_MAX_REQUEST_BYTES = 16384  # Larger request heads are rejected
+
+# Real-time alerts (run_alerts.py)
+ALERT_LOG_FILE = "alerts.jsonl"
+ALERT_NEWS_URL = "https://www.fantasypros.com/nfl/news/"
+ALERT_TRENDING_POLL_SECONDS = 60
+ALERT_NEWS_POLL_SECONDS = 60
+ALERT_PLAYERS_POLL_SECONDS = 60 * 60  # Checks the shared player cache, which Sleeper asks to refresh at most daily
+ALERT_NEWS_CATEGORIES = ["injuries", "transactions", "role_changes"]  # Keyword categories that raise alerts
+ALERT_SPIKE_MIN_COUNT = 1000  # Trending count that first raises an alert; again at every doubling
+ALERT_POSITIONS = ["QB", "RB", "WR", "TE", "K", "DEF"]  # Players whose status changes raise alerts
+ALERT_DEDUP_HOURS = 24  # The same alert is not raised again within this window
+
+# Per-user watchlists (main.py --watchlists)
+WATCHLISTS_FILE = "watchlists.json"  # {"user": {"players": ["Brock Bowers", "4866"], "teams": ["KC"]}}
+WATCHLIST_OUTPUT_DIR = os.path.join(OUTPUT_DIR, "watchlists")  # One digest folder per user
 
 # LLM Configuration
-LLM_TIMEOUT_SECONDS = 60  # 60 seconds timeout for LLM requests
\ No newline at end of file
+LLM_TIMEOUT_SECONDS = 60  # 60 seconds timeout for LLM requests
+LLM_MODEL = "gpt-5-nano"
+LLM_PROMPT_TOKEN_BUDGET = 6000  # Maximum tokens of news data sent in the digest prompt
+LLM_PROMPT_SENTENCES_PER_ITEM = 3  # Most relevant sentences kept from each item's summary
+LLM_PROMPT_MAX_SENTENCE_CHARS = 300  # Longer sentences are cut to this many characters
+LLM_MAP_CHUNK_SIZE = 25  # News items per map call in map-reduce mode
+LLM_MAP_CONCURRENCY = 4  # Map calls in flight at once
+LLM_MAP_RETRIES = 2  # Extra attempts for a failed map call before using its raw rows
+LLM_RETRY_BACKOFF_SECONDS = 2  # Doubled after each failed attempt
+LLM_CACHE_DIR = "llm_cache"  # Cached LLM responses, one file per request hash
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60  # Cached responses older than this are ignored
+LLM_CACHE_MAX_BYTES = 20 * 1024 * 1024  # Least recently used responses are evicted past this size
+LLM_ARTICLE_CACHE_DIR = os.path.join(LLM_CACHE_DIR, "articles")  # Per-article summaries, keyed by content hash
+LLM_ARTICLE_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+LLM_ARTICLE_CACHE_MAX_BYTES = 20 * 1024 * 1024
+LLM_ARTICLE_MIN_CHARS = 1500  # Shorter summaries are sent as-is instead of being condensed
+LLM_ARTICLE_INPUT_CHARS = 12000  # Article text sent for condensing
+
+# HTTP client configuration
+HTTP_TIMEOUT_SECONDS = 15  # Default connect/read timeout for API and scraper requests
+HTTP_POOL_CONNECTIONS = 10  # Number of per-host connection pools to keep
+HTTP_POOL_MAXSIZE = 20  # Maximum keep-alive connections per host
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Source fetch configuration
+SOURCE_TIMEOUT_SECONDS = {
+    "sleeper": 30,  # Trending lists plus (possibly uncached) player table
+    "fantasypros": 600,  # Scraping walks many article pages
+}
+
+# Sleeper trending configuration
+SLEEPER_TRENDING_LOOKBACK_HOURS = 24
+SLEEPER_TRENDING_LIMIT = 250  # Fetch the full trending list, not just the digest's top N
+TREND_STORE_DIR = "trend_history"
+
+# Trending anomaly detection
+TREND_EWMA_ALPHA = 0.3  # Smoothing factor for each player's baseline
+TREND_COHORT_WEIGHT = 0.5  # Weight of the position-cohort z-score vs. the player's own history
+TREND_ANOMALY_MIN_POLLS = 4  # Fall back to raw counts until this many polls are stored
+TREND_ANOMALY_HISTORY_POLLS = 48  # Polls used for the baseline
+
+# League roster ingestion
+# Default leagues for main.py's waiver filter (comma-separated); --league overrides them
+SLEEPER_LEAGUE_IDS = [lid.strip() for lid in os.getenv("SLEEPER_LEAGUE_IDS", "").split(",") if lid.strip()]
+LEAGUE_FETCH_CONCURRENCY = 8  # Maximum roster requests in flight
+LEAGUE_ROSTER_TTL_SECONDS = 15 * 60  # Reuse cached rosters for this long before revalidating
+LEAGUE_ROSTER_CACHE_FILE = "league_rosters_cache.json"
+LEAGUE_FILTER_BATCH_SIZE = 64  # Streamed items checked against every league per availability mask
+
+# Batch relevance scoring
+RELEVANCE_WEIGHTS = {
+    "injuries": 3.0,  # Per log(1 + keyword hits)
+    "role_changes": 2.5,
+    "transactions": 2.0,
+    "performance": 1.5,
+    "relevance": 0.5,  # General fantasy keywords/terms
+    "trend_count": 0.6,  # Per log(1 + adds/drops)
+    "anomaly_score": 1.0,  # Per unit of trending anomaly score
+}
+RELEVANCE_SOURCE_WEIGHTS = {"sleeper": 2.0, "fantasypros_scraped": 1.0}
+RELEVANCE_SECTION_WEIGHTS = {"news": 1.5, "advice": 1.0, "articles": 1.0, "rankings": 0.5}
+RELEVANCE_HALF_LIFE_HOURS = 12  # Score halves for every this many hours of age
+RELEVANCE_SCAN_CHARS = 5000  # Only scan the start of long article bodies for keywords
+
+# Local extractive summaries (simple digest)
+EXTRACTIVE_SUMMARY_SENTENCES = 2  # Sentences kept per article
+EXTRACTIVE_SUMMARY_MAX_CHARS = 400  # Longer summaries are cut with "..."
+EXTRACTIVE_MAX_SENTENCES = 300  # Sentences considered per article
+EXTRACTIVE_SCAN_CHARS = 12000  # Only the start of very long pages is summarized
+EXTRACTIVE_KEYWORD_WEIGHT = 0.5  # Boost per log(1 + fantasy keyword hits)
+EXTRACTIVE_PLAYER_WEIGHT = 0.5  # Boost per log(1 + player name mentions)
+
+# Story clustering (MinHash-LSH near-duplicate detection)
+CLUSTER_NUM_PERM = 64  # MinHash signature length
+CLUSTER_BANDS = 16  # LSH bands (CLUSTER_NUM_PERM / CLUSTER_BANDS rows each)
+CLUSTER_SHINGLE_WORDS = 3  # Words per shingle
+CLUSTER_SCAN_CHARS = 4000  # Only the start of long pages is compared
+CLUSTER_SIMILARITY_THRESHOLD = 0.5  # Estimated Jaccard similarity to merge two items
+CLUSTER_ENTITY_SIMILARITY_THRESHOLD = 0.2  # Lower bar when both items are about the same player
+
+# Streaming pipeline configuration
+PIPELINE_BUFFER_SIZE = 64  # Items buffered between the fetch threads and the pipeline
+DIGEST_SPOOL_BYTES = 1024 * 1024  # Per-section render buffer kept in memory before spilling to disk
+DIGEST_RENDER_BATCH = 256  # Digest entries formatted and joined per written chunk
@@ -0,0 +1,123 @@
+"""In-process scheduler for long-running (daemon) mode."""
+
+import heapq
+import random
+import signal
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import DAEMON_JITTER_RATIO
+
+
+class Scheduler:
+    """
+    Runs named jobs repeatedly, each on its own interval.
+
+    Every wait is randomized by up to jitter_ratio of the interval, so
+    several daemons (or a daemon and cron jobs) don't hit the APIs in
+    lockstep. A job's next run is scheduled from when it finishes, so a
+    slow run delays the next one instead of queuing catch-up runs. A job
+    that raises is reported and keeps its schedule.
+    """
+
+    def __init__(self, jitter_ratio: float = DAEMON_JITTER_RATIO,
+                 clock: Callable[[], float] = time.monotonic, rng: Optional[random.Random] = None):
+        """
+        Args:
+            jitter_ratio: Maximum random change to each wait, as a fraction of the interval
+            clock: Monotonic time source
+            rng: Random source for the jitter
+        """
+        self.jitter_ratio = jitter_ratio
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._jobs: Dict[str, Tuple[float, Callable[[], object]]] = {}
+        self._queue: List[Tuple[float, int, str]] = []
+        self._order = 0
+
+    def add(self, name: str, interval: float, job: Callable[[], object], first_delay: float = 0.0):
+        """
+        Schedule a job.
+
+        Args:
+            name: Job name (used in log lines)
+            interval: Seconds between runs
+            job: Callable run on each tick
+            first_delay: Seconds before the first run (not jittered)
+        """
+        self._jobs[name] = (interval, job)
+        self._push(name, self.clock() + first_delay)
+
+    def _push(self, name: str, due: float):
+        heapq.heappush(self._queue, (due, self._order, name))
+        self._order += 1
+
+    def next_delay(self, interval: float) -> float:
+        """An interval with jitter applied."""
+        return interval * (1 + self.rng.uniform(-self.jitter_ratio, self.jitter_ratio))
+
+    def seconds_until_next(self) -> float:
+        """Seconds until the next job is due (0 if one is overdue)."""
+        if not self._queue:
+            return float("inf")
+        return max(0.0, self._queue[0][0] - self.clock())
+
+    def run_due(self) -> List[str]:
+        """
+        Run every job that is due, in due order.
+
+        Returns:
+            Names of the jobs that ran
+        """
+        ran = []
+        while self._queue and self._queue[0][0] <= self.clock():
+            _, _, name = heapq.heappop(self._queue)
+            interval, job = self._jobs[name]
+            started = self.clock()
+            print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] Running {name}")
+            try:
+                job()
+            except Exception as e:
+                print(f"Error in scheduled {name}: {e}")
+            delay = self.next_delay(interval)
+            print(f"  {name} took {self.clock() - started:.1f}s; next run in {delay / 60:.1f} min")
+            self._push(name, self.clock() + delay)
+            ran.append(name)
+        return ran
+
+    def run(self, stop: threading.Event):
+        """
+        Run jobs as they come due until stop is set.
+
+        Args:
+            stop: Event that ends the loop (checked between jobs and while waiting)
+        """
+        while not stop.is_set():
+            self.run_due()
+            stop.wait(self.seconds_until_next())
+
+
+def run_daemon(scheduler: Scheduler, stop: Optional[threading.Event] = None):
+    """
+    Run a scheduler in the foreground until interrupted.
+
+    SIGINT and SIGTERM stop the loop after the current job finishes.
+
+    Args:
+        scheduler: Scheduler with its jobs added
+        stop: Event to stop on (created if not given)
+    """
+    stop = stop or threading.Event()
+
+    def request_stop(signum, frame):
+        print(f"\nReceived {signal.Signals(signum).name}, stopping after the current job...")
+        stop.set()
+
+    previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        scheduler.run(stop)
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
@@ -3,10 +3,72 @@
 import requests
 import json
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime
-from typing import List, Dict, Any
-from .config import SLEEPER_BASE_URL, FANTASYPROS_BASE_URL, FANTASYPROS_API_KEY
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from .config import (
+    SLEEPER_BASE_URL, FANTASYPROS_BASE_URL, FANTASYPROS_API_KEY, SOURCE_TIMEOUT_SECONDS,
+    SLEEPER_TRENDING_LOOKBACK_HOURS, SLEEPER_TRENDING_LIMIT,
+)
+from .http_clients import get_session
+from .news_item import NewsItem
+from .run_coordination import atomic_write, lease
+from .trend_store import get_trend_store
+from .trend_anomaly import select_trending_players
+
+
+# Parsed Sleeper player table, reused until the cache file changes
+_player_details: Optional[Dict[str, Any]] = None
+_player_details_mtime: Optional[float] = None
+
+# Scraped-at date of each article file (keyed by path and mtime), so later
+# runs in the same process only read the files from the day they want
+_article_dates: Dict[str, Tuple[float, Optional[str]]] = {}
+
+# Held while a FantasyPros scrape runs; a source thread the pipeline gave up
+# on keeps running, and the shared scraper must not be driven twice at once
+_fantasypros_scrape = threading.Lock()
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]],
+                     timeouts: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Run independent I/O-bound tasks concurrently with per-task timeouts.
+    
+    Tasks that fail or miss their deadline are left out of the result, so
+    callers get partial results instead of an exception.
+    
+    Args:
+        tasks: Mapping of task name to a zero-argument callable
+        timeouts: Optional mapping of task name to timeout in seconds
+        
+    Returns:
+        Dictionary mapping task name to result for every task that finished
+    """
+    timeouts = timeouts or {}
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="fetch")
+    
+    try:
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+        start = time.monotonic()
+        
+        for name, future in futures.items():
+            timeout = timeouts.get(name)
+            remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - start))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FuturesTimeoutError:
+                print(f"Timed out waiting for {name} after {timeout} seconds, continuing without it")
+            except Exception as e:
+                print(f"Error fetching {name}: {e}")
+    finally:
+        # Don't block on stragglers; their results are simply discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return results
 
 
 def fetch_sleeper_news() -> List[Dict[str, Any]]:
@@ -19,23 +81,30 @@ def fetch_sleeper_news() -> List[Dict[str, Any]]:
     try:
         print("Fetching Sleeper trending players...")
         
-        # Get trending players (both adds and drops)
-        trending_adds = fetch_sleeper_trending_players("add")
-        trending_drops = fetch_sleeper_trending_players("drop")
+        # Trending adds, trending drops and player details are independent requests
+        results = run_concurrently({
+            "add": lambda: fetch_sleeper_trending_players("add"),
+            "drop": lambda: fetch_sleeper_trending_players("drop"),
+            "players": fetch_sleeper_player_details,
+        })
+        trending_adds = results.get("add") or []
+        trending_drops = results.get("drop") or []
+        player_details = results.get("players") or {}
         
-        # Get player details for trending players
-        player_details = fetch_sleeper_player_details()
+        # Keep the full trending lists so velocity/acceleration can be computed across polls
+        add_dynamics, drop_dynamics = record_trending_poll(trending_adds, trending_drops)
         
         sleeper_news = []
         
         # Process trending adds
-        for trend in trending_adds[:10]:  # Top 10 trending adds
+        top_adds = select_trending_players(get_trend_store(), "add", trending_adds, player_details, limit=10)
+        for trend in top_adds:  # Top 10 trending adds
             player_id = trend["player_id"]
             add_count = trend["count"]
             
             if player_id in player_details:
                 player = player_details[player_id]
-                sleeper_news.append({
+                sleeper_news.append(NewsItem.from_dict({
                     "player_name": f"{player.get('first_name', '')} {player.get('last_name', '')}".strip(),
                     "team": player.get("team", "Unknown"),
                     "position": player.get("position", "Unknown"),
@@ -44,17 +113,22 @@ def fetch_sleeper_news() -> List[Dict[str, Any]]:
                     "source": "sleeper",
                     "timestamp": datetime.now().isoformat(),
                     "trend_type": "add",
-                    "trend_count": add_count
-                })
+                    "trend_count": add_count,
+                    "player_id": player_id,
+                    "trend_velocity": add_dynamics.get(player_id, (0.0, 0.0))[0],
+                    "trend_acceleration": add_dynamics.get(player_id, (0.0, 0.0))[1],
+                    "anomaly_score": trend.get("anomaly_score")
+                }))
         
         # Process trending drops
-        for trend in trending_drops[:5]:  # Top 5 trending drops
+        top_drops = select_trending_players(get_trend_store(), "drop", trending_drops, player_details, limit=5)
+        for trend in top_drops:  # Top 5 trending drops
             player_id = trend["player_id"]
             drop_count = trend["count"]
             
             if player_id in player_details:
                 player = player_details[player_id]
-                sleeper_news.append({
+                sleeper_news.append(NewsItem.from_dict({
                     "player_name": f"{player.get('first_name', '')} {player.get('last_name', '')}".strip(),
                     "team": player.get("team", "Unknown"),
                     "position": player.get("position", "Unknown"),
@@ -63,8 +137,12 @@ def fetch_sleeper_news() -> List[Dict[str, Any]]:
                     "source": "sleeper",
                     "timestamp": datetime.now().isoformat(),
                     "trend_type": "drop",
-                    "trend_count": drop_count
-                })
+                    "trend_count": drop_count,
+                    "player_id": player_id,
+                    "trend_velocity": drop_dynamics.get(player_id, (0.0, 0.0))[0],
+                    "trend_acceleration": drop_dynamics.get(player_id, (0.0, 0.0))[1],
+                    "anomaly_score": trend.get("anomaly_score")
+                }))
         
         print(f"Fetched {len(sleeper_news)} trending items from Sleeper")
         return sleeper_news
@@ -74,6 +152,48 @@ def fetch_sleeper_news() -> List[Dict[str, Any]]:
         return []
 
 
+def record_trending_poll(trending_adds: List[Dict[str, Any]], trending_drops: List[Dict[str, Any]]):
+    """
+    Append a poll's full trending lists to the trend store.
+    
+    Args:
+        trending_adds: Sleeper trending adds
+        trending_drops: Sleeper trending drops
+        
+    Returns:
+        Tuple of (add dynamics, drop dynamics), each mapping player_id to (velocity, acceleration)
+    """
+    try:
+        store = get_trend_store()
+        poll_time = time.time()
+        store.append_poll("add", trending_adds, timestamp=poll_time)
+        store.append_poll("drop", trending_drops, timestamp=poll_time)
+        return store.dynamics("add"), store.dynamics("drop")
+    except Exception as e:
+        print(f"Error recording Sleeper trending history: {e}")
+        return {}, {}
+
+
+def poll_sleeper_trending() -> int:
+    """
+    Fetch the trending lists and record them, without building news items.
+    
+    Extra polls between digests give the trend store finer-grained history
+    for velocity and anomaly detection.
+    
+    Returns:
+        Number of trending entries recorded
+    """
+    results = run_concurrently({
+        "add": lambda: fetch_sleeper_trending_players("add"),
+        "drop": lambda: fetch_sleeper_trending_players("drop"),
+    })
+    trending_adds = results.get("add") or []
+    trending_drops = results.get("drop") or []
+    record_trending_poll(trending_adds, trending_drops)
+    return len(trending_adds) + len(trending_drops)
+
+
 def fetch_sleeper_trending_players(trend_type: str) -> List[Dict[str, Any]]:
     """
     Fetch trending players from Sleeper API.
@@ -87,11 +207,11 @@ def fetch_sleeper_trending_players(trend_type: str) -> List[Dict[str, Any]]:
     try:
         url = f"{SLEEPER_BASE_URL}/players/nfl/trending/{trend_type}"
         params = {
-            "lookback_hours": 24,
-            "limit": 25
+            "lookback_hours": SLEEPER_TRENDING_LOOKBACK_HOURS,
+            "limit": SLEEPER_TRENDING_LIMIT
         }
         
-        response = requests.get(url, params=params)
+        response = get_session("sleeper").get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -104,35 +224,55 @@ def fetch_sleeper_trending_players(trend_type: str) -> List[Dict[str, Any]]:
 def fetch_sleeper_player_details() -> Dict[str, Any]:
     """
     Fetch all player details from Sleeper API.
-    This is cached to avoid repeated calls to the large endpoint.
+    This is cached to avoid repeated calls to the large endpoint, and the
+    parsed table is kept in memory until the cache file changes.
     
     Returns:
         Dictionary mapping player_id to player details
     """
+    global _player_details, _player_details_mtime
     try:
         # Check if we have cached player data
         cache_file = "sleeper_players_cache.json"
         cache_time = 24 * 60 * 60  # 24 hours in seconds
-        
-        if os.path.exists(cache_file):
-            file_age = time.time() - os.path.getmtime(cache_file)
-            if file_age < cache_time:
+
+        def load_fresh_cache() -> Optional[Dict[str, Any]]:
+            global _player_details, _player_details_mtime
+            if not os.path.exists(cache_file):
+                return None
+            mtime = os.path.getmtime(cache_file)
+            if time.time() - mtime >= cache_time:
+                return None
+            if mtime != _player_details_mtime:
                 print("Using cached Sleeper player data...")
                 with open(cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        
-        print("Fetching fresh Sleeper player data...")
-        url = f"{SLEEPER_BASE_URL}/players/nfl"
-        
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        player_data = response.json()
-        
-        # Cache the data
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(player_data, f, indent=2)
-        
+                    _player_details = json.load(f)
+                _player_details_mtime = mtime
+            return _player_details
+
+        cached = load_fresh_cache()
+        if cached is not None:
+            return cached
+
+        # Only one process refreshes the cache; the others wait and then use its copy
+        with lease("sleeper_players"):
+            cached = load_fresh_cache()
+            if cached is not None:
+                return cached
+
+            print("Fetching fresh Sleeper player data...")
+            url = f"{SLEEPER_BASE_URL}/players/nfl"
+
+            response = get_session("sleeper").get(url)
+            response.raise_for_status()
+
+            player_data = response.json()
+
+            # Cache the data
+            with atomic_write(cache_file) as f:
+                json.dump(player_data, f, indent=2)
+            _player_details, _player_details_mtime = player_data, os.path.getmtime(cache_file)
+
         print(f"Cached {len(player_data)} players")
         return player_data
         
@@ -148,14 +288,38 @@ def fetch_fantasypros_news() -> List[Dict[str, Any]]:
     Returns:
         List of news items from FantasyPros
     """
+    fantasypros_news = list(iter_fantasypros_news())
+    print(f"Fetched {len(fantasypros_news)} items from FantasyPros via scraping")
+    return fantasypros_news
+
+
+def iter_fantasypros_news() -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield NFL news items from FantasyPros using web scraping.
+    
+    Items are produced one article at a time, so callers that stream them
+    never hold every article body in memory at once.
+    
+    Yields:
+        News items from FantasyPros
+    """
+    if not _fantasypros_scrape.acquire(blocking=False):
+        print("Previous FantasyPros scrape is still running, loading today's saved articles...")
+        try:
+            for article in iter_existing_scraped_articles(datetime.now().strftime("%Y-%m-%d")):
+                yield article_to_news_item(article)
+        except Exception as e:
+            print(f"Error loading saved FantasyPros articles: {e}")
+        return
+    
     try:
         print("Fetching FantasyPros news via web scraping...")
         
         # Import web scraper
-        from .web_scraper import FantasyProsScraper
+        from .web_scraper import get_fantasypros_scraper
         
-        # Initialize scraper
-        scraper = FantasyProsScraper()
+        # Reuse the process's scraper (and its set of already scraped URLs)
+        scraper = get_fantasypros_scraper()
         
         # First try to scrape new articles
         articles = scraper.scrape_fantasypros_articles(max_articles=1000)
@@ -163,41 +327,96 @@ def fetch_fantasypros_news() -> List[Dict[str, Any]]:
         # If no new articles were scraped, load existing articles from files
         if not articles:
             print("No new articles scraped, loading existing articles...")
-            all_articles = load_existing_scraped_articles()
             # Filter to today's articles only
-            articles = filter_news_by_date(all_articles)
+            target_date = datetime.now().strftime("%Y-%m-%d")
+            articles = iter_existing_scraped_articles(target_date)
         
         # Transform articles to our format
-        fantasypros_news = []
         for article in articles:
-            # Extract player names from title and content
-            player_name = extract_player_name_from_article(article)
-            
-            # Use raw content directly
-            summary = article.get("content", "")
-            if not summary:
-                # Fallback to truncated content
-                summary = article.get("content", "")[:500] + "..." if len(article.get("content", "")) > 500 else article.get("content", "")
-            
-            fantasypros_news.append({
-                "player_name": player_name,
-                "team": "Unknown",  # Could be enhanced to extract from content
-                "position": "Unknown",  # Could be enhanced to extract from content
-                "headline": article.get("title", ""),
-                "summary": summary,
-                "source": "fantasypros_scraped",
-                "timestamp": article.get("scraped_at", datetime.now().isoformat()),
-                "url": article.get("url", ""),
-                "author": article.get("author", "Unknown"),
-                "content_length": len(article.get("content", ""))
-            })
-        
-        print(f"Fetched {len(fantasypros_news)} items from FantasyPros via scraping")
-        return fantasypros_news
+            yield article_to_news_item(article)
         
     except Exception as e:
         print(f"Error fetching FantasyPros news via scraping: {e}")
-        return []
+    finally:
+        _fantasypros_scrape.release()
+
+
+def article_to_news_item(article: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Transform a scraped article into a news item.
+    
+    Args:
+        article: Article dictionary from the scraper or an article file
+        
+    Returns:
+        News item
+    """
+    # Extract player names from title and content
+    player_name = extract_player_name_from_article(article)
+    
+    # Use raw content directly
+    summary = article.get("content", "")
+    if not summary:
+        # Fallback to truncated content
+        summary = article.get("content", "")[:500] + "..." if len(article.get("content", "")) > 500 else article.get("content", "")
+    
+    return NewsItem.from_dict({
+        "player_name": player_name,
+        "team": "Unknown",  # Could be enhanced to extract from content
+        "position": "Unknown",  # Could be enhanced to extract from content
+        "headline": article.get("title", ""),
+        "summary": summary,
+        "source": "fantasypros_scraped",
+        "timestamp": article.get("scraped_at", datetime.now().isoformat()),
+        "url": article.get("url", ""),
+        "author": article.get("author", "Unknown"),
+        "section": article.get("section"),
+        "content_length": len(article.get("content", ""))
+    })
+
+
+def is_from_date(item: Dict[str, Any], target_date: str) -> bool:
+    """
+    Check whether a news item or article is from a specific date.
+    
+    Items whose date can't be determined are included (fallback).
+    
+    Args:
+        item: News item or article dictionary
+        target_date: Date in YYYY-MM-DD format
+        
+    Returns:
+        True if the item is from the target date or undated
+    """
+    item_date = date_of(item)
+    return item_date == target_date or item_date is None
+
+
+def date_of(item: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the date of a news item or article from its timestamp or scraped_at.
+    
+    Args:
+        item: News item or article dictionary
+        
+    Returns:
+        Date in YYYY-MM-DD format, or None if it can't be determined
+    """
+    item_date = None
+    if 'timestamp' in item:
+        try:
+            # Parse timestamp to get date
+            item_date = datetime.fromisoformat(item['timestamp'].replace('Z', '+00:00')).strftime("%Y-%m-%d")
+        except:
+            pass
+    elif 'scraped_at' in item:
+        try:
+            # Parse scraped_at to get date
+            item_date = datetime.fromisoformat(item['scraped_at'].replace('Z', '+00:00')).strftime("%Y-%m-%d")
+        except:
+            pass
+    
+    return item_date
 
 
 def filter_news_by_date(news_items: List[Dict[str, Any]], target_date: str = None) -> List[Dict[str, Any]]:
@@ -214,27 +433,7 @@ def filter_news_by_date(news_items: List[Dict[str, Any]], target_date: str = Non
     if target_date is None:
         target_date = datetime.now().strftime("%Y-%m-%d")
     
-    filtered_items = []
-    
-    for item in news_items:
-        # Check if the item is from the target date based on timestamp or scraped_at
-        item_date = None
-        if 'timestamp' in item:
-            try:
-                # Parse timestamp to get date
-                item_date = datetime.fromisoformat(item['timestamp'].replace('Z', '+00:00')).strftime("%Y-%m-%d")
-            except:
-                pass
-        elif 'scraped_at' in item:
-            try:
-                # Parse scraped_at to get date
-                item_date = datetime.fromisoformat(item['scraped_at'].replace('Z', '+00:00')).strftime("%Y-%m-%d")
-            except:
-                pass
-        
-        # Include item if it's from the target date or if we can't determine the date (fallback)
-        if item_date == target_date or item_date is None:
-            filtered_items.append(item)
+    filtered_items = [item for item in news_items if is_from_date(item, target_date)]
     
     print(f"Filtered to {len(filtered_items)} items from {target_date} out of {len(news_items)} total items")
     return filtered_items
@@ -248,14 +447,28 @@ def load_existing_scraped_articles() -> List[Dict[str, Any]]:
     Returns:
         List of article dictionaries from all dates
     """
-    import os
+    articles = list(iter_existing_scraped_articles())
+    print(f"Loaded {len(articles)} existing articles")
+    return articles
+
+
+def iter_existing_scraped_articles(target_date: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read existing scraped articles from the filesystem, one file at a time.
+    
+    Args:
+        target_date: Only articles from this date (YYYY-MM-DD, see is_from_date);
+            files already read once and known to be from another date are skipped
+    
+    Yields:
+        Article dictionaries from all dates, or from target_date
+    """
     import glob
     
-    articles = []
     articles_dir = "scraped_articles"
     
     if not os.path.exists(articles_dir):
-        return articles
+        return
     
     # Find all .txt files in the scraped_articles directory
     pattern = os.path.join(articles_dir, "**", "*.txt")
@@ -264,52 +477,82 @@ def load_existing_scraped_articles() -> List[Dict[str, Any]]:
     print(f"Found {len(txt_files)} existing article files from all dates")
     
     for filepath in txt_files:
+        if target_date is None:
+            article = read_article_file(filepath)
+            if article:
+                yield article
+            continue
+        
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Parse the article file format
-            lines = content.split('\n')
-            if len(lines) < 8:
-                continue
-                
-            # Extract metadata
-            title = lines[0].replace('Title: ', '').strip()
-            author = lines[1].replace('Author: ', '').strip()
-            date = lines[2].replace('Date: ', '').strip()
-            url = lines[3].replace('URL: ', '').strip()
-            section = lines[4].replace('Section: ', '').strip()
-            source_url = lines[5].replace('Source URL: ', '').strip()
-            tags = lines[6].replace('Tags: ', '').strip()
-            scraped_at = lines[7].replace('Scraped: ', '').strip()
-            
-            # Find content start (after the separator)
-            content_start = content.find('==================================================')
-            if content_start != -1:
-                article_content = content[content_start + 52:].strip()  # Skip separator
-            else:
-                article_content = content
-            
-            # Only include articles with substantial content
-            if len(article_content) > 100:
-                articles.append({
-                    'title': title,
-                    'author': author,
-                    'date': date,
-                    'url': url,
-                    'section': section,
-                    'source_url': source_url,
-                    'tags': tags.split(', ') if tags else [],
-                    'content': article_content,
-                    'scraped_at': scraped_at
-                })
-                
-        except Exception as e:
-            print(f"Error reading {filepath}: {e}")
+            mtime = os.path.getmtime(filepath)
+        except OSError:
             continue
+        known = _article_dates.get(filepath)
+        if known is not None and known[0] == mtime and known[1] not in (target_date, None):
+            continue
+        article = read_article_file(filepath)
+        # Undated articles match any date; unusable files are not read again
+        item_date = date_of(article) if article else ""
+        _article_dates[filepath] = (mtime, item_date)
+        if item_date in (target_date, None):
+            yield article
+
+
+def read_article_file(filepath: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a scraped article file.
     
-    print(f"Loaded {len(articles)} existing articles")
-    return articles
+    Args:
+        filepath: Path to the article .txt file
+        
+    Returns:
+        Article dictionary, or None if the file is unreadable or too short
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Parse the article file format
+        lines = content.split('\n')
+        if len(lines) < 8:
+            return None
+            
+        # Extract metadata
+        title = lines[0].replace('Title: ', '').strip()
+        author = lines[1].replace('Author: ', '').strip()
+        date = lines[2].replace('Date: ', '').strip()
+        url = lines[3].replace('URL: ', '').strip()
+        section = lines[4].replace('Section: ', '').strip()
+        source_url = lines[5].replace('Source URL: ', '').strip()
+        tags = lines[6].replace('Tags: ', '').strip()
+        scraped_at = lines[7].replace('Scraped: ', '').strip()
+        
+        # Find content start (after the separator)
+        content_start = content.find('==================================================')
+        if content_start != -1:
+            article_content = content[content_start + 52:].strip()  # Skip separator
+        else:
+            article_content = content
+        
+        # Only include articles with substantial content
+        if len(article_content) <= 100:
+            return None
+        
+        return {
+            'title': title,
+            'author': author,
+            'date': date,
+            'url': url,
+            'section': section,
+            'source_url': source_url,
+            'tags': tags.split(', ') if tags else [],
+            'content': article_content,
+            'scraped_at': scraped_at
+        }
+        
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        return None
 
 
 def extract_player_name_from_article(article: Dict[str, Any]) -> str:
@@ -345,13 +588,16 @@ def fetch_all_news() -> List[Dict[str, Any]]:
     """
     all_news = []
     
-    # Fetch from Sleeper
-    sleeper_news = fetch_sleeper_news()
-    all_news.extend(sleeper_news)
-    
-    # Fetch from FantasyPros
-    fantasypros_news = fetch_fantasypros_news()
-    all_news.extend(fantasypros_news)
+    # Fetch every source at once; a slow or failing source only loses its own items
+    results = run_concurrently(
+        {
+            "sleeper": fetch_sleeper_news,
+            "fantasypros": fetch_fantasypros_news,
+        },
+        timeouts=SOURCE_TIMEOUT_SECONDS,
+    )
+    for source_name in ("sleeper", "fantasypros"):
+        all_news.extend(results.get(source_name) or [])
     
     print(f"Total news items fetched: {len(all_news)}")
     
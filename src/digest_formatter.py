@@ -1,18 +1,43 @@
 """Digest formatting and file writing functions."""
 
 import os
+import re
+import time
 from datetime import datetime
-from typing import List, Dict, Any
-from .config import OUTPUT_DIR, DIGEST_FILENAME_TEMPLATE
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from .config import OUTPUT_DIR, DIGEST_FILENAME_TEMPLATE, DELTA_DIGEST_FILENAME_TEMPLATE
+from .digest_renderer import DIGEST_FORMATS, MARKDOWN, DigestModel, digest_entry, render_digest
+from .run_coordination import atomic_write, lease
 
 
 def ensure_output_directory():
     """Ensure the output directory exists."""
     if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
         print(f"Created output directory: {OUTPUT_DIR}")
 
 
+def digest_filepath(digest_format: str = "markdown") -> str:
+    """Ensure the output directory exists and return today's digest path for a format."""
+    ensure_output_directory()
+    
+    # Generate filename with today's date
+    today = datetime.now()
+    filename = DIGEST_FILENAME_TEMPLATE.format(date=today.strftime("%Y%m%d"))
+    extension = DIGEST_FORMATS[digest_format].extension
+    return os.path.join(OUTPUT_DIR, f"{os.path.splitext(filename)[0]}.{extension}")
+
+
+def delta_digest_filepath(digest_format: str = "markdown") -> str:
+    """Ensure the output directory exists and return a path for this run's "what changed" digest."""
+    ensure_output_directory()
+    
+    now = datetime.now()
+    filename = DELTA_DIGEST_FILENAME_TEMPLATE.format(date=now.strftime("%Y%m%d"), time=now.strftime("%H%M%S"))
+    extension = DIGEST_FORMATS[digest_format].extension
+    return os.path.join(OUTPUT_DIR, f"{os.path.splitext(filename)[0]}.{extension}")
+
+
 def write_digest(digest_content: str) -> str:
     """
     Write the digest content to a markdown file.
@@ -23,15 +48,12 @@ def write_digest(digest_content: str) -> str:
     Returns:
         Path to the written file
     """
-    ensure_output_directory()
-    
-    # Generate filename with today's date
-    today = datetime.now()
-    filename = DIGEST_FILENAME_TEMPLATE.format(date=today.strftime("%Y%m%d"))
-    filepath = os.path.join(OUTPUT_DIR, filename)
+    filepath = digest_filepath()
     
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
+        # Swapped in whole, so a digest that is being replaced (e.g. upgraded
+        # after a deadline, or by another run) is never seen half-written
+        with atomic_write(filepath) as f:
             f.write(digest_content)
         
         print(f"Digest written to: {filepath}")
@@ -42,6 +64,150 @@ def write_digest(digest_content: str) -> str:
         return ""
 
 
+def write_digest_stream(chunks: Iterable[str], digest_format: str = "markdown",
+                        filepath: Optional[str] = None) -> str:
+    """
+    Write digest content as it is produced, then swap it in as the digest file.
+    
+    Args:
+        chunks: Digest content pieces, written in order
+        digest_format: Format of the content, which picks the file extension
+        filepath: Write here instead of today's digest path
+        
+    Returns:
+        Path to the written file
+    """
+    filepath = filepath or digest_filepath(digest_format)
+    
+    try:
+        with atomic_write(filepath) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        
+        print(f"Digest written to: {filepath}")
+        return filepath
+        
+    except Exception as e:
+        print(f"Error writing digest: {e}")
+        return ""
+
+
+_SECTION_START = re.compile(r"^#{1,3} ", re.MULTILINE)
+
+
+def write_digest_progressive(chunks: Iterable[str]) -> str:
+    """
+    Write a streamed digest section by section, then move it into place.
+    
+    Content goes to "<digest>.partial" and is flushed each time a Markdown
+    heading starts a new section, so readers can follow the digest as it
+    arrives. When the stream ends the file is renamed over the digest in
+    one step. If the stream breaks, the partial file is kept with a note
+    of the error and timings appended, and nothing replaces the digest.
+    Concurrent runs take turns, since they share the partial file.
+    
+    Args:
+        chunks: Digest text pieces (e.g. LLM token deltas), in order
+        
+    Returns:
+        Path to the written file, or "" if the stream failed
+    """
+    filepath = digest_filepath()
+    partial_path = filepath + ".partial"
+    start = time.monotonic()
+    first_chunk = first_section = None
+    sections = 0
+    buffer = ""
+    
+    error = None
+    try:
+        # Locked next to the digest (a hidden file the digest listings skip)
+        with lease(f".{os.path.basename(filepath)}", directory=os.path.dirname(filepath) or "."):
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                try:
+                    for chunk in chunks:
+                        if first_chunk is None:
+                            first_chunk = time.monotonic() - start
+                        buffer += chunk
+                        # Everything before the last heading is a finished section
+                        starts = [m.start() for m in _SECTION_START.finditer(buffer) if m.start() > 0]
+                        if starts:
+                            f.write(buffer[:starts[-1]])
+                            f.flush()
+                            buffer = buffer[starts[-1]:]
+                            sections += len(starts)
+                            if first_section is None:
+                                first_section = time.monotonic() - start
+                except Exception as e:
+                    error = e
+                    timings = _stream_timings(first_chunk, first_section, time.monotonic() - start)
+                    buffer += f"\n\n<!-- Stream interrupted: {timings}, {sections} sections complete: {e} -->\n"
+                f.write(buffer)
+        
+            if error is None:
+                os.replace(partial_path, filepath)
+            elif first_chunk is None:
+                os.remove(partial_path)
+    except OSError as e:
+        print(f"Error writing digest: {e}")
+        return ""
+    
+    if error is not None:
+        print(f"Digest stream failed ({_stream_timings(first_chunk, first_section, time.monotonic() - start)}): "
+              f"{error}")
+        if first_chunk is not None:
+            print(f"Partial digest kept at: {partial_path}")
+        return ""
+    
+    total = time.monotonic() - start
+    if first_chunk is not None:
+        first_section = first_section if first_section is not None else total
+        print(f"Streamed digest: {_stream_timings(first_chunk, first_section, total)}")
+    print(f"Digest written to: {filepath}")
+    return filepath
+
+
+def _stream_timings(first_chunk: Optional[float], first_section: Optional[float], elapsed: float) -> str:
+    """Describe a stream's time to first text and first section, and how long it ran."""
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:.1f}s" if value is not None else "never"
+    return (f"first text after {seconds(first_chunk)}, first section after {seconds(first_section)}, "
+            f"ended after {elapsed:.1f}s")
+
+
+def format_simple_digest_line(item: Dict[str, Any], section: str) -> str:
+    """
+    Format one item as a simple digest bullet.
+    
+    Args:
+        item: News item
+        section: The item's section key
+        
+    Returns:
+        Markdown bullet line
+    """
+    return MARKDOWN.format_item(digest_entry(item, section))
+
+
+def render_simple_digest(news_items: Iterable[Dict[str, Any]], digest_format: str = "markdown") -> Iterator[str]:
+    """
+    Render the simple digest in one pass over the items.
+    
+    Items are grouped into a DigestModel as they arrive (memory stays
+    bounded however many flow through) and then rendered with the
+    format's precompiled template.
+    
+    Args:
+        news_items: Fantasy-relevant news items (any iterable, including generators)
+        digest_format: "markdown", "html" or "json" (see DIGEST_FORMATS)
+        
+    Yields:
+        Digest chunks in output order
+    """
+    with DigestModel(news_items) as model:
+        yield from render_digest(model, digest_format)
+
+
 def format_news_summary(news_items: List[Dict[str, Any]]) -> str:
     """
     Format a simple summary of news items.
@@ -55,12 +221,10 @@ def format_news_summary(news_items: List[Dict[str, Any]]) -> str:
     if not news_items:
         return "No news items to summarize."
     
-    summary = f"Found {len(news_items)} fantasy-relevant news items:\n\n"
-    
+    parts = [f"Found {len(news_items)} fantasy-relevant news items:\n\n"]
     for i, item in enumerate(news_items, 1):
-        summary += f"{i}. **{item.get('player_name', 'Unknown')}** ({item.get('team', 'Unknown')}) - {item.get('headline', 'No headline')}\n"
+        parts.append(f"{i}. **{item.get('player_name', 'Unknown')}** ({item.get('team', 'Unknown')}) - {item.get('headline', 'No headline')}\n")
         if item.get('summary'):
-            summary += f"   *{item.get('summary')}*\n"
-        summary += f"   *Source: {item.get('source', 'Unknown')}*\n\n"
-    
-    return summary
+            parts.append(f"   *{item.get('summary')}*\n")
+        parts.append(f"   *Source: {item.get('source', 'Unknown')}*\n\n")
+    return "".join(parts)
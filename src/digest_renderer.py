@@ -0,0 +1,343 @@
+"""Single-pass digest model rendered through precompiled Markdown, HTML and JSON templates."""
+
+import html
+import json
+import pickle
+import tempfile
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from .config import DIGEST_SPOOL_BYTES, DIGEST_RENDER_BATCH
+from .extractive_summarizer import summarize
+
+
+# Simple digest sections, in output order
+SIMPLE_DIGEST_SECTIONS = [
+    ("trending_up", "Trending Up (Sleeper)"),
+    ("trending_down", "Trending Down (Sleeper)"),
+    ("other_sleeper", "Other Sleeper News"),
+    ("fantasypros", "FantasyPros News"),
+]
+
+DIGEST_TITLE = "NFL Daily Fantasy Digest"
+
+
+def simple_digest_section(item: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the simple digest section an item belongs to.
+
+    Args:
+        item: News item
+
+    Returns:
+        Section key from SIMPLE_DIGEST_SECTIONS, or None if the item isn't shown
+    """
+    source = item.get("source")
+    if source == "sleeper":
+        if "trend_type" not in item:
+            return "other_sleeper"
+        return {"add": "trending_up", "drop": "trending_down"}.get(item.get("trend_type"))
+    if source == "fantasypros_scraped":
+        return "fantasypros"
+    return None
+
+
+def format_trend_velocity(item: Dict[str, Any]) -> str:
+    """
+    Format a trending item's velocity since the previous poll.
+
+    Args:
+        item: Sleeper trending news item
+
+    Returns:
+        Suffix like " (+42/h, accelerating)", or "" when there is no history
+    """
+    velocity = item.get("trend_velocity")
+    if not velocity:
+        return ""
+
+    suffix = f" ({velocity:+.0f}/h"
+    acceleration = item.get("trend_acceleration") or 0
+    if acceleration > 0:
+        suffix += ", accelerating"
+    elif acceleration < 0:
+        suffix += ", slowing"
+    return suffix + ")"
+
+
+def digest_entry(item: Dict[str, Any], section: str) -> List[Any]:
+    """
+    Reduce an item to the fields every digest format shows.
+
+    This is where the per-item work happens (e.g. summarizing articles),
+    once per item however many formats are rendered.
+
+    Args:
+        item: News item
+        section: The item's section key
+
+    Returns:
+        [player, team, text, reports, sources, recent] where reports is the
+        number of reports the story was clustered from, sources counts them
+        by source and recent lists the player's earlier news (see player_timeline)
+    """
+    if section == "trending_up":
+        text = f"{item.get('trend_count', 0)} adds in 24h{format_trend_velocity(item)}"
+    elif section == "trending_down":
+        text = f"{item.get('trend_count', 0)} drops in 24h{format_trend_velocity(item)}"
+    elif section == "other_sleeper":
+        text = item.get('headline', 'No headline')
+    else:
+        # Show the most informative sentences of the article, otherwise the headline
+        text = summarize(item.get('summary', ''), item.get('player_name')) or item.get('headline', 'No headline')
+    return [item.get('player_name', 'Unknown'), item.get('team', 'Unknown'), text,
+            item.get('cluster_size') or 1, item.get('cluster_sources') or {}, item.get('recent_context') or []]
+
+
+class _EntrySpool:
+    """Entries kept in memory up to about max_bytes of text, then spilled to a temporary file in pickled batches."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: List[List[Any]] = []
+        self.size = 0
+        self.file = None
+
+    def append(self, entry: List[Any]):
+        self.entries.append(entry)
+        self.size += len(entry[2]) + 96  # Text plus a rough allowance for the short fields
+        if self.size > self.max_bytes:
+            if self.file is None:
+                self.file = tempfile.TemporaryFile()
+            pickle.dump(self.entries, self.file, pickle.HIGHEST_PROTOCOL)
+            self.entries, self.size = [], 0
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        if self.file is not None:
+            self.file.seek(0)
+            while True:
+                try:
+                    batch = pickle.load(self.file)
+                except EOFError:
+                    break
+                yield from batch
+        yield from self.entries
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class DigestModel:
+    """
+    News items grouped into digest sections in one pass.
+
+    Each section's entries (see digest_entry) stay in memory up to
+    DIGEST_SPOOL_BYTES and then spill to a temporary file, so memory stays
+    bounded however many items flow through. The model can be rendered
+    any number of times, in any format, without touching the items
+    again. Close it when done.
+    """
+
+    def __init__(self, news_items: Iterable[Dict[str, Any]] = (), date: Optional[datetime] = None,
+                 sections: List[Tuple[str, str]] = SIMPLE_DIGEST_SECTIONS, title: str = DIGEST_TITLE):
+        """
+        Group news items into sections.
+
+        Args:
+            news_items: Fantasy-relevant news items (any iterable, including generators)
+            date: Digest date (defaults to now)
+            sections: (key, heading) pairs in output order; items are only
+                grouped automatically into SIMPLE_DIGEST_SECTIONS, other
+                layouts are filled with add()
+            title: Digest title
+        """
+        self.date = date or datetime.now()
+        self.title = title
+        self.item_count = 0
+        self._sections = sections
+        self.section_counts = {key: 0 for key, _ in sections}
+        self._spools = {key: _EntrySpool(DIGEST_SPOOL_BYTES) for key, _ in sections}
+        try:
+            for item in news_items:
+                self.item_count += 1
+                section = simple_digest_section(item)
+                if section:
+                    self._spools[section].append(digest_entry(item, section))
+                    self.section_counts[section] += 1
+        except BaseException:
+            self.close()
+            raise
+
+    def add(self, section: str, entry: List[Any]):
+        """
+        Add a prepared entry (see digest_entry) to a section.
+
+        Args:
+            section: Section key
+            entry: Digest entry
+        """
+        self.item_count += 1
+        self._spools[section].append(entry)
+        self.section_counts[section] += 1
+
+    def sections(self) -> Iterator[Tuple[str, str]]:
+        """Yield (key, heading) for each non-empty section, in output order."""
+        for key, heading in self._sections:
+            if self.section_counts[key]:
+                yield key, heading
+
+    def entries(self, key: str) -> Iterator[List[Any]]:
+        """Yield a section's entries in arrival order."""
+        return iter(self._spools[key])
+
+    def close(self):
+        """Release the section spools."""
+        for spool in self._spools.values():
+            spool.close()
+
+    def __enter__(self) -> "DigestModel":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class DigestTemplate:
+    """
+    One output format of the digest.
+
+    Each piece is a str.format pattern bound once at import time; fields
+    are escaped for the format before they are substituted.
+
+    Pieces and their fields:
+        header: {title}, {date}, {iso_date}, {item_count}
+        empty: output instead of the sections when there are no items
+        section_start / section_end: {key}, {heading}
+        item: {player}, {team}, {text}, {note}, {reports}, {sources}, {recent}
+        note: {reports}, {sources}; appended to text for multi-report stories
+        recent: {events}; the player's earlier news, rendered into {recent}
+        item_separator / section_separator: between items / sections
+        footer: after the last section
+    """
+
+    def __init__(self, extension: str, escape: Callable[[Any], str], header: str, empty: str,
+                 section_start: str, item: str, section_end: str, footer: str,
+                 note: str = "", recent: str = "", item_separator: str = "", section_separator: str = ""):
+        self.extension = extension
+        self.escape = escape
+        self.header = header.format
+        self.empty = empty
+        self.section_start = section_start.format
+        self.item = item.format
+        self.item_has_sources = "{sources}" in item
+        self.note = note.format if note else None
+        self.recent = recent.format if recent else None
+        self.section_end = section_end.format
+        self.item_separator = item_separator
+        self.section_separator = section_separator
+        self.footer = footer
+
+    def format_item(self, entry: List[Any]) -> str:
+        """Render one digest entry (see digest_entry)."""
+        player, team, text, reports, sources = entry[:5]
+        events = entry[5] if len(entry) > 5 else []
+        escape = self.escape
+        note = recent = ""
+        if reports > 1 and self.note is not None:
+            counts = ", ".join(f"{source} {count}" for source, count in sorted(sources.items()))
+            note = self.note(reports=reports, sources=escape(counts))
+        if self.recent is None:
+            recent = escape(events)
+        elif events:
+            recent = self.recent(events=escape("; ".join(events)))
+        return self.item(player=escape(player), team=escape(team), text=escape(text), note=note,
+                         reports=reports, sources=escape(sources) if self.item_has_sources else "",
+                         recent=recent)
+
+
+MARKDOWN = DigestTemplate(
+    extension="md",
+    escape=str,
+    header="# {title} — {date}\n\n",
+    empty="No fantasy-relevant news found today.\n",
+    section_start="## {heading}\n\n",
+    item="- **{player}** ({team}) - {text}{note}{recent}\n",
+    note=" _({reports} reports: {sources})_",
+    recent="\n  - _Earlier: {events}_",
+    section_end="\n",
+    footer="*(Data aggregated from Sleeper + FantasyPros)*\n",
+)
+
+HTML = DigestTemplate(
+    extension="html",
+    escape=lambda value: html.escape(str(value)),
+    header=('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            '<title>{title} — {date}</title>\n</head>\n<body>\n<h1>{title} — {date}</h1>\n'),
+    empty="<p>No fantasy-relevant news found today.</p>\n</body>\n</html>\n",
+    section_start='<section id="{key}">\n<h2>{heading}</h2>\n<ul>\n',
+    item="<li><strong>{player}</strong> ({team}) - {text}{note}{recent}</li>\n",
+    note=" <em>({reports} reports: {sources})</em>",
+    recent="<br><small>Earlier: {events}</small>",
+    section_end="</ul>\n</section>\n",
+    footer="<p><em>(Data aggregated from Sleeper + FantasyPros)</em></p>\n</body>\n</html>\n",
+)
+
+JSON = DigestTemplate(
+    extension="json",
+    escape=json.JSONEncoder(ensure_ascii=False).encode,
+    header='{{"title": {title}, "date": {iso_date}, "item_count": {item_count}, "sections": [',
+    empty="]}\n",
+    section_start='\n{{"key": {key}, "heading": {heading}, "items": [\n',
+    item=('{{"player": {player}, "team": {team}, "text": {text}, "reports": {reports}, '
+          '"sources": {sources}, "recent": {recent}}}'),
+    item_separator=",\n",
+    section_end="\n]}}",
+    section_separator=",",
+    footer="\n]}\n",
+)
+
+DIGEST_FORMATS = {"markdown": MARKDOWN, "html": HTML, "json": JSON}
+
+
+def render_digest(model: DigestModel, digest_format: str = "markdown") -> Iterator[str]:
+    """
+    Render a grouped digest.
+
+    Entries are formatted in batches of DIGEST_RENDER_BATCH and joined, so
+    the writer receives a few large chunks instead of one per item.
+
+    Args:
+        model: Grouped digest
+        digest_format: Key of DIGEST_FORMATS
+
+    Yields:
+        Digest text chunks in output order
+    """
+    template = DIGEST_FORMATS[digest_format]
+    escape = template.escape
+    yield template.header(title=escape(model.title), date=escape(model.date.strftime("%B %d, %Y")),
+                          iso_date=escape(model.date.date().isoformat()), item_count=model.item_count)
+
+    if not model.item_count:
+        yield template.empty
+        return
+
+    for index, (key, heading) in enumerate(model.sections()):
+        if index:
+            yield template.section_separator
+        yield template.section_start(key=escape(key), heading=escape(heading))
+        separator = template.item_separator
+        lead = ""
+        batch = []
+        for entry in model.entries(key):
+            batch.append(template.format_item(entry))
+            if len(batch) >= DIGEST_RENDER_BATCH:
+                yield lead + separator.join(batch)
+                lead, batch = separator, []
+        if batch:
+            yield lead + separator.join(batch)
+        yield template.section_end(key=escape(key), heading=escape(heading))
+
+    yield template.footer
+
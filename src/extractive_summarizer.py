@@ -0,0 +1,239 @@
+"""Local extractive summarization of news articles (TF-IDF + TextRank)."""
+
+import re
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from .config import (
+    EXTRACTIVE_SUMMARY_SENTENCES,
+    EXTRACTIVE_SUMMARY_MAX_CHARS,
+    EXTRACTIVE_MAX_SENTENCES,
+    EXTRACTIVE_SCAN_CHARS,
+    EXTRACTIVE_KEYWORD_WEIGHT,
+    EXTRACTIVE_PLAYER_WEIGHT,
+)
+from .keyword_matcher import get_news_matcher
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(“‘])")
+_DETACHED_PUNCTUATION = re.compile(r" ([.,;:!?)’”])")
+_CAPITALIZED_WORD = re.compile(r"(?<!\S)[A-Z0-9]")
+_WORD = re.compile(r"[a-z0-9][a-z0-9'’]*")
+# Two or more capitalized words in a row, e.g. "Derrick Henry", "Marvin Harrison Jr."
+_PROPER_NAME = re.compile(r"\b[A-Z][a-zA-Z'’.-]+(?: [A-Z][a-zA-Z'’.-]+)+")
+
+_TITLE_SMALL_WORDS = frozenset({"a", "an", "and", "at", "by", "for", "in", "of", "on", "or", "the", "to", "vs", "&", "–", "-"})
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been before but by can could did do does
+for from had has have he her his how i if in into is it its just more most my no not of on
+one or our out over she so than that the their them then there these they this those to
+up was we week were what when which who why will with would you your
+""".split())
+
+MIN_SENTENCE_WORDS = 6
+MAX_SENTENCE_WORDS = 60
+MAX_CAPITALIZED_RATIO = 0.5
+
+
+def _is_heading_line(line: str) -> bool:
+    """A short Title Case line with no closing punctuation: a nav link or subheading."""
+    if len(line) > 80 or line[-1] in ".!?:;,\"”’)":
+        return False
+    return all(w[0].isupper() or not w[0].isalpha() or w.lower() in _TITLE_SMALL_WORDS for w in line.split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    Scraped pages wrap lines around links, so single newlines are joined.
+    The exception is a Title Case line with no closing punctuation that is
+    followed by a capitalized line: that is a heading or navigation link
+    and becomes its own "sentence" instead of being glued to the next one.
+
+    Args:
+        text: Article or summary text
+
+    Returns:
+        Sentences with whitespace collapsed
+    """
+    if not text:
+        return []
+    lines = [line for line in (raw.strip() for raw in text.splitlines()) if line]
+    # Join wrapped lines with spaces and keep a newline only after headings
+    parts = []
+    for line, next_line in zip(lines, lines[1:] + [""]):
+        parts.append(line)
+        heading = next_line and (next_line[0].isupper() or next_line[0] in "\"“") and _is_heading_line(line)
+        parts.append("\n" if heading else " ")
+    # Glue punctuation that a link wrap left on its own ("Derrick Henry .")
+    joined = _DETACHED_PUNCTUATION.sub(r"\1", "".join(parts))
+    return [" ".join(sentence.split())
+            for block in joined.split("\n") for sentence in _SENTENCE_END.split(block)
+            if sentence and not sentence.isspace()]
+
+
+def textrank(similarity: np.ndarray, damping: float = 0.85, iterations: int = 50,
+             tolerance: float = 1e-6) -> np.ndarray:
+    """
+    Rank sentences by centrality in their similarity graph (PageRank).
+
+    Args:
+        similarity: Symmetric non-negative matrix with a zero diagonal
+
+    Returns:
+        Rank per sentence, summing to 1
+    """
+    n = len(similarity)
+    if n == 0:
+        return np.zeros(0)
+    out_weight = similarity.sum(axis=1)
+    # Sentences with no similar neighbours spread their rank evenly
+    transition = np.where(out_weight[:, None] > 0,
+                          similarity / np.where(out_weight > 0, out_weight, 1)[:, None],
+                          1.0 / n)
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ rank)
+        if np.abs(updated - rank).sum() < tolerance:
+            return updated
+        rank = updated
+    return rank
+
+
+def _tfidf_matrix(sentences: List[str]) -> np.ndarray:
+    """
+    L2-normalised TF-IDF row per sentence, IDF over the document's own sentences.
+
+    Only the columns of words shared by two or more sentences are returned
+    (the others never contribute to a dot product between sentences), but
+    each row is normalised over all of its words, so row dot products are
+    the true cosine similarities.
+    """
+    n = len(sentences)
+    vocabulary: Dict[str, int] = {}
+    ids = [[vocabulary.setdefault(word, len(vocabulary)) for word in _WORD.findall(sentence.lower())
+            if word not in STOPWORDS]
+           for sentence in sentences]
+    width = len(vocabulary)
+    if not width:
+        return np.zeros((n, 0))
+    rows = np.repeat(np.arange(n), [len(sentence_ids) for sentence_ids in ids])
+    cols = np.fromiter((i for sentence_ids in ids for i in sentence_ids), dtype=np.int64, count=len(rows))
+
+    # One (sentence, word, count) triple per distinct pair
+    pairs, counts = np.unique(rows * width + cols, return_counts=True)
+    pair_rows, pair_cols = np.divmod(pairs, width)
+    doc_freq = np.bincount(pair_cols, minlength=width)
+    idf = np.log((1 + n) / (1 + doc_freq)) + 1
+    weights = np.log1p(counts) * idf[pair_cols]
+    norms = np.sqrt(np.bincount(pair_rows, weights=weights ** 2, minlength=n))
+
+    shared = doc_freq >= 2
+    column = np.cumsum(shared) - 1
+    keep = shared[pair_cols]
+    matrix = np.zeros((n, int(shared.sum())))
+    matrix[pair_rows[keep], column[pair_cols[keep]]] = weights[keep] / norms[pair_rows[keep]]
+    return matrix
+
+
+def is_prose(sentence: str) -> bool:
+    """
+    Check whether a sentence looks like article prose.
+
+    Navigation, bylines, related-article lists and table rows run together
+    into long "sentences" that are mostly Title Case words or don't end
+    with closing punctuation; those are not prose.
+    """
+    words = sentence.split()
+    if not MIN_SENTENCE_WORDS <= len(words) <= MAX_SENTENCE_WORDS:
+        return False
+    if sentence[-1] not in ".!?\"”’)":
+        return False
+    return len(_CAPITALIZED_WORD.findall(sentence)) / len(words) <= MAX_CAPITALIZED_RATIO
+
+
+def score_sentences(sentences: List[str], player_name: Optional[str] = None) -> np.ndarray:
+    """
+    Score sentences by how informative and player-related they are.
+
+    The base score is TextRank centrality over TF-IDF cosine similarity
+    between the prose sentences. It is boosted by fantasy keyword hits and
+    by mentions of players (the item's player or any capitalized full
+    name). Sentences that are not prose (see is_prose) score 0.
+
+    Args:
+        sentences: Sentences of one document
+        player_name: The player the item is about, if known
+
+    Returns:
+        Score per sentence
+    """
+    scores = np.zeros(len(sentences))
+    prose_index = [i for i, s in enumerate(sentences) if is_prose(s)]
+    if not prose_index:
+        return scores
+    prose = [sentences[i] for i in prose_index]
+    n = len(prose)
+
+    vectors = _tfidf_matrix(prose)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    centrality = textrank(similarity) * n  # 1.0 = average
+
+    # Keyword and name matches are found in one pass over the whole document
+    text = "\0".join(prose)
+    lowered = text.lower()
+    starts = np.cumsum([0] + [len(s) + 1 for s in prose[:-1]])
+    keyword_hits = _matches_per_sentence(get_news_matcher().pattern, lowered, starts)
+    player_mentions = _matches_per_sentence(_PROPER_NAME, text, starts)
+    name = (player_name or "").lower()
+    if name and name != "unknown":
+        player_mentions += 2 * _matches_per_sentence(re.compile(re.escape(name)), lowered, starts)
+
+    boost = 1 + EXTRACTIVE_KEYWORD_WEIGHT * np.log1p(keyword_hits) + EXTRACTIVE_PLAYER_WEIGHT * np.log1p(player_mentions)
+    scores[prose_index] = centrality * boost
+    return scores
+
+
+def _matches_per_sentence(pattern: "re.Pattern", text: str, starts: np.ndarray) -> np.ndarray:
+    """Count pattern matches per sentence, given each sentence's start offset in text."""
+    positions = [match.start() for match in pattern.finditer(text)]
+    sentence = np.searchsorted(starts, positions, side="right") - 1
+    return np.bincount(sentence, minlength=len(starts)).astype(np.float64)
+
+
+def summarize(text: str, player_name: Optional[str] = None,
+              max_sentences: int = EXTRACTIVE_SUMMARY_SENTENCES,
+              max_chars: int = EXTRACTIVE_SUMMARY_MAX_CHARS) -> str:
+    """
+    Summarize a text by its most informative player-related sentences.
+
+    Only the first EXTRACTIVE_SCAN_CHARS characters and at most
+    EXTRACTIVE_MAX_SENTENCES sentences are considered, which keeps very
+    long pages cheap. The chosen sentences are returned in their
+    original order.
+
+    Args:
+        text: Article or summary text
+        player_name: The player the item is about, if known
+        max_sentences: Maximum sentences in the summary
+        max_chars: Summaries longer than this are cut with "..."
+
+    Returns:
+        Summary text ("" if the text has no usable sentences)
+    """
+    sentences = split_sentences((text or "")[:EXTRACTIVE_SCAN_CHARS])[:EXTRACTIVE_MAX_SENTENCES]
+    if not sentences:
+        return ""
+    scores = score_sentences(sentences, player_name)
+    if not scores.any():
+        summary = sentences[0]
+    else:
+        top = np.argsort(-scores, kind="stable")[:max_sentences]
+        summary = " ".join(sentences[i] for i in sorted(top) if scores[i] > 0)
+    if len(summary) > max_chars:
+        summary = summary[:max_chars].rsplit(" ", 1)[0] + "..."
+    return summary
@@ -0,0 +1,168 @@
+"""Shared HTTP client registry for Sleeper, FantasyPros and OpenAI calls.
+
+Clients are created lazily, kept for the life of the process and reused by
+every fetcher, so TCP/TLS connection setup is paid once per host instead of
+once per request.
+"""
+
+import atexit
+import importlib.util
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_USER_AGENT,
+    OPENAI_API_KEY,
+    LLM_TIMEOUT_SECONDS,
+)
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": HTTP_USER_AGENT,
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+_httpx_client = None
+_openai_client = None
+
+
+class PooledSession(requests.Session):
+    """requests.Session with pooled keep-alive adapters and a default timeout."""
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT_SECONDS):
+        super().__init__()
+        self.timeout = timeout
+        self.headers.update(DEFAULT_HEADERS)
+
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def http2_available() -> bool:
+    """Return True if httpx can negotiate HTTP/2 (the optional h2 package is installed)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_session(name: str = "default") -> requests.Session:
+    """
+    Get the shared requests session for a named service.
+
+    Each service ("sleeper", "fantasypros", ...) gets its own session so its
+    headers and connection pools are isolated from the others.
+
+    Args:
+        name: Service name used as the registry key
+
+    Returns:
+        A pooled, keep-alive requests.Session
+    """
+    session = _sessions.get(name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = PooledSession()
+                _sessions[name] = session
+    return session
+
+
+def get_httpx_client():
+    """
+    Get the shared httpx client used for OpenAI requests.
+
+    HTTP/2 is enabled when the h2 package is available.
+
+    Returns:
+        A shared httpx.Client
+    """
+    global _httpx_client
+    if _httpx_client is None:
+        import httpx
+
+        with _lock:
+            if _httpx_client is None:
+                _httpx_client = httpx.Client(
+                    timeout=LLM_TIMEOUT_SECONDS,
+                    http2=http2_available(),
+                    limits=httpx.Limits(
+                        max_connections=HTTP_POOL_MAXSIZE,
+                        max_keepalive_connections=HTTP_POOL_CONNECTIONS,
+                    ),
+                )
+    return _httpx_client
+
+
+def get_openai_client():
+    """
+    Get the shared OpenAI client, backed by the shared httpx client.
+
+    Returns:
+        A shared OpenAI client
+    """
+    global _openai_client
+    if _openai_client is None:
+        from openai import OpenAI
+
+        http_client = get_httpx_client()
+        with _lock:
+            if _openai_client is None:
+                _openai_client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+    return _openai_client
+
+
+def create_async_openai_client():
+    """
+    Create an AsyncOpenAI client with its own pooled httpx.AsyncClient.
+
+    Async connection pools are bound to the event loop that uses them, so
+    this is not shared through the registry: create one per event loop and
+    close it with ``await client.close()``.
+
+    Returns:
+        A new AsyncOpenAI client
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(
+        timeout=LLM_TIMEOUT_SECONDS,
+        http2=http2_available(),
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_MAXSIZE,
+            max_keepalive_connections=HTTP_POOL_CONNECTIONS,
+        ),
+    )
+    return AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+
+
+def close_all():
+    """Close every client in the registry."""
+    global _httpx_client, _openai_client
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        if _httpx_client is not None:
+            _httpx_client.close()
+        _httpx_client = None
+        _openai_client = None
+
+
+atexit.register(close_all)
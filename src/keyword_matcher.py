@@ -0,0 +1,168 @@
+"""Compiled, word-boundary-aware keyword matching for news text."""
+
+import re
+from typing import List, Dict, Iterable, Optional
+
+from .config import FANTASY_KEYWORDS, NEWS_CATEGORY_KEYWORDS, FANTASY_TERMS
+
+
+RELEVANCE_LABEL = "relevance"
+
+
+class KeywordMatcher:
+    """
+    Matches a labelled keyword taxonomy against text in a single pass.
+
+    All terms are compiled into one prefix-trie regular expression anchored
+    on word boundaries, so "out" does not match "about" and "back" does not
+    match "feedback". A term also matches with a plural or third-person "s"
+    ("trades", "Bills"). Matching is case-insensitive and the longest term
+    wins, so "depth chart" is preferred over "depth". A term may carry
+    several labels.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.labels = list(taxonomy)
+        self.term_labels: Dict[str, List[str]] = {}
+        for label, terms in taxonomy.items():
+            for term in terms:
+                key = self._normalize(term)
+                labels = self.term_labels.setdefault(key, [])
+                if label not in labels:
+                    labels.append(label)
+
+        self.pattern = re.compile(rf"\b({_trie_regex(self.term_labels)})s?\b", re.IGNORECASE)
+
+    @staticmethod
+    def _normalize(term: str) -> str:
+        return " ".join(term.lower().split())
+
+    def _matches(self, texts):
+        """Yield (term, labels) for every match; only the matched terms are lowercased."""
+        term_labels = self.term_labels
+        for text in texts:
+            if not text:
+                continue
+            for match in self.pattern.finditer(text):
+                term = match.group(1).lower()
+                labels = term_labels.get(term)
+                if labels is None:
+                    # Multi-word term matched across irregular whitespace
+                    term = self._normalize(term)
+                    labels = term_labels[term]
+                yield term, labels
+
+    def scan(self, *texts: Optional[str], stop_at: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count keyword hits per label.
+
+        Args:
+            texts: One or more texts to scan (None is skipped)
+            stop_at: Stop scanning at the first hit for this label; the
+                counts then only cover the text up to that hit
+
+        Returns:
+            Dictionary mapping label to hit count; labels with no hits are omitted
+        """
+        hits: Dict[str, int] = {}
+        for _, labels in self._matches(texts):
+            for label in labels:
+                hits[label] = hits.get(label, 0) + 1
+            if stop_at is not None and stop_at in hits:
+                break
+        return hits
+
+    def matches_any(self, *texts: Optional[str]) -> bool:
+        """
+        Check whether any term occurs, stopping at the first hit.
+
+        Args:
+            texts: One or more texts to scan (None is skipped)
+
+        Returns:
+            True if any term is found
+        """
+        return any(text and self.pattern.search(text) for text in texts)
+
+    def first_label(self, *texts: Optional[str], order: List[str]) -> Optional[str]:
+        """
+        Get the highest-priority label with any hit.
+
+        Scanning stops as soon as a hit for order[0] is found.
+
+        Args:
+            texts: One or more texts to scan (None is skipped)
+            order: Labels in priority order
+
+        Returns:
+            The first label in order that has a hit, or None
+        """
+        rank = {label: i for i, label in enumerate(order)}
+        best = len(order)
+        for _, labels in self._matches(texts):
+            for label in labels:
+                best = min(best, rank.get(label, best))
+            if best == 0:
+                break
+        return order[best] if best < len(order) else None
+
+    def terms_found(self, text: str) -> List[str]:
+        """
+        List the distinct terms found in a text, in order of first appearance.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Normalized terms
+        """
+        return list(dict.fromkeys(term for term, _ in self._matches([text])))
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """
+    Compile literal terms into a prefix-trie regular expression.
+
+    Sharing prefixes ("back", "backup") keeps the number of branches tried
+    at each position small. Greedy optional suffixes make the longest term
+    win. Spaces inside terms match any run of whitespace.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        is_end = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if is_end else group
+
+    return build(trie)
+
+
+_news_matcher: Optional[KeywordMatcher] = None
+
+
+def get_news_matcher() -> KeywordMatcher:
+    """
+    Get the matcher for the news keyword taxonomy in config.
+
+    Labels are the NEWS_CATEGORY_KEYWORDS categories plus "relevance" for
+    FANTASY_KEYWORDS and FANTASY_TERMS. Compiled once per process.
+    """
+    global _news_matcher
+    if _news_matcher is None:
+        taxonomy = dict(NEWS_CATEGORY_KEYWORDS)
+        taxonomy[RELEVANCE_LABEL] = list(FANTASY_KEYWORDS) + list(FANTASY_TERMS)
+        _news_matcher = KeywordMatcher(taxonomy)
+    return _news_matcher
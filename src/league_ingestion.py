@@ -0,0 +1,255 @@
+"""Concurrent Sleeper league roster ingestion and waiver availability."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from .config import (
+    SLEEPER_BASE_URL,
+    LEAGUE_FETCH_CONCURRENCY,
+    LEAGUE_ROSTER_TTL_SECONDS,
+    LEAGUE_ROSTER_CACHE_FILE,
+    LEAGUE_FILTER_BATCH_SIZE,
+)
+from .http_clients import get_session
+from .run_coordination import atomic_write_json, lease
+
+
+class LeagueAvailability:
+    """
+    Per-league availability bitmap over player IDs.
+
+    Row i is league_ids[i]; column j is the player at player_index[j].
+    A True bit means the player is rostered in that league.
+    """
+
+    def __init__(self, league_rosters: Dict[str, List[str]]):
+        self.league_ids = list(league_rosters)
+        self.league_index = {lid: i for i, lid in enumerate(self.league_ids)}
+
+        player_ids = sorted({pid for roster in league_rosters.values() for pid in roster})
+        self.player_index = {pid: j for j, pid in enumerate(player_ids)}
+
+        self.rostered = np.zeros((len(self.league_ids), len(player_ids)), dtype=bool)
+        for lid, roster in league_rosters.items():
+            cols = [self.player_index[pid] for pid in roster]
+            self.rostered[self.league_index[lid], cols] = True
+
+    def available_mask(self, league_id: str, player_ids: List[Optional[str]]) -> np.ndarray:
+        """
+        Check availability for many players at once.
+
+        Players with no ID, or who aren't rostered anywhere, count as available.
+
+        Args:
+            league_id: Sleeper league ID
+            player_ids: Player IDs to check (None for unknown)
+
+        Returns:
+            Boolean array, True where the player is available
+        """
+        cols = np.fromiter((self.player_index.get(pid, -1) for pid in player_ids),
+                           dtype=np.int64, count=len(player_ids))
+        known = cols >= 0
+        mask = np.ones(len(player_ids), dtype=bool)
+        row = self.league_index.get(league_id)
+        if row is not None:
+            mask[known] = ~self.rostered[row, cols[known]]
+        return mask
+
+    def is_available(self, league_id: str, player_id: Optional[str]) -> bool:
+        """
+        Check availability for a single player (for streamed items).
+
+        Args:
+            league_id: Sleeper league ID
+            player_id: Player ID (None for unknown)
+
+        Returns:
+            True if the player is available or unknown
+        """
+        row = self.league_index.get(league_id)
+        col = self.player_index.get(player_id)
+        return row is None or col is None or not self.rostered[row, col]
+
+    def available_in_any_mask(self, league_ids: Sequence[str], player_ids: List[Optional[str]]) -> np.ndarray:
+        """
+        Check availability in at least one of several leagues, for many players at once.
+
+        Players with no ID, or who aren't rostered anywhere, count as
+        available; so does everyone when one of the leagues has no roster data.
+
+        Args:
+            league_ids: Sleeper league IDs
+            player_ids: Player IDs to check (None for unknown)
+
+        Returns:
+            Boolean array, True where the player is available in any of the leagues
+        """
+        mask = np.ones(len(player_ids), dtype=bool)
+        rows = [self.league_index.get(lid) for lid in league_ids]
+        if not rows or None in rows:
+            return mask
+        cols = np.fromiter((self.player_index.get(pid, -1) for pid in player_ids),
+                           dtype=np.int64, count=len(player_ids))
+        known = cols >= 0
+        mask[known] = ~self.rostered[np.ix_(rows, cols[known])].all(axis=0)
+        return mask
+
+    def filter_available(self, news_items: List[Dict[str, Any]], *league_ids: str) -> List[Dict[str, Any]]:
+        """
+        Drop news items about players already rostered in every given league.
+
+        Args:
+            news_items: News items (only those with a player_id can be filtered)
+            league_ids: Sleeper league IDs
+
+        Returns:
+            News items about players available in any of the leagues, plus
+            items with no player ID
+        """
+        mask = self.available_in_any_mask(league_ids, [item.get("player_id") for item in news_items])
+        return [item for item, keep in zip(news_items, mask) if keep]
+
+    def iter_available(self, news_items: Iterable[Dict[str, Any]], league_ids: Sequence[str],
+                       batch_size: int = LEAGUE_FILTER_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming filter_available: check items a batch at a time, one mask per batch.
+
+        Args:
+            news_items: News items (any iterable, including generators)
+            league_ids: Sleeper league IDs
+            batch_size: Items per availability check
+
+        Yields:
+            News items about players available in any of the leagues, plus
+            items with no player ID
+        """
+        news_items = iter(news_items)
+        while True:
+            batch = list(islice(news_items, batch_size))
+            if not batch:
+                return
+            yield from self.filter_available(batch, *league_ids)
+
+
+class LeagueRosterIngestor:
+    """Fetches rosters for many leagues concurrently with ETag/TTL caching."""
+
+    def __init__(self, base_url: str = SLEEPER_BASE_URL,
+                 max_workers: int = LEAGUE_FETCH_CONCURRENCY,
+                 ttl_seconds: float = LEAGUE_ROSTER_TTL_SECONDS,
+                 cache_file: Optional[str] = LEAGUE_ROSTER_CACHE_FILE):
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.ttl_seconds = ttl_seconds
+        self.cache_file = cache_file
+        self.session = get_session("sleeper")
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._load_cache()
+
+    def _load_cache(self):
+        """Load cached rosters from disk."""
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self._cache = json.load(f)
+            except Exception as e:
+                print(f"Error loading league roster cache: {e}")
+                self._cache = {}
+
+    def _save_cache(self):
+        """Save cached rosters to disk, keeping leagues other processes cached since we loaded."""
+        if not self.cache_file:
+            return
+        try:
+            with lease("league_rosters"):
+                merged: Dict[str, Dict[str, Any]] = {}
+                if os.path.exists(self.cache_file):
+                    with open(self.cache_file, 'r', encoding='utf-8') as f:
+                        merged = json.load(f)
+                with self._lock:
+                    for league_id, entry in self._cache.items():
+                        if entry.get("fetched_at", 0) >= merged.get(league_id, {}).get("fetched_at", 0):
+                            merged[league_id] = entry
+                    self._cache = merged
+                atomic_write_json(self.cache_file, merged)
+        except Exception as e:
+            print(f"Error saving league roster cache: {e}")
+
+    def fetch_rostered_players(self, league_id: str) -> List[str]:
+        """
+        Get the IDs of every player rostered in a league.
+
+        Fresh cache entries are returned without a request; stale entries are
+        revalidated with If-None-Match so unchanged rosters cost a 304.
+
+        Args:
+            league_id: Sleeper league ID
+
+        Returns:
+            List of rostered player IDs
+        """
+        with self._lock:
+            cached = self._cache.get(league_id)
+
+        if cached and time.time() - cached["fetched_at"] < self.ttl_seconds:
+            return cached["players"]
+
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        response = self.session.get(f"{self.base_url}/league/{league_id}/rosters", headers=headers)
+        if response.status_code == 304 and cached:
+            entry = dict(cached, fetched_at=time.time())
+        else:
+            response.raise_for_status()
+            players = set()
+            for roster in response.json() or []:
+                for key in ("players", "reserve", "taxi"):
+                    players.update(roster.get(key) or [])
+            entry = {
+                "players": sorted(players),
+                "etag": response.headers.get("ETag"),
+                "fetched_at": time.time(),
+            }
+
+        with self._lock:
+            self._cache[league_id] = entry
+        return entry["players"]
+
+    def ingest(self, league_ids: Iterable[str]) -> LeagueAvailability:
+        """
+        Fetch rosters for many leagues and build the availability bitmap.
+
+        Leagues that fail to load are left out of the bitmap, so every player
+        counts as available in them.
+
+        Args:
+            league_ids: Sleeper league IDs
+
+        Returns:
+            LeagueAvailability over the leagues that loaded
+        """
+        league_ids = list(dict.fromkeys(league_ids))
+        rosters = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="league") as executor:
+            futures = {lid: executor.submit(self.fetch_rostered_players, lid) for lid in league_ids}
+            for lid, future in futures.items():
+                try:
+                    rosters[lid] = future.result()
+                except Exception as e:
+                    print(f"Error fetching rosters for league {lid}: {e}")
+
+        self._save_cache()
+        print(f"Loaded rosters for {len(rosters)}/{len(league_ids)} leagues")
+        return LeagueAvailability(rosters)
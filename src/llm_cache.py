@@ -0,0 +1,213 @@
+"""Persistent, content-addressed cache for LLM responses."""
+
+import hashlib
+import json
+import math
+import os
+import time
+from typing import List, Dict, Any, Iterable, Optional
+
+from .config import (
+    LLM_CACHE_DIR,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_BYTES,
+    LLM_ARTICLE_CACHE_DIR,
+    LLM_ARTICLE_CACHE_TTL_SECONDS,
+    LLM_ARTICLE_CACHE_MAX_BYTES,
+    RUN_TREND_CHANGE_RATIO,
+)
+from .news_item import as_dict
+from .run_coordination import atomic_write_json
+
+
+# Fields that change between runs without the news changing (fetch time,
+# scores derived from the growing trend history, the player's earlier news
+# looked up from the timeline)
+VOLATILE_FIELDS = frozenset({"timestamp", "trend_velocity", "trend_acceleration", "anomaly_score",
+                             "recent_context"})
+
+
+def hash_text(*parts: str) -> str:
+    """SHA-256 hex digest of several strings, unambiguously delimited."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _trend_bucket(count: Any) -> int:
+    """Band of a trending count; counts within RUN_TREND_CHANGE_RATIO of each other mostly share one."""
+    count = float(count or 0)
+    return int(math.log(count) / math.log1p(RUN_TREND_CHANGE_RATIO)) if count >= 1 else 0
+
+
+def _stable_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    """An item's non-volatile fields, with a trending entry's live count replaced by its band."""
+    row = {k: v for k, v in as_dict(item).items() if k not in VOLATILE_FIELDS}
+    if "trend_type" in row:
+        count = row.pop("trend_count", None)
+        bucket = f"~{_trend_bucket(count)}"
+        for field in ("headline", "summary"):
+            # The Sleeper headline and summary quote the count
+            if isinstance(row.get(field), str) and count is not None:
+                row[field] = row[field].replace(str(count), bucket)
+        row["trend_count"] = bucket
+    return row
+
+
+def normalize_items(news_items: Iterable[Dict[str, Any]]) -> str:
+    """
+    Canonical text for a set of news items.
+
+    Keys are sorted, volatile fields are dropped and the items themselves
+    are sorted, so the same news in a different order or fetched at a
+    different time normalizes to the same text. Trending counts (and the
+    headline and summary that quote them) are reduced to bands of
+    RUN_TREND_CHANGE_RATIO, so a count that ticks up between runs still
+    hits the cache while a real move doesn't.
+
+    Args:
+        news_items: News items (dicts or NewsItems)
+
+    Returns:
+        Canonical JSON text
+    """
+    rows = sorted(
+        json.dumps(_stable_fields(item), sort_keys=True, separators=(",", ":"), default=str)
+        for item in news_items
+    )
+    return "[" + ",".join(rows) + "]"
+
+
+def digest_cache_key(model: str, system_prompt: str, news_items: List[Dict[str, Any]], digest_date: str) -> str:
+    """
+    Cache key for a digest request.
+
+    Args:
+        model: Model name
+        system_prompt: Everything in the request besides the news (prompts, mode)
+        news_items: News items sent to the model
+        digest_date: Date the digest is for (YYYY-MM-DD); the digest's title
+            carries it, so the same news on another day is a different digest
+
+    Returns:
+        Hex key
+    """
+    return hash_text(model, system_prompt, digest_date, normalize_items(news_items))
+
+
+class ResponseCache:
+    """
+    One JSON file per cached response, named by its key.
+
+    Entries expire after ttl_seconds. When the directory grows past
+    max_bytes, the least recently used entries (by file mtime, refreshed on
+    every hit) are evicted first.
+    """
+
+    def __init__(self, directory: str = LLM_CACHE_DIR, ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The response, or None if missing or expired
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def put(self, key: str, response: str, **metadata: Any):
+        """
+        Store a response and evict old entries if the cache is over its size limit.
+
+        Args:
+            key: Cache key
+            response: Response text
+            metadata: Extra fields saved alongside the response (model, ...)
+        """
+        entry = dict(metadata, created_at=time.time(), response=response)
+        try:
+            atomic_write_json(self._path(key), entry)
+        except OSError as e:
+            print(f"Error saving LLM cache entry: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove expired entries, then least recently used ones until under max_bytes."""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                self._remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_cache: Optional[ResponseCache] = None
+_article_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide digest response cache."""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
+
+
+def get_article_summary_cache() -> ResponseCache:
+    """Get the process-wide cache of condensed per-article summaries."""
+    global _article_cache
+    if _article_cache is None:
+        _article_cache = ResponseCache(LLM_ARTICLE_CACHE_DIR, LLM_ARTICLE_CACHE_TTL_SECONDS,
+                                       LLM_ARTICLE_CACHE_MAX_BYTES)
+    return _article_cache
@@ -1,78 +1,468 @@
 """LLM integration for generating fantasy insights and recommendations."""
 
-import json
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import List, Dict, Any
-from openai import OpenAI
-from .config import OPENAI_API_KEY, LLM_TIMEOUT_SECONDS
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from .config import (
+    LLM_TIMEOUT_SECONDS,
+    LLM_MODEL,
+    LLM_MAP_CHUNK_SIZE,
+    LLM_MAP_CONCURRENCY,
+    LLM_MAP_RETRIES,
+    LLM_RETRY_BACKOFF_SECONDS,
+    LLM_ARTICLE_MIN_CHARS,
+    LLM_ARTICLE_INPUT_CHARS,
+)
+from .http_clients import get_openai_client, create_async_openai_client
+from .digest_formatter import render_simple_digest
+from .prompt_builder import build_news_table
+from .llm_cache import get_response_cache, get_article_summary_cache, digest_cache_key, hash_text
+from .news_item import as_dict
 
 
-def generate_digest(news_items: List[Dict[str, Any]]) -> str:
+SYSTEM_PROMPT = """You are an expert fantasy football analyst. Summarize today's NFL player news to identify potential waiver pickups and role changes.
+
+Focus on:
+1. Key injuries and their fantasy impact
+2. Role changes and depth chart movements  
+3. Performance trends and breakout candidates
+4. Specific waiver wire recommendations with reasoning
+5. Players to consider dropping
+
+Be concise but informative. Use emojis to make it engaging."""
+
+DIGEST_INSTRUCTIONS = """Please:
+1. Summarize key takeaways (Injuries, Role Changes, Emerging Players).
+2. Suggest 3–5 waiver pickups with reasoning.
+3. Mention any players to consider dropping.
+4. Output in Markdown format with clear sections.
+5. Include the date in the title (use today's date)."""
+
+MAP_SYSTEM_PROMPT = """You are an expert fantasy football analyst. Condense a batch of NFL player news into short factual notes for a colleague who will write the final digest.
+
+For each fantasy-relevant development, write one bullet naming the player, team and what changed (injury, role change, transaction, usage or performance trend). Skip items with no fantasy impact. No intro or conclusion."""
+
+ARTICLE_SYSTEM_PROMPT = """You are an expert fantasy football analyst. Condense a fantasy football article into at most 4 sentences of fantasy-relevant facts.
+
+Keep player names, teams, injuries, role and depth chart changes, transactions and usage or performance trends. Drop everything else. Plain sentences, no lists or intro."""
+
+NEWS_TABLE_INTRO = ('one per line, columns separated by "|"; key_points are the most relevant sentences '
+                    'of each item; recent lists earlier headlines about the player')
+
+
+def generate_digest(news_items: List[Dict[str, Any]], map_reduce: bool = False,
+                    use_cache: bool = True, refresh_cache: bool = False) -> str:
     """
     Generate a fantasy digest using OpenAI's API.
     
     Args:
         news_items: List of fantasy-relevant news items (already filtered to today's date)
+        map_reduce: Summarize items in concurrent chunks and merge the results
+            (see summarize_map_reduce) instead of one large request
+        use_cache: Reuse and store the digest and article summaries in the
+            LLM caches; when False the caches are neither read nor written
+        refresh_cache: Regenerate the digest and article summaries instead of
+            reusing cached ones, replacing the cached copies
         
     Returns:
         Generated digest as markdown string
     """
     try:
-        # Create a custom HTTP client to avoid proxy conflicts
-        import httpx
+        return generate_llm_digest(news_items, map_reduce=map_reduce, use_cache=use_cache,
+                                   refresh_cache=refresh_cache)
+    except Exception as e:
+        return _fallback_digest(news_items, e, map_reduce)
+
+
+def generate_llm_digest(news_items: List[Dict[str, Any]], map_reduce: bool = False,
+                        use_cache: bool = True, refresh_cache: bool = False) -> str:
+    """
+    Generate the LLM digest, raising instead of falling back on failure.
+    
+    Args:
+        news_items: List of fantasy-relevant news items (already filtered to today's date)
+        map_reduce: Use summarize_map_reduce instead of one large request
+        use_cache: Use the LLM caches (see generate_digest)
+        refresh_cache: Replace cached responses instead of reusing them
         
-        # Create a clean HTTP client without proxy settings
-        http_client = httpx.Client(timeout=LLM_TIMEOUT_SECONDS)
+    Returns:
+        Generated digest as markdown string
         
-        # Initialize OpenAI client with custom HTTP client
-        client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+    Raises:
+        Exception: Any error from the OpenAI client, or an empty response
+    """
+    cache = get_response_cache()
+    key = digest_cache_key(LLM_MODEL, _digest_prompt_signature(map_reduce), news_items,
+                           datetime.now().strftime("%Y-%m-%d"))
+    if use_cache and not refresh_cache:
+        cached = cache.get(key)
+        if cached:
+            print(f"LLM cache hit ({key[:12]}): reusing digest for {len(news_items)} unchanged items")
+            return cached
+    
+    # Long articles go in as their condensed summaries, only new ones cost a request
+    llm_items = condense_articles(news_items, use_cache=use_cache, refresh_cache=refresh_cache)
+    if map_reduce:
+        digest = asyncio.run(_run_map_reduce(llm_items))
+    else:
+        digest = request_digest(llm_items)
+    if not digest:
+        raise ValueError("LLM returned an empty digest")
+    
+    if use_cache:
+        cache.put(key, digest, model=LLM_MODEL, items=len(news_items))
+    return digest
+
+
+def generate_digest_by_deadline(news_items: List[Dict[str, Any]], deadline: float,
+                                map_reduce: bool = False, use_cache: bool = True,
+                                refresh_cache: bool = False) -> Tuple[str, Optional[Future]]:
+    """
+    Race the LLM digest against the local digest until a deadline.
+    
+    The LLM request runs in a background thread while the simple digest is
+    built in this one. At the deadline (or as soon as the LLM finishes,
+    whichever comes first) the best digest available is returned: the LLM
+    digest if it succeeded in time, otherwise the simple digest. If the
+    LLM is still running, its future is returned too so the caller can
+    upgrade the written digest when it completes.
+    
+    Args:
+        news_items: List of fantasy-relevant news items (already filtered to today's date)
+        deadline: time.monotonic() value by which a digest must be available
+        map_reduce: Use summarize_map_reduce for the LLM digest
+        use_cache: Use the LLM caches (see generate_digest)
+        refresh_cache: Replace cached responses instead of reusing them
         
-        # Prepare the news items for the LLM
-        news_json = json.dumps(news_items, indent=2)
+    Returns:
+        Tuple of (digest, future of the still-running LLM digest or None)
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-digest")
+    llm_future = executor.submit(generate_llm_digest, news_items, map_reduce, use_cache, refresh_cache)
+    executor.shutdown(wait=False)
+    
+    local_digest = generate_simple_digest(news_items)
+    
+    try:
+        digest = llm_future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        print("Deadline reached before the LLM finished, using the local digest for now")
+        return local_digest, llm_future
+    except Exception as e:
+        print(f"Error generating digest with LLM: {e}")
+        print("Using the local digest")
+        return local_digest, None
+    return digest, None
+
+
+def article_summary_key(item: Dict[str, Any]) -> str:
+    """Cache key for an article's condensed summary: model, prompt and content hash."""
+    return hash_text(LLM_MODEL, ARTICLE_SYSTEM_PROMPT, item.get("headline") or "", item.get("summary") or "")
+
+
+def condense_articles(news_items: List[Dict[str, Any]], use_cache: bool = True,
+                      refresh_cache: bool = False) -> List[Dict[str, Any]]:
+    """
+    Replace long article bodies with condensed LLM summaries, memoized by content.
+    
+    Summaries are stored against a hash of the article text, so an article
+    is only summarized the first time it is seen (or after it changes);
+    reruns reuse the stored summary. New articles are summarized
+    concurrently. An article that fails to summarize is left unchanged.
+    
+    Args:
+        news_items: News items
+        use_cache: Read and store summaries; when False every long article is
+            summarized again and nothing is stored
+        refresh_cache: Summarize every long article again and replace the
+            stored summaries
         
-        system_prompt = """You are an expert fantasy football analyst. Summarize today's NFL player news to identify potential waiver pickups and role changes.
+    Returns:
+        News items in the same order, long ones as copies with a condensed summary
+    """
+    condensed = list(news_items)
+    long_articles = [i for i, item in enumerate(news_items)
+                     if len(item.get("summary") or "") >= LLM_ARTICLE_MIN_CHARS]
+    if not long_articles:
+        return condensed
+    
+    cache = get_article_summary_cache()
+    missing = {}
+    hits = 0
+    for i in long_articles:
+        key = article_summary_key(news_items[i])
+        summary = cache.get(key) if use_cache and not refresh_cache else None
+        if summary:
+            condensed[i] = dict(as_dict(news_items[i]), summary=summary)
+            hits += 1
+        else:
+            missing[i] = key
+    
+    print(f"Article summaries: {hits} cached, {len(missing)} to summarize")
+    if missing:
+        summaries = asyncio.run(_summarize_articles([news_items[i] for i in missing]))
+        for (i, key), summary in zip(missing.items(), summaries):
+            if summary:
+                if use_cache:
+                    cache.put(key, summary, model=LLM_MODEL, url=news_items[i].get("url"))
+                condensed[i] = dict(as_dict(news_items[i]), summary=summary)
+    return condensed
 
-Focus on:
-1. Key injuries and their fantasy impact
-2. Role changes and depth chart movements  
-3. Performance trends and breakout candidates
-4. Specific waiver wire recommendations with reasoning
-5. Players to consider dropping
 
-Be concise but informative. Use emojis to make it engaging."""
+async def _summarize_articles(articles: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """Condense articles concurrently; None for any that fail."""
+    client = create_async_openai_client()
+    semaphore = asyncio.Semaphore(LLM_MAP_CONCURRENCY)
+    
+    async def summarize(index: int, article: Dict[str, Any]) -> Optional[str]:
+        label = f"Article {index + 1}/{len(articles)}"
+        try:
+            return await _complete(client, [
+                {"role": "system", "content": ARTICLE_SYSTEM_PROMPT},
+                {"role": "user", "content": f"{article.get('headline', '')}\n\n"
+                                            f"{article['summary'][:LLM_ARTICLE_INPUT_CHARS]}"},
+            ], semaphore, LLM_MAP_RETRIES, label)
+        except Exception as e:
+            print(f"  {label} failed ({e}), sending it unsummarized")
+            return None
+    
+    try:
+        return await asyncio.gather(*(summarize(i, a) for i, a in enumerate(articles)))
+    finally:
+        await client.close()
+
+
+def _digest_prompt_signature(map_reduce: bool) -> str:
+    """Everything besides the news that determines the digest, for the cache key."""
+    parts = [SYSTEM_PROMPT, DIGEST_INSTRUCTIONS, NEWS_TABLE_INTRO]
+    if map_reduce:
+        parts += ["map-reduce", MAP_SYSTEM_PROMPT]
+    return "\n".join(parts)
+
+
+def _fallback_digest(news_items: List[Dict[str, Any]], error: Exception, map_reduce: bool) -> str:
+    """Choose what to write when the LLM request fails."""
+    print(f"Error generating digest with LLM: {error}")
+    if map_reduce:
+        # Chunk failures were already retried; only the reduce step gets here
+        print("Falling back to simple digest...")
+        return generate_simple_digest(news_items)
+    # If it's a quota error, fall back to simple digest
+    if "quota" in str(error).lower() or "429" in str(error):
+        print("OpenAI quota exceeded. Falling back to simple digest...")
+        return generate_simple_digest(news_items)
+    # If it's a timeout error, fall back to simple digest
+    elif "timeout" in str(error).lower() or "timed out" in str(error).lower():
+        print(f"LLM request timed out after {LLM_TIMEOUT_SECONDS} seconds. Falling back to simple digest...")
+        return generate_simple_digest(news_items)
+    return f"# Error Generating Digest\n\nThere was an error generating the digest: {error}"
+
+
+def _digest_messages(news_items: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Build the chat messages for a single-request digest."""
+    # Pack the most relevant items into a compact table under the token budget
+    news_table, stats = build_news_table(news_items)
+    print(f"Prompt: {stats['items_included']}/{len(news_items)} items, "
+          f"{stats['prompt_tokens']} tokens ({stats['tokens_saved']} saved vs. raw JSON)")
+    
+    user_prompt = f"""Here are today's news items, most relevant first ({NEWS_TABLE_INTRO}):
+
+{news_table}
+
+{DIGEST_INSTRUCTIONS}"""
+    
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def request_digest(news_items: List[Dict[str, Any]]) -> str:
+    """
+    Generate the digest with a single chat completion.
+    
+    Args:
+        news_items: List of fantasy-relevant news items
         
-        user_prompt = f"""Here are today's news items (JSON):
+    Returns:
+        Generated digest as markdown string
+        
+    Raises:
+        Exception: Any error from the OpenAI client
+    """
+    # Shared OpenAI client backed by a pooled, keep-alive httpx client
+    client = get_openai_client()
+    
+    response = client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=_digest_messages(news_items),
+    )
+    
+    return response.choices[0].message.content
 
-{news_json}
 
-Please:
-1. Summarize key takeaways (Injuries, Role Changes, Emerging Players).
-2. Suggest 3–5 waiver pickups with reasoning.
-3. Mention any players to consider dropping.
-4. Output in Markdown format with clear sections.
-5. Include the date in the title (use today's date)."""
+def stream_digest(news_items: List[Dict[str, Any]], use_cache: bool = True,
+                  refresh_cache: bool = False) -> Iterator[str]:
+    """
+    Generate the digest as a stream of text pieces as the model produces them.
+    
+    A cached digest is yielded whole. A completed stream is cached; an
+    interrupted one is not.
+    
+    Args:
+        news_items: List of fantasy-relevant news items (already filtered to today's date)
+        use_cache: Use the LLM caches (see generate_digest)
+        refresh_cache: Replace cached responses instead of reusing them
         
-        response = client.chat.completions.create(
-            model="gpt-5-nano",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-        )
+    Yields:
+        Digest text pieces, in order
         
-        return response.choices[0].message.content
+    Raises:
+        Exception: Any error from the OpenAI client, including mid-stream
+    """
+    cache = get_response_cache()
+    key = digest_cache_key(LLM_MODEL, _digest_prompt_signature(False), news_items,
+                           datetime.now().strftime("%Y-%m-%d"))
+    if use_cache and not refresh_cache:
+        cached = cache.get(key)
+        if cached:
+            print(f"LLM cache hit ({key[:12]}): reusing digest for {len(news_items)} unchanged items")
+            yield cached
+            return
+    
+    client = get_openai_client()
+    response = client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=_digest_messages(condense_articles(news_items, use_cache=use_cache, refresh_cache=refresh_cache)),
+        stream=True,
+    )
+    
+    parts = []
+    for chunk in response:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            yield delta
+    
+    digest = "".join(parts)
+    if digest and use_cache:
+        cache.put(key, digest, model=LLM_MODEL, items=len(news_items))
+
+
+async def _run_map_reduce(news_items: List[Dict[str, Any]]) -> str:
+    """Run summarize_map_reduce with a client bound to the current event loop."""
+    client = create_async_openai_client()
+    try:
+        return await summarize_map_reduce(news_items, client)
+    finally:
+        await client.close()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed request is worth retrying: a timeout, a connection error, 429 or 5xx."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # openai.APIConnectionError and its APITimeoutError subclass carry no status
+    return any(cls.__name__ == "APIConnectionError" for cls in type(error).__mro__)
+
+
+async def _complete(client, messages: List[Dict[str, str]], semaphore: asyncio.Semaphore,
+                    retries: int, label: str) -> str:
+    """
+    Run one chat completion with a timeout, retrying with exponential backoff.
+    
+    Only transient failures (see _is_transient) are retried; anything
+    else, such as a 400 or 401, is raised at once. The semaphore is held
+    only while a request is in flight, not while backing off.
+    """
+    delay = LLM_RETRY_BACKOFF_SECONDS
+    for attempt in range(retries + 1):
+        try:
+            async with semaphore:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(model=LLM_MODEL, messages=messages),
+                    timeout=LLM_TIMEOUT_SECONDS,
+                )
+            return response.choices[0].message.content
+        except Exception as e:
+            if attempt == retries or not _is_transient(e):
+                raise
+            reason = f"timed out after {LLM_TIMEOUT_SECONDS} seconds" if isinstance(e, asyncio.TimeoutError) else e
+            print(f"  {label} failed ({reason}), retrying in {delay}s...")
+            await asyncio.sleep(delay)
+            delay *= 2
+
+
+async def summarize_map_reduce(news_items: List[Dict[str, Any]], client,
+                               chunk_size: int = LLM_MAP_CHUNK_SIZE,
+                               concurrency: int = LLM_MAP_CONCURRENCY,
+                               retries: int = LLM_MAP_RETRIES) -> str:
+    """
+    Map chunks of items to condensed notes concurrently, then reduce them to a digest.
+    
+    Each chunk is condensed by its own request (at most `concurrency` in
+    flight), then one reduce request turns the notes into the digest. A
+    chunk that keeps failing is passed to the reduce step as its raw item
+    table, so one slow or failed request no longer costs the whole digest.
+    With a single chunk the digest is generated directly in one request.
+    
+    Args:
+        news_items: List of fantasy-relevant news items
+        client: AsyncOpenAI client (or anything with the same chat.completions.create)
+        chunk_size: Items per map request
+        concurrency: Maximum requests in flight
+        retries: Extra attempts per request
         
-    except Exception as e:
-        print(f"Error generating digest with LLM: {e}")
-        # If it's a quota error, fall back to simple digest
-        if "quota" in str(e).lower() or "429" in str(e):
-            print("OpenAI quota exceeded. Falling back to simple digest...")
-            return generate_simple_digest(news_items)
-        # If it's a timeout error, fall back to simple digest
-        elif "timeout" in str(e).lower() or "timed out" in str(e).lower():
-            print(f"LLM request timed out after {LLM_TIMEOUT_SECONDS} seconds. Falling back to simple digest...")
-            return generate_simple_digest(news_items)
-        return f"# Error Generating Digest\n\nThere was an error generating the digest: {e}"
+    Returns:
+        Generated digest as markdown string
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    chunks = [news_items[i:i + chunk_size] for i in range(0, len(news_items), chunk_size)] or [[]]
+    tables = [build_news_table(chunk)[0] for chunk in chunks]
+    
+    if len(chunks) == 1:
+        return await _complete(client, [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"Here are today's news items ({NEWS_TABLE_INTRO}):\n\n{tables[0]}\n\n{DIGEST_INSTRUCTIONS}"},
+        ], semaphore, retries, "Digest request")
+    
+    async def map_chunk(index: int, table: str) -> Optional[str]:
+        label = f"Chunk {index + 1}/{len(chunks)}"
+        try:
+            return await _complete(client, [
+                {"role": "system", "content": MAP_SYSTEM_PROMPT},
+                {"role": "user", "content": f"News items ({NEWS_TABLE_INTRO}):\n\n{table}"},
+            ], semaphore, retries, label)
+        except Exception as e:
+            print(f"  {label} failed ({e}), passing its items through unsummarized")
+            return None
+    
+    print(f"  Summarizing {len(news_items)} items in {len(chunks)} chunks ({concurrency} at a time)...")
+    notes = await asyncio.gather(*(map_chunk(i, table) for i, table in enumerate(tables)))
+    
+    blocks = []
+    for i, (note, table) in enumerate(zip(notes, tables)):
+        if note is None:
+            blocks.append(f"## Batch {i + 1} (raw items: {NEWS_TABLE_INTRO})\n{table}")
+        else:
+            blocks.append(f"## Batch {i + 1}\n{note}")
+    
+    notes_text = "\n\n".join(blocks)
+    user_prompt = f"""Here are condensed notes on today's news, one section per batch of items:
+
+{notes_text}
+
+{DIGEST_INSTRUCTIONS}"""
+    
+    return await _complete(client, [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ], semaphore, retries, "Reduce request")
 
 
 def generate_simple_digest(news_items: List[Dict[str, Any]]) -> str:
@@ -85,51 +475,4 @@ def generate_simple_digest(news_items: List[Dict[str, Any]]) -> str:
     Returns:
         Simple digest as markdown string
     """
-    date_str = datetime.now().strftime("%B %d, %Y")
-    
-    digest = f"# NFL Daily Fantasy Digest — {date_str}\n\n"
-    
-    if not news_items:
-        digest += "No fantasy-relevant news found today.\n"
-        return digest
-    
-    # Group by source and trend type
-    sleeper_adds = [item for item in news_items if item.get("source") == "sleeper" and item.get("trend_type") == "add"]
-    sleeper_drops = [item for item in news_items if item.get("source") == "sleeper" and item.get("trend_type") == "drop"]
-    other_sleeper = [item for item in news_items if item.get("source") == "sleeper" and "trend_type" not in item]
-    fantasypros_items = [item for item in news_items if item.get("source") == "fantasypros_scraped"]
-    
-    if sleeper_adds:
-        digest += "## Trending Up (Sleeper)\n\n"
-        for item in sleeper_adds:
-            trend_count = item.get("trend_count", 0)
-            digest += f"- **{item.get('player_name', 'Unknown')}** ({item.get('team', 'Unknown')}) - {trend_count} adds in 24h\n"
-        digest += "\n"
-    
-    if sleeper_drops:
-        digest += "## Trending Down (Sleeper)\n\n"
-        for item in sleeper_drops:
-            trend_count = item.get("trend_count", 0)
-            digest += f"- **{item.get('player_name', 'Unknown')}** ({item.get('team', 'Unknown')}) - {trend_count} drops in 24h\n"
-        digest += "\n"
-    
-    if other_sleeper:
-        digest += "## Other Sleeper News\n\n"
-        for item in other_sleeper:
-            digest += f"- **{item.get('player_name', 'Unknown')}** ({item.get('team', 'Unknown')}) - {item.get('headline', 'No headline')}\n"
-        digest += "\n"
-    
-    if fantasypros_items:
-        digest += "## FantasyPros News\n\n"
-        for item in fantasypros_items:
-            # Show processed summary if available, otherwise headline
-            content = item.get('summary', item.get('headline', 'No headline'))
-            # Truncate very long summaries
-            if len(content) > 200:
-                content = content[:200] + "..."
-            digest += f"- **{item.get('player_name', 'Unknown')}** ({item.get('team', 'Unknown')}) - {content}\n"
-        digest += "\n"
-    
-    digest += "*(Data aggregated from Sleeper + FantasyPros)*\n"
-    
-    return digest
+    return "".join(render_simple_digest(news_items))
@@ -1,15 +1,39 @@
 """News filtering functions for fantasy relevance."""
 
-from typing import List, Dict, Any
-from .config import FANTASY_KEYWORDS
+from typing import List, Dict, Any, Optional
+from .config import NEWS_CATEGORY_KEYWORDS
+from .keyword_matcher import get_news_matcher
 
 
-def is_fantasy_relevant(news_item: Dict[str, Any]) -> bool:
+def keyword_hits(news_item: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """
+    Scan a news item's headline and summary once for every keyword label.
+    
+    The result can be passed to both is_fantasy_relevant and
+    categorize_item, so a pipeline stage that needs both reads the text once.
+    Scanning stops at the first hit for the highest-priority category, which
+    settles both answers.
+    
+    Args:
+        news_item: News item
+        
+    Returns:
+        Hits per label (see KeywordMatcher.scan), or None for Sleeper
+        trending items, which are classified without their text
+    """
+    if news_item.get("source") == "sleeper" and "trend_type" in news_item:
+        return None
+    return get_news_matcher().scan(news_item.get('headline', ''), news_item.get('summary', ''),
+                                   stop_at=next(iter(NEWS_CATEGORY_KEYWORDS)))
+
+
+def is_fantasy_relevant(news_item: Dict[str, Any], hits: Optional[Dict[str, int]] = None) -> bool:
     """
     Check if a news item is relevant for fantasy football.
     
     Args:
         news_item: Dictionary containing news item data
+        hits: The item's keyword_hits, if already computed
         
     Returns:
         True if the news item is fantasy relevant
@@ -35,26 +59,10 @@ def is_fantasy_relevant(news_item: Dict[str, Any]) -> bool:
     ]):
         return True
     
-    # Combine headline and summary for keyword checking
-    text_to_check = f"{news_item.get('headline', '')} {news_item.get('summary', '')}".lower()
-    
-    # Check if any fantasy keywords are present
-    for keyword in FANTASY_KEYWORDS:
-        if keyword.lower() in text_to_check:
-            return True
-    
-    # Check for general fantasy football terms
-    fantasy_terms = [
-        "fantasy football", "fantasy", "waiver wire", "start/sit", 
-        "sleepers", "busts", "rankings", "projections", "advice",
-        "analysis", "pickup", "drop", "trade", "dynasty", "redraft"
-    ]
-    
-    for term in fantasy_terms:
-        if term in text_to_check:
-            return True
-    
-    return False
+    # Any fantasy keyword or term in the headline or summary
+    if hits is not None:
+        return bool(hits)
+    return get_news_matcher().matches_any(news_item.get('headline', ''), news_item.get('summary', ''))
 
 
 def filter_relevant_news(news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -97,41 +105,36 @@ def categorize_news(news_items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str
         "other": []
     }
     
-    injury_keywords = ["injured", "injury", "out", "questionable", "doubtful", "probable", 
-                      "hamstring", "knee", "ankle", "concussion", "shoulder", "back",
-                      "limited", "full", "practice", "rehab", "recovery"]
-    
-    role_keywords = ["promoted", "demoted", "starter", "backup", "depth chart", "depth",
-                    "snap count", "snaps", "targets", "carries", "touches"]
-    
-    transaction_keywords = ["signed", "released", "traded", "waived", "claimed",
-                           "contract", "extension", "restructure"]
-    
-    performance_keywords = ["breakout", "breakout game", "career high", "season high",
-                           "struggling", "struggles", "slumping", "slump",
-                           "hot", "cold", "streak", "trending"]
-    
     for item in news_items:
-        # Handle Sleeper trending data
-        if item.get("source") == "sleeper" and "trend_type" in item:
-            if item["trend_type"] == "add":
-                categories["trending_up"].append(item)
-            elif item["trend_type"] == "drop":
-                categories["trending_down"].append(item)
-            continue
-        
-        # Handle other news sources
-        text = f"{item.get('headline', '')} {item.get('summary', '')}".lower()
-        
-        if any(keyword in text for keyword in injury_keywords):
-            categories["injuries"].append(item)
-        elif any(keyword in text for keyword in role_keywords):
-            categories["role_changes"].append(item)
-        elif any(keyword in text for keyword in transaction_keywords):
-            categories["transactions"].append(item)
-        elif any(keyword in text for keyword in performance_keywords):
-            categories["performance"].append(item)
-        else:
-            categories["other"].append(item)
+        category = categorize_item(item)
+        if category:
+            categories[category].append(item)
     
     return categories
+
+
+def categorize_item(news_item: Dict[str, Any], hits: Optional[Dict[str, int]] = None) -> Optional[str]:
+    """
+    Get the category of a single news item.
+    
+    Args:
+        news_item: Fantasy-relevant news item
+        hits: The item's keyword_hits, if already computed
+        
+    Returns:
+        Category name as used by categorize_news, or None for Sleeper
+        trending items with an unknown trend type
+    """
+    # Handle Sleeper trending data
+    if news_item.get("source") == "sleeper" and "trend_type" in news_item:
+        return {"add": "trending_up", "drop": "trending_down"}.get(news_item["trend_type"])
+    
+    # Handle other news sources: the first category in taxonomy order
+    # that has a hit
+    if hits is not None:
+        return next((category for category in NEWS_CATEGORY_KEYWORDS if hits.get(category)), "other")
+    category = get_news_matcher().first_label(
+        news_item.get('headline', ''), news_item.get('summary', ''),
+        order=list(NEWS_CATEGORY_KEYWORDS),
+    )
+    return category or "other"
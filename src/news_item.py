@@ -0,0 +1,173 @@
+"""Compact news item record shared by every pipeline stage."""
+
+import sys
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# Low-cardinality string fields that are interned so every item shares one copy
+INTERNED_FIELDS = frozenset({"team", "position", "source", "author", "trend_type", "section", "category"})
+
+FIELDS = (
+    "player_name", "team", "position", "headline", "summary", "source",
+    "timestamp", "url", "author", "section", "content_length",
+    "trend_type", "trend_count", "player_id", "trend_velocity",
+    "trend_acceleration", "anomaly_score", "category",
+    "cluster_size", "cluster_sources", "related_headlines", "recent_context",
+)
+
+_MISSING = object()
+
+# One shared int per UTC offset (in minutes), like the interned strings
+_OFFSETS: Dict[int, int] = {}
+
+
+def _parse_timestamp(value: Any) -> Tuple[Optional[float], Optional[int]]:
+    """
+    Convert an ISO timestamp (or epoch number) to epoch seconds and its UTC offset.
+
+    Returns:
+        (epoch seconds or None if unparseable, UTC offset in minutes or
+        None for local times)
+    """
+    if isinstance(value, (int, float)):
+        return float(value), None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None, None
+    offset = parsed.utcoffset()
+    if offset is None:
+        return parsed.timestamp(), None
+    minutes = int(offset.total_seconds() // 60)
+    return parsed.timestamp(), _OFFSETS.setdefault(minutes, minutes)
+
+
+def _format_timestamp(epoch: float, offset: Optional[int]) -> str:
+    """ISO timestamp for epoch seconds, in the given UTC offset (minutes) or local time."""
+    if offset is None:
+        return datetime.fromtimestamp(epoch).isoformat()
+    return datetime.fromtimestamp(epoch, timezone(timedelta(minutes=offset))).isoformat()
+
+
+class NewsItem(MutableMapping):
+    """
+    A news item with fixed slots instead of a per-item dict.
+
+    Behaves like the dicts the pipeline used before (item["headline"],
+    item.get("team", "Unknown"), "trend_type" in item, setdefault, ...),
+    so existing call sites keep working. Fields that were never set are
+    absent, exactly like a missing dict key. Categorical strings are
+    interned. The timestamp is stored as epoch seconds (item.epoch) plus
+    its UTC offset in minutes, and item["timestamp"] rebuilds the ISO
+    string from them, offset included (a "Z" reads back as "+00:00"; an
+    epoch number or a timestamp without an offset reads back as a local
+    ISO string). Unparseable timestamps are kept as given. Keys outside
+    FIELDS go to a lazily created overflow dict.
+    """
+
+    __slots__ = tuple(f"_{name}" for name in FIELDS) + ("_utc_offset", "_extra")
+
+    def __init__(self, **fields: Any):
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NewsItem":
+        """Build a NewsItem from a plain news item dict."""
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict (JSON-serializable)."""
+        return dict(self.items())
+
+    @property
+    def epoch(self) -> Optional[float]:
+        """Timestamp as epoch seconds, or None if missing or unparseable."""
+        value = getattr(self, "_timestamp", None)
+        return value if isinstance(value, float) else None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _SLOT_NAMES:
+            value = getattr(self, _SLOT_NAMES[key], _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            if key == "timestamp" and isinstance(value, float):
+                return _format_timestamp(value, self._utc_offset)
+            return value
+        extra = getattr(self, "_extra", None)
+        if extra is None:
+            raise KeyError(key)
+        return extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _SLOT_NAMES:
+            if key == "timestamp":
+                epoch, self._utc_offset = _parse_timestamp(value)
+                if epoch is not None:
+                    value = epoch
+            elif key in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, _SLOT_NAMES[key], value)
+            return
+        extra = getattr(self, "_extra", None)
+        if extra is None:
+            extra = self._extra = {}
+        extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _SLOT_NAMES:
+            try:
+                delattr(self, _SLOT_NAMES[key])
+            except AttributeError:
+                raise KeyError(key) from None
+            if key == "timestamp":
+                del self._utc_offset
+            return
+        extra = getattr(self, "_extra", None)
+        if extra is None:
+            raise KeyError(key)
+        del extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        slot = _SLOT_NAMES.get(key)
+        if slot is not None:
+            return hasattr(self, slot)
+        extra = getattr(self, "_extra", None)
+        return extra is not None and key in extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self) -> Iterator[str]:
+        for name in FIELDS:
+            if hasattr(self, _SLOT_NAMES[name]):
+                yield name
+        extra = getattr(self, "_extra", None)
+        if extra:
+            yield from extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"NewsItem({self.to_dict()!r})"
+
+
+_SLOT_NAMES = {name: f"_{name}" for name in FIELDS}
+
+
+def as_dict(item: Any) -> Dict[str, Any]:
+    """Get a plain dict for a NewsItem or dict (for JSON serialization)."""
+    return item.to_dict() if isinstance(item, NewsItem) else item
+
+
+def json_default(obj: Any) -> Any:
+    """json.dumps default hook that serializes NewsItems as dicts."""
+    if isinstance(obj, NewsItem):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,166 @@
+"""Lazy, bounded-memory news pipeline: fetch -> normalize -> filter -> categorize -> render."""
+
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from .config import PIPELINE_BUFFER_SIZE, SOURCE_TIMEOUT_SECONDS
+from .data_fetchers import fetch_sleeper_news, iter_fantasypros_news, is_from_date
+from .news_filter import keyword_hits, is_fantasy_relevant, categorize_item
+
+
+NewsSource = Callable[[], Iterable[Dict[str, Any]]]
+
+DEFAULT_SOURCES: Dict[str, NewsSource] = {
+    "sleeper": fetch_sleeper_news,
+    "fantasypros": iter_fantasypros_news,
+}
+
+_SOURCE_DONE = object()
+
+
+def iter_sources(sources: Optional[Dict[str, NewsSource]] = None,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 buffer_size: int = PIPELINE_BUFFER_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch every source concurrently and yield items as soon as they arrive.
+
+    Each source runs in its own thread and feeds a bounded queue, so a fast
+    producer blocks instead of piling items up in memory. A source that
+    misses its timeout is abandoned and the pipeline continues with the
+    items the other sources produce.
+
+    Args:
+        sources: Mapping of source name to a callable returning an iterable of items
+        timeouts: Mapping of source name to timeout in seconds
+        buffer_size: Maximum items held between the fetch threads and the consumer
+
+    Yields:
+        News items in arrival order
+    """
+    sources = sources if sources is not None else DEFAULT_SOURCES
+    timeouts = timeouts if timeouts is not None else SOURCE_TIMEOUT_SECONDS
+    buffer: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=buffer_size)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(name: str, source: NewsSource):
+        try:
+            for item in source():
+                if not put((name, item)):
+                    return
+        except Exception as e:
+            print(f"Error fetching {name}: {e}")
+        finally:
+            put((name, _SOURCE_DONE))
+
+    start = time.monotonic()
+    deadlines = {name: start + timeouts[name] for name in sources if name in timeouts}
+    pending = set(sources)
+    for name, source in sources.items():
+        threading.Thread(target=produce, args=(name, source), name=f"source-{name}", daemon=True).start()
+
+    try:
+        while pending:
+            waits = [deadlines[name] - time.monotonic() for name in pending if name in deadlines]
+            wait = max(0.0, min(waits)) if waits else None
+            try:
+                name, item = buffer.get(timeout=wait)
+            except queue.Empty:
+                now = time.monotonic()
+                for name in [n for n in pending if deadlines.get(n, float("inf")) <= now]:
+                    print(f"Timed out waiting for {name} after {timeouts[name]} seconds, continuing without it")
+                    pending.discard(name)
+                continue
+
+            if name not in pending:
+                continue  # Late item from a source that already timed out
+            if item is _SOURCE_DONE:
+                pending.discard(name)
+                continue
+            yield item
+    finally:
+        stop.set()
+
+
+def normalize(news_items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Fill in the fields every later stage expects.
+
+    Args:
+        news_items: Raw news items
+
+    Yields:
+        News items with player_name, team, position, headline, summary,
+        source and timestamp present
+    """
+    for item in news_items:
+        item.setdefault("player_name", "Unknown")
+        item.setdefault("team", "Unknown")
+        item.setdefault("position", "Unknown")
+        item.setdefault("headline", "")
+        item.setdefault("summary", "")
+        item.setdefault("source", "unknown")
+        item.setdefault("timestamp", datetime.now().isoformat())
+        yield item
+
+
+def only_date(news_items: Iterable[Dict[str, Any]], target_date: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Keep only items from one date (today by default).
+
+    Args:
+        news_items: News items
+        target_date: Date in YYYY-MM-DD format
+
+    Yields:
+        News items from the target date (or undated)
+    """
+    target_date = target_date or datetime.now().strftime("%Y-%m-%d")
+    for item in news_items:
+        if is_from_date(item, target_date):
+            yield item
+
+
+def classify(news_items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Keep only fantasy-relevant items and tag each with its news category.
+
+    Each item's text is scanned once (see keyword_hits); relevance and
+    category are both read from that scan.
+
+    Args:
+        news_items: News items
+
+    Yields:
+        Fantasy-relevant news items with a "category" field (see categorize_news)
+    """
+    for item in news_items:
+        hits = keyword_hits(item)
+        if is_fantasy_relevant(item, hits):
+            item["category"] = categorize_item(item, hits)
+            yield item
+
+
+def build_pipeline(sources: Optional[Dict[str, NewsSource]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Chain the lazy stages from fetching up to (but not including) rendering.
+
+    Args:
+        sources: Optional mapping of source name to item source
+
+    Returns:
+        Iterator of today's fantasy-relevant, categorized news items
+    """
+    return classify(only_date(normalize(iter_sources(sources))))
+
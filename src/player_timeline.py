@@ -0,0 +1,274 @@
+"""Persistent per-player timeline of news, trend observations and digest mentions (SQLite)."""
+
+import sqlite3
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence
+
+from .config import PLAYER_TIMELINE_DB, PLAYER_CONTEXT_DAYS, PLAYER_CONTEXT_MAX_EVENTS, RUN_LOCK_WAIT_SECONDS
+from .relevance_scoring import item_epoch
+from .run_state import story_key
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_key TEXT PRIMARY KEY,
+    player_id TEXT,
+    name TEXT,
+    team TEXT,
+    last_seen REAL
+);
+CREATE INDEX IF NOT EXISTS players_by_name ON players (name);
+CREATE TABLE IF NOT EXISTS events (
+    player_key TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    source TEXT,
+    headline TEXT,
+    detail TEXT,
+    recorded_at REAL,
+    PRIMARY KEY (player_key, kind, ref)
+);
+CREATE INDEX IF NOT EXISTS events_by_player_time ON events (player_key, ts);
+"""
+
+EVENT_KINDS = ("news", "trend", "digest")
+
+
+def _full_name(item: Dict[str, Any]) -> Optional[str]:
+    """The item's player as a lowercase full name; surname-only guesses are not used."""
+    name = " ".join((item.get("player_name") or "").lower().split())
+    return name if " " in name else None
+
+
+class PlayerTimeline:
+    """
+    Everything that happened to each player, in one indexed table.
+
+    Events are keyed by player: "id:<Sleeper player ID>" when the player's
+    ID is known (directly, or because a trending entry linked the name to
+    it), otherwise "name:<full name>". The (player, time) index makes range
+    queries a single index scan however long the history grows. Each run
+    adds its events in one transaction; re-recording an event (same
+    player, kind and reference) replaces it instead of duplicating it.
+    """
+
+    def __init__(self, path: str = PLAYER_TIMELINE_DB):
+        """
+        Open (and create if needed) the timeline database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        # Concurrent runs queue for the write lock rather than failing at once
+        self.connection = sqlite3.connect(path, timeout=RUN_LOCK_WAIT_SECONDS)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(_SCHEMA)
+        columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(events)")}
+        if "recorded_at" not in columns:
+            # Timelines created before events recorded when they were written
+            self.connection.execute("ALTER TABLE events ADD COLUMN recorded_at REAL")
+        self._ids_by_name: Dict[str, str] = {}
+
+    def player_key(self, item: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the timeline key of an item's player.
+
+        Args:
+            item: News item
+
+        Returns:
+            Player key, or None if the item isn't about an identifiable player
+        """
+        if item.get("player_id"):
+            return f"id:{item['player_id']}"
+        name = _full_name(item)
+        if name is None:
+            return None
+        if name not in self._ids_by_name:
+            row = self.connection.execute(
+                "SELECT player_key FROM players WHERE name = ? AND player_id IS NOT NULL "
+                "ORDER BY last_seen DESC LIMIT 1", (name,)).fetchone()
+            self._ids_by_name[name] = row["player_key"] if row else f"name:{name}"
+        return self._ids_by_name[name]
+
+    def record(self, item: Dict[str, Any], digest_ref: Optional[str] = None,
+               observed_at: Optional[float] = None):
+        """
+        Add an item's events: the news itself or a trend observation, plus a digest mention.
+
+        Trend observations are kept one per player, direction and hour.
+        Changes are committed by commit() (or at the end of track()).
+
+        Args:
+            item: News item
+            digest_ref: Digest the item appears in (e.g. its date), if any
+            observed_at: Time for items without a timestamp (defaults to now)
+        """
+        key = self.player_key(item)
+        if key is None:
+            return
+        observed_at = observed_at if observed_at is not None else time.time()
+        ts = item_epoch(item)
+        ts = observed_at if ts != ts else ts  # NaN: unknown time
+
+        name = _full_name(item)
+        if name and item.get("player_id") and self._ids_by_name.get(name) != key:
+            self._link_name(name, key)
+        self.connection.execute(
+            "INSERT INTO players (player_key, player_id, name, team, last_seen) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (player_key) DO UPDATE SET name = COALESCE(excluded.name, name), "
+            "team = COALESCE(excluded.team, team), last_seen = MAX(excluded.last_seen, last_seen)",
+            (key, item.get("player_id"), name, _known(item.get("team")), ts))
+
+        if item.get("trend_type"):
+            event = ("trend", f"{item['trend_type']}:{int(ts // 3600)}", str(item.get("trend_count", "")))
+        else:
+            event = ("news", story_key(item), item.get("url") or "")
+        rows = [(key, ts, event[0], event[1], item.get("source"), item.get("headline"), event[2], observed_at)]
+        if digest_ref:
+            rows.append((key, observed_at, "digest", f"{digest_ref}:{story_key(item)}",
+                         item.get("source"), item.get("headline"), digest_ref, observed_at))
+        # A re-recorded event keeps the time it was first written, so it
+        # still counts as earlier news for the rest of this run
+        self.connection.executemany(
+            "INSERT INTO events (player_key, ts, kind, ref, source, headline, detail, recorded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (player_key, kind, ref) DO UPDATE SET "
+            "ts = excluded.ts, source = excluded.source, headline = excluded.headline, detail = excluded.detail, "
+            "recorded_at = COALESCE(recorded_at, excluded.recorded_at)", rows)
+
+    def _link_name(self, name: str, key: str):
+        """Move events recorded under a player's name to their ID key, now that it is known."""
+        old = f"name:{name}"
+        self.connection.execute("UPDATE OR IGNORE events SET player_key = ? WHERE player_key = ?", (key, old))
+        self.connection.execute("DELETE FROM events WHERE player_key = ?", (old,))
+        self.connection.execute("DELETE FROM players WHERE player_key = ?", (old,))
+        self._ids_by_name[name] = key
+
+    def commit(self):
+        """Commit recorded events."""
+        self.connection.commit()
+
+    def events(self, player_key: str, start: Optional[float] = None, end: Optional[float] = None,
+               kinds: Sequence[str] = EVENT_KINDS, limit: Optional[int] = None,
+               recorded_before: Optional[float] = None,
+               outside_digest: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get a player's events in a time range, newest first.
+
+        Args:
+            player_key: Key from player_key()
+            start: Earliest time (epoch seconds, inclusive)
+            end: Latest time (epoch seconds, exclusive)
+            kinds: Event kinds to include
+            limit: Maximum events
+            recorded_before: Only events written to the timeline before this time
+            outside_digest: Leave out news already mentioned in this digest
+                (a digest_ref given to record())
+
+        Returns:
+            Events with player_key, ts, kind, ref, source, headline, detail and recorded_at
+        """
+        query = (f"SELECT * FROM events e WHERE player_key = ? AND ts >= ? AND ts < ? "
+                 f"AND COALESCE(recorded_at, ts) < ? "
+                 f"AND kind IN ({', '.join('?' * len(kinds))}) ")
+        params: List[Any] = [player_key, start if start is not None else float("-inf"),
+                             end if end is not None else float("inf"),
+                             recorded_before if recorded_before is not None else float("inf"), *kinds]
+        if outside_digest is not None:
+            query += ("AND NOT EXISTS (SELECT 1 FROM events d WHERE d.player_key = e.player_key "
+                      "AND d.kind = 'digest' AND d.ref = ? || ':' || e.ref) ")
+            params.append(outside_digest)
+        query += "ORDER BY ts DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def recent_context(self, item: Dict[str, Any], before: Optional[float] = None,
+                       days: float = PLAYER_CONTEXT_DAYS,
+                       limit: int = PLAYER_CONTEXT_MAX_EVENTS,
+                       recorded_before: Optional[float] = None,
+                       outside_digest: Optional[str] = None) -> List[str]:
+        """
+        Summarize what earlier news said about an item's player.
+
+        Args:
+            item: News item
+            before: Only events before this time (defaults to now)
+            days: How far back to look
+            limit: Maximum lines
+            recorded_before: Only events written to the timeline before this time
+            outside_digest: Leave out news already mentioned in this digest
+
+        Returns:
+            Lines like "Oct 06: Bowers limited in practice", newest first
+        """
+        key = self.player_key(item)
+        if key is None:
+            return []
+        before = before if before is not None else time.time()
+        own_ref = story_key(item)
+        lines, seen = [], set()
+        for event in self.events(key, before - days * 86400, before, kinds=("news",), limit=limit * 3,
+                                 recorded_before=recorded_before, outside_digest=outside_digest):
+            headline = " ".join((event["headline"] or "").split())
+            if event["ref"] == own_ref or not headline or headline in seen:
+                continue
+            seen.add(headline)
+            lines.append(f"{datetime.fromtimestamp(event['ts']).strftime('%b %d')}: {headline}")
+            if len(lines) >= limit:
+                break
+        return lines
+
+    def track(self, news_items: Iterable[Dict[str, Any]], digest_ref: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Pipeline stage: add each item's recent context, then record it.
+
+        Context is looked up before the item is recorded and only covers
+        events recorded before this run started that aren't already in the
+        same digest, so an item never cites itself, another item of the
+        same run, or news an earlier run put in today's digest (a rerun on
+        the same news builds the same items).
+
+        Args:
+            news_items: News items (any iterable, including generators)
+            digest_ref: Digest the items are going into
+
+        Yields:
+            The items, with "recent_context" set when the player has history
+        """
+        run_start = time.time()
+        try:
+            for item in news_items:
+                context = self.recent_context(item, before=run_start, recorded_before=run_start,
+                                              outside_digest=digest_ref)
+                if context:
+                    item["recent_context"] = context
+                self.record(item, digest_ref, observed_at=run_start)
+                yield item
+        finally:
+            self.commit()
+
+    def close(self):
+        """Commit and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+
+def _known(value: Any) -> Optional[str]:
+    return value if value and value != "Unknown" else None
+
+
+_timeline: Optional[PlayerTimeline] = None
+
+
+def get_player_timeline() -> PlayerTimeline:
+    """Get the process-wide player timeline."""
+    global _timeline
+    if _timeline is None:
+        _timeline = PlayerTimeline()
+    return _timeline
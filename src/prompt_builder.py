@@ -0,0 +1,188 @@
+"""Token-budgeted, compact news serialization for the LLM digest prompt."""
+
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    LLM_MODEL,
+    LLM_PROMPT_TOKEN_BUDGET,
+    LLM_PROMPT_SENTENCES_PER_ITEM,
+    LLM_PROMPT_MAX_SENTENCE_CHARS,
+)
+from .extractive_summarizer import split_sentences
+from .keyword_matcher import get_news_matcher
+from .news_item import as_dict
+from .relevance_scoring import score_news_batch
+
+try:
+    import tiktoken
+except ImportError:  # Optional: fall back to a character-based estimate
+    tiktoken = None
+
+
+PROMPT_COLUMNS = ("player", "team", "pos", "source", "trend", "headline", "key_points", "recent")
+
+_encoding = None
+
+
+def _get_encoding():
+    """Get the tiktoken encoding for the digest model (cached), or None."""
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.encoding_for_model(LLM_MODEL)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("o200k_base")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text.
+
+    Uses tiktoken when it is installed; otherwise estimates one token per
+    four characters, which is close for English prose.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Number of tokens
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def top_sentences(text: str, player_name: Optional[str] = None,
+                  max_sentences: int = LLM_PROMPT_SENTENCES_PER_ITEM) -> str:
+    """
+    Reduce a text to its most relevant sentences.
+
+    Sentences are ranked by news keyword hits, with a bonus for mentioning
+    the player; ties go to the earlier sentence. The kept sentences are
+    returned in their original order.
+
+    Args:
+        text: Article or summary text
+        player_name: Player the item is about, if known
+        max_sentences: Maximum sentences to keep
+
+    Returns:
+        The selected sentences joined by spaces
+    """
+    sentences = split_sentences(text or "")
+    if len(sentences) > max_sentences:
+        matcher = get_news_matcher()
+        name = (player_name or "").lower()
+        name = name if name and name != "unknown" else None
+        scores = [
+            sum(matcher.scan(s).values()) + (2 if name and name in s.lower() else 0)
+            for s in sentences
+        ]
+        keep = sorted(sorted(range(len(sentences)), key=lambda i: (-scores[i], i))[:max_sentences])
+        sentences = [sentences[i] for i in keep]
+    return " ".join(s[:LLM_PROMPT_MAX_SENTENCE_CHARS] for s in sentences)
+
+
+def _cell(value: Any) -> str:
+    """Format a table cell, keeping the row on one line and the delimiter unambiguous."""
+    if value is None:
+        return ""
+    return " ".join(str(value).split()).replace("|", "/")
+
+
+def format_prompt_row(item: Dict[str, Any]) -> str:
+    """
+    Serialize one news item as a pipe-delimited row matching PROMPT_COLUMNS.
+
+    Args:
+        item: News item
+
+    Returns:
+        Row text without a trailing newline
+    """
+    trend = ""
+    if item.get("trend_type"):
+        trend = f"{item['trend_type']} {item.get('trend_count', '')}".strip()
+    player = item.get("player_name")
+    headline = item.get("headline")
+    if (item.get("cluster_size") or 1) > 1:
+        headline = f"{headline} ({item['cluster_size']} reports)"
+    return "|".join(_cell(value) for value in (
+        player if player != "Unknown" else "",
+        item.get("team") if item.get("team") != "Unknown" else "",
+        item.get("position") if item.get("position") != "Unknown" else "",
+        item.get("source"),
+        trend,
+        headline,
+        top_sentences(item.get("summary", ""), player),
+        "; ".join(item.get("recent_context") or []),
+    ))
+
+
+def estimate_json_tokens(item: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens of an item as pretty-printed JSON, without serializing it.
+
+    Counts each field's key and value characters plus the indentation,
+    quotes and punctuation json.dumps(indent=2) adds, at four characters
+    per token.
+
+    Args:
+        item: News item
+
+    Returns:
+        Estimated number of tokens
+    """
+    chars = 8 + sum(len(key) + len(str(value)) + 12 for key, value in as_dict(item).items())
+    return (chars + 3) // 4
+
+
+def build_news_table(news_items: List[Dict[str, Any]],
+                     token_budget: int = LLM_PROMPT_TOKEN_BUDGET) -> Tuple[str, Dict[str, int]]:
+    """
+    Pack news items into a compact table under a token budget.
+
+    Items are added in descending relevance score order; an item whose row
+    would overflow the budget is skipped and packing continues with the
+    next one, so smaller high-priority rows still make it in.
+
+    Args:
+        news_items: Fantasy-relevant news items
+        token_budget: Maximum tokens for the table, header included
+
+    Returns:
+        Tuple of (table text, stats) where stats has items_included,
+        items_dropped, prompt_tokens, raw_tokens (an estimate of the
+        pretty-printed JSON the prompt used to send) and tokens_saved
+    """
+    header = "|".join(PROMPT_COLUMNS)
+    rows = [header]
+    used = count_tokens(header) + 1
+    included = 0
+
+    if news_items:
+        scores = score_news_batch(news_items)
+        for i in np.argsort(-scores, kind="stable"):
+            row = format_prompt_row(news_items[i])
+            cost = count_tokens(row) + 1
+            if used + cost > token_budget:
+                continue
+            rows.append(row)
+            used += cost
+            included += 1
+
+    table = "\n".join(rows)
+    prompt_tokens = count_tokens(table)
+    raw_tokens = sum(estimate_json_tokens(item) for item in news_items)
+    stats = {
+        "items_included": included,
+        "items_dropped": len(news_items) - included,
+        "prompt_tokens": prompt_tokens,
+        "raw_tokens": raw_tokens,
+        "tokens_saved": max(0, raw_tokens - prompt_tokens),
+    }
+    return table, stats
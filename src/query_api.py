@@ -0,0 +1,503 @@
+"""Read-only HTTP query API over scraped articles, news, trends and digests."""
+
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .config import (
+    OUTPUT_DIR, PLAYER_TIMELINE_DB, API_HOST, API_PORT, API_REFRESH_SECONDS,
+    API_DEFAULT_PAGE_SIZE, API_MAX_PAGE_SIZE, API_RESPONSE_CACHE_SIZE, API_MAX_REQUEST_BYTES,
+)
+from .data_fetchers import date_of, read_article_file
+
+
+# Query parameters that filter on an indexed field (besides q, limit and offset)
+FILTERS = ("kind", "date", "section", "player", "team", "source")
+
+# Collection endpoints and the document kind each one serves (None: every kind)
+COLLECTIONS = {"/articles": "article", "/news": "news", "/trends": "trend", "/digests": "digest", "/search": None}
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9']*")
+
+_CONTENT_TYPES = {".md": "text/markdown; charset=utf-8", ".html": "text/html; charset=utf-8",
+                  ".json": "application/json"}
+
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 431: "Request Header Fields Too Large"}
+
+
+def _date(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+
+
+def _words(text: str) -> Set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+def _field_terms(doc: Dict[str, Any]) -> List[str]:
+    """Index terms for a document's filterable fields."""
+    terms = [f"{field}:{str(doc[field]).lower()}" for field in FILTERS if doc.get(field)]
+    if doc.get("player_id"):
+        terms.append(f"player:{doc['player_id']}")
+    return terms
+
+
+class QueryIndex:
+    """
+    One immutable snapshot of every document, newest first, with inverted indexes.
+
+    Each filter value ("team:kc") and keyword ("q:ankle") maps to the
+    ascending positions of its documents, so a query is an intersection
+    of those sets, and sorting the positions puts the matches in time
+    order. Match lists and rendered responses are cached per snapshot, so
+    paging through a query and repeated queries (dashboards polling the
+    same page) are dict lookups until the data changes.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[Dict[str, Any], Iterable[str]]] = ()):
+        """
+        Args:
+            documents: (document, keyword terms) pairs, in any order
+        """
+        ordered = sorted(documents, key=lambda pair: pair[0]["ts"], reverse=True)
+        self.documents = [doc for doc, _ in ordered]
+        self.digests = {doc["name"]: doc for doc in self.documents if doc["kind"] == "digest"}
+        self.built_at = time.time()
+        self._postings: Dict[str, List[int]] = {}
+        self._sets: Dict[str, Set[int]] = {}
+        self._matches: "OrderedDict[Tuple[str, ...], List[int]]" = OrderedDict()
+        for position, (doc, words) in enumerate(ordered):
+            for term in _field_terms(doc) + [f"q:{word}" for word in words]:
+                self._postings.setdefault(term, []).append(position)
+        self.responses: "OrderedDict[str, Tuple[int, str, bytes, str]]" = OrderedDict()
+
+    def _set(self, term: str) -> Set[int]:
+        found = self._sets.get(term)
+        if found is None:
+            found = self._sets[term] = set(self._postings.get(term, ()))
+        return found
+
+    def query(self, filters: Dict[str, str], q: str = "", offset: int = 0,
+              limit: int = API_DEFAULT_PAGE_SIZE) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find documents matching every filter and every keyword, newest first.
+
+        Args:
+            filters: Field name to value (see FILTERS; player also matches a player ID)
+            q: Keywords, all of which must appear in the document
+            offset: Matches to skip
+            limit: Maximum documents returned
+
+        Returns:
+            Tuple of (total matches, documents on this page)
+        """
+        terms = [f"{field}:{value.strip().lower()}" for field, value in filters.items() if value.strip()]
+        terms += [f"q:{word}" for word in sorted(_words(q))]
+        if not terms:
+            return len(self.documents), self.documents[offset:offset + limit]
+
+        key = tuple(sorted(set(terms)))
+        matches = self._matches.get(key)
+        if matches is None:
+            if len(key) == 1:
+                matches = self._postings.get(key[0], [])
+            else:
+                # Set intersection runs in C, starting from the smallest set
+                sets = sorted((self._set(term) for term in key), key=len)
+                matches = sorted(sets[0].intersection(*sets[1:]))
+            # Later pages of the same query reuse the match list
+            self._matches[key] = matches
+            if len(self._matches) > API_RESPONSE_CACHE_SIZE:
+                self._matches.popitem(last=False)
+        return len(matches), [self.documents[position] for position in matches[offset:offset + limit]]
+
+
+class QueryStore:
+    """
+    Loads documents from disk and keeps the current QueryIndex.
+
+    refresh() only re-reads what changed since the last call: article and
+    digest files by mtime, and the player timeline when its database
+    changes. The new index is built off to the side and swapped in whole.
+    """
+
+    def __init__(self, articles_dir: str = "scraped_articles", timeline_db: str = PLAYER_TIMELINE_DB,
+                 digests_dir: str = OUTPUT_DIR):
+        """
+        Args:
+            articles_dir: Scraped article files
+            timeline_db: Player timeline database (news and trend events)
+            digests_dir: Digest files
+        """
+        self.articles_dir = articles_dir
+        self.timeline_db = timeline_db
+        self.digests_dir = digests_dir
+        self.index = QueryIndex()
+        self._articles: Dict[str, Tuple[float, Optional[Dict[str, Any]], Set[str]]] = {}
+        self._digests: Dict[str, Tuple[float, Dict[str, Any], Set[str]]] = {}
+        self._events: List[Tuple[Dict[str, Any], Set[str]]] = []
+        self._players_by_url: Dict[str, Tuple[str, Optional[str], Optional[str]]] = {}
+        self._timeline: Optional[sqlite3.Connection] = None
+        self._timeline_version: Optional[int] = None
+
+    def refresh(self) -> bool:
+        """
+        Pick up changed files and timeline events, and rebuild the index if anything changed.
+
+        Returns:
+            True if a new index was swapped in
+        """
+        changed = self._refresh_files(self._articles, glob.glob(os.path.join(self.articles_dir, "**", "*.txt"),
+                                                                recursive=True), self._load_article)
+        digests = [path for extension in _CONTENT_TYPES
+                   for path in glob.glob(os.path.join(self.digests_dir, f"*{extension}"))]
+        changed |= self._refresh_files(self._digests, digests, self._load_digest)
+        changed |= self._refresh_timeline()
+        if changed:
+            self.index = QueryIndex(self._documents())
+        return changed
+
+    @staticmethod
+    def _refresh_files(cache: Dict[str, Any], paths: List[str], load) -> bool:
+        changed = False
+        for path in set(cache) - set(paths):
+            del cache[path]
+            changed = True
+        for path in paths:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if path not in cache or cache[path][0] != mtime:
+                cache[path] = (mtime, *load(path, mtime))
+                changed = True
+        return changed
+
+    def _load_article(self, path: str, mtime: float) -> Tuple[Optional[Dict[str, Any]], Set[str]]:
+        article = read_article_file(path)
+        if article is None:
+            return None, set()
+        try:
+            ts = datetime.fromisoformat(article["scraped_at"]).timestamp()
+        except ValueError:
+            ts = mtime
+        doc = {
+            "id": "article:" + os.path.relpath(path, self.articles_dir),
+            "kind": "article",
+            "ts": ts,
+            "date": date_of(article) or _date(ts),
+            "section": article["section"],
+            "source": "fantasypros_scraped",
+            "headline": article["title"],
+            "author": article["author"],
+            "published": article["date"],
+            "url": article["url"],
+            "path": path,
+            "excerpt": " ".join(article["content"][:300].split()),
+        }
+        return doc, _words(article["title"] + " " + article["content"])
+
+    def _load_digest(self, path: str, mtime: float) -> Tuple[Dict[str, Any], Set[str]]:
+        name = os.path.basename(path)
+        stamp = re.search(r"(\d{4})(\d{2})(\d{2})", name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                words = _words(f.read())
+        except (OSError, UnicodeDecodeError):
+            words = set()
+        doc = {
+            "id": f"digest:{name}",
+            "kind": "digest",
+            "ts": mtime,
+            "date": "-".join(stamp.groups()) if stamp else _date(mtime),
+            "name": name,
+            "digest_type": "update" if name.startswith("digest_update_") else "daily",
+            "format": os.path.splitext(name)[1].lstrip("."),
+            "url": f"/digests/{name}",
+            "size": os.path.getsize(path),
+        }
+        return doc, words
+
+    def _refresh_timeline(self) -> bool:
+        if self._timeline is None:
+            if not os.path.exists(self.timeline_db):
+                return False
+            try:
+                self._timeline = sqlite3.connect(f"file:{self.timeline_db}?mode=ro", uri=True,
+                                                 check_same_thread=False)
+            except sqlite3.Error as e:
+                print(f"Error opening player timeline: {e}")
+                return False
+        try:
+            # Changes whenever another connection (a main.py run) commits
+            version = self._timeline.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._timeline_version:
+                return False
+            rows = self._timeline.execute(
+                "SELECT e.player_key, e.ts, e.kind, e.ref, e.source, e.headline, e.detail, "
+                "p.player_id, p.name, p.team FROM events e LEFT JOIN players p ON p.player_key = e.player_key "
+                "WHERE e.kind IN ('news', 'trend')").fetchall()
+        except sqlite3.Error as e:
+            print(f"Error reading player timeline: {e}")
+            return False
+        self._timeline_version = version
+
+        self._events, self._players_by_url = [], {}
+        for player_key, ts, kind, ref, source, headline, detail, player_id, name, team in rows:
+            player = name.title() if name else None
+            doc = {"id": f"{kind}:{player_key}:{ref}", "kind": kind, "ts": ts, "date": _date(ts),
+                   "source": source, "player": player, "player_id": player_id, "team": team,
+                   "headline": headline}
+            if kind == "trend":
+                doc.update(trend_type=ref.split(":")[0], count=int(detail) if detail and detail.isdigit() else None)
+            else:
+                doc["url"] = detail or None
+                if detail:
+                    self._players_by_url[detail] = (player, player_id, team)
+            self._events.append((doc, _words(headline or "")))
+        return True
+
+    def close(self):
+        """Close the timeline connection."""
+        if self._timeline is not None:
+            self._timeline.close()
+            self._timeline = None
+
+    def _documents(self) -> Iterable[Tuple[Dict[str, Any], Set[str]]]:
+        for _, doc, words in self._articles.values():
+            if doc is None:
+                continue
+            # Articles get their player from the timeline's news event for the same URL
+            player = self._players_by_url.get(doc["url"])
+            if player is not None:
+                doc = dict(doc, player=player[0], player_id=player[1], team=player[2])
+            yield doc, words
+        for _, doc, words in self._digests.values():
+            yield doc, words
+        yield from self._events
+
+
+class QueryServer:
+    """
+    Minimal HTTP/1.1 server (GET and HEAD, keep-alive) answering from a QueryStore.
+
+    Endpoints:
+        /articles, /news, /trends, /digests, /search
+            JSON pages: {"total", "offset", "limit", "next_offset", "items"}.
+            Filters: date, section, player, team, source (and kind on /search);
+            q for keywords; limit and offset for paging.
+        /digests/<name>
+            A digest file.
+        /health
+            Index size and age.
+
+    Every response carries an ETag; a request whose If-None-Match matches
+    gets 304 Not Modified with no body.
+    """
+
+    def __init__(self, store: QueryStore):
+        """
+        Args:
+            store: Loaded document store
+        """
+        self.store = store
+
+    def respond(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer one request.
+
+        Args:
+            method: HTTP method
+            target: Request target (path and query string)
+            headers: Request headers, lowercase names
+
+        Returns:
+            Tuple of (status, response headers, body)
+        """
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD", "Content-Type": "application/json"}, \
+                _error_body("Only GET and HEAD are supported")
+
+        index = self.store.index
+        if target == "/health":
+            status, content_type, body = 200, "application/json", json.dumps({
+                "status": "ok", "documents": len(index.documents),
+                "indexed_at": datetime.fromtimestamp(index.built_at).isoformat(timespec="seconds"),
+            }).encode()
+            etag = _etag(body)
+        else:
+            cached = index.responses.get(target)
+            if cached is None:
+                status, content_type, body = self._render(index, target)
+                cached = (status, content_type, body, _etag(body))
+                if status == 200:
+                    index.responses[target] = cached
+                    if len(index.responses) > API_RESPONSE_CACHE_SIZE:
+                        index.responses.popitem(last=False)
+            else:
+                index.responses.move_to_end(target)
+            status, content_type, body, etag = cached
+
+        response_headers = {"Content-Type": content_type, "ETag": etag, "Cache-Control": "no-cache"}
+        if status == 200 and etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+            return 304, {"ETag": etag, "Cache-Control": "no-cache"}, b""
+        return status, response_headers, body
+
+    def _render(self, index: QueryIndex, target: str) -> Tuple[int, str, bytes]:
+        parts = urlsplit(target)
+        path = parts.path.rstrip("/") or "/"
+
+        if path.startswith("/digests/"):
+            name = unquote(path[len("/digests/"):])
+            if name not in index.digests:
+                return 404, "application/json", _error_body(f"No digest named {name}")
+            try:
+                with open(os.path.join(self.store.digests_dir, name), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                return 404, "application/json", _error_body(f"No digest named {name}")
+            return 200, _CONTENT_TYPES.get(os.path.splitext(name)[1], "text/plain; charset=utf-8"), body
+
+        if path not in COLLECTIONS:
+            return 404, "application/json", _error_body(
+                f"Unknown endpoint {path}; try {', '.join(COLLECTIONS)}, /digests/<name> or /health")
+
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        unknown = set(params) - set(FILTERS) - {"q", "limit", "offset"}
+        kind = COLLECTIONS[path]
+        if kind is not None and "kind" in params:
+            unknown.add("kind")
+        if unknown:
+            return 400, "application/json", _error_body(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+        try:
+            limit = int(params.pop("limit", API_DEFAULT_PAGE_SIZE))
+            offset = int(params.pop("offset", 0))
+        except ValueError:
+            return 400, "application/json", _error_body("limit and offset must be integers")
+        if not 1 <= limit <= API_MAX_PAGE_SIZE or offset < 0:
+            return 400, "application/json", _error_body(f"limit must be 1-{API_MAX_PAGE_SIZE} and offset >= 0")
+
+        q = params.pop("q", "")
+        if kind is not None:
+            params["kind"] = kind
+        total, items = index.query(params, q, offset, limit)
+        next_offset = offset + limit if offset + limit < total else None
+        body = json.dumps({"total": total, "offset": offset, "limit": limit,
+                           "next_offset": next_offset, "items": items}, ensure_ascii=False)
+        return 200, "application/json", body.encode()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_encode(431, {"Content-Type": "application/json"},
+                                         _error_body("Request head too large"), keep_alive=False))
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ")
+                except ValueError:
+                    writer.write(_encode(400, {"Content-Type": "application/json"},
+                                         _error_body("Malformed request line"), keep_alive=False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get("content-length", "0") != "0":
+                    await reader.readexactly(int(headers["content-length"]))
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                status, response_headers, body = self.respond(method, target, headers)
+                writer.write(_encode(status, response_headers, body, keep_alive, send_body=method != "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = API_HOST, port: int = API_PORT) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        Args:
+            host: Interface to bind
+            port: TCP port (0 picks a free one)
+
+        Returns:
+            The running server
+        """
+        return await asyncio.start_server(self.handle, host, port, limit=API_MAX_REQUEST_BYTES, backlog=1024)
+
+    async def refresh_forever(self, interval: float = API_REFRESH_SECONDS):
+        """Reindex changed data every interval seconds, off the event loop."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await asyncio.to_thread(self.store.refresh):
+                    print(f"Reindexed: {len(self.store.index.documents)} documents")
+            except Exception as e:
+                print(f"Error refreshing query index: {e}")
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def _error_body(message: str) -> bytes:
+    return json.dumps({"error": message}).encode()
+
+
+def _encode(status: int, headers: Dict[str, str], body: bytes, keep_alive: bool = True,
+            send_body: bool = True) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append(f"Content-Length: {len(body) if status != 304 else 0}")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return "\r\n".join(lines).encode("latin-1") + b"\r\n\r\n" + (body if send_body else b"")
+
+
+async def serve(host: str = API_HOST, port: int = API_PORT, refresh_seconds: float = API_REFRESH_SECONDS,
+                store: Optional[QueryStore] = None):
+    """
+    Index everything, then serve queries until cancelled.
+
+    Args:
+        host: Interface to bind
+        port: TCP port
+        refresh_seconds: How often to pick up new data
+        store: Document store (defaults to the standard data locations)
+    """
+    store = store or QueryStore()
+    start = time.perf_counter()
+    await asyncio.to_thread(store.refresh)
+    print(f"Indexed {len(store.index.documents)} documents in {time.perf_counter() - start:.2f}s")
+
+    query_server = QueryServer(store)
+    server = await query_server.start(host, port)
+    print(f"Serving on http://{host}:{port} (Ctrl+C to stop)")
+    refresher = asyncio.create_task(query_server.refresh_forever(refresh_seconds))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        refresher.cancel()
+        store.close()
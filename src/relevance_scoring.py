@@ -0,0 +1,166 @@
+"""Batch relevance scoring for news items using weighted feature columns."""
+
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .config import (
+    NEWS_CATEGORY_KEYWORDS,
+    RELEVANCE_WEIGHTS,
+    RELEVANCE_SOURCE_WEIGHTS,
+    RELEVANCE_SECTION_WEIGHTS,
+    RELEVANCE_HALF_LIFE_HOURS,
+    RELEVANCE_SCAN_CHARS,
+)
+from .keyword_matcher import get_news_matcher, RELEVANCE_LABEL
+from .news_item import NewsItem
+
+
+KEYWORD_COLUMNS = list(NEWS_CATEGORY_KEYWORDS) + [RELEVANCE_LABEL]
+
+
+def item_section(item: Dict[str, Any]) -> str:
+    """Get an item's site section from the item or its URL path."""
+    section = item.get("section")
+    if section:
+        return section
+    path = urlparse(item.get("url") or "").path
+    for name in RELEVANCE_SECTION_WEIGHTS:
+        if f"/{name}/" in path:
+            return name
+    return "unknown"
+
+
+def _epoch(timestamp: Any) -> float:
+    """Parse an ISO timestamp (or pass through epoch seconds); NaN if unknown."""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    try:
+        return datetime.fromisoformat(str(timestamp).replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def item_epoch(item: Dict[str, Any]) -> float:
+    """Get an item's timestamp as epoch seconds, without reparsing NewsItem timestamps."""
+    if isinstance(item, NewsItem):
+        epoch = item.epoch
+        return epoch if epoch is not None else float("nan")
+    return _epoch(item.get("timestamp"))
+
+
+def extract_features(news_items: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Build one feature column per scoring input.
+
+    Keyword hits come from a single matcher pass over the headline and the
+    first RELEVANCE_SCAN_CHARS of the summary; everything else is read
+    straight from the item.
+
+    Args:
+        news_items: List of news items
+
+    Returns:
+        Dictionary mapping feature name to an array with one value per item
+    """
+    n = len(news_items)
+    matcher = get_news_matcher()
+    columns = {name: np.zeros(n) for name in KEYWORD_COLUMNS}
+
+    for i, item in enumerate(news_items):
+        summary = item.get("summary") or ""
+        hits = matcher.scan(item.get("headline", ""), summary[:RELEVANCE_SCAN_CHARS])
+        for label, count in hits.items():
+            columns[label][i] = count
+
+    columns["trend_count"] = np.fromiter(
+        (item.get("trend_count") or 0 for item in news_items), dtype=np.float64, count=n)
+    columns["anomaly_score"] = np.fromiter(
+        (item.get("anomaly_score") or 0 for item in news_items), dtype=np.float64, count=n)
+    columns["source"] = np.array([item.get("source", "") for item in news_items], dtype=object)
+    columns["section"] = np.array([item_section(item) for item in news_items], dtype=object)
+    columns["timestamp"] = np.fromiter(
+        (item_epoch(item) for item in news_items), dtype=np.float64, count=n)
+    return columns
+
+
+def score_features(features: Dict[str, np.ndarray], weights: Optional[Dict[str, float]] = None,
+                   now: Optional[float] = None) -> np.ndarray:
+    """
+    Combine feature columns into one relevance score per item.
+
+    Args:
+        features: Columns from extract_features
+        weights: Feature weights (defaults to RELEVANCE_WEIGHTS)
+        now: Reference time for recency decay (defaults to now)
+
+    Returns:
+        Array of scores
+    """
+    weights = weights or RELEVANCE_WEIGHTS
+    now = now if now is not None else time.time()
+
+    score = np.zeros(len(features["timestamp"]))
+    for name in KEYWORD_COLUMNS:
+        score += weights.get(name, 0.0) * np.log1p(features[name])
+    score += weights.get("trend_count", 0.0) * np.log1p(features["trend_count"])
+    score += weights.get("anomaly_score", 0.0) * np.clip(features["anomaly_score"], -3, 3)
+
+    score += _lookup(features["source"], RELEVANCE_SOURCE_WEIGHTS)
+    score += _lookup(features["section"], RELEVANCE_SECTION_WEIGHTS)
+
+    # Exponential recency decay of the positive part only, so an older item
+    # never scores higher than a newer one; items with unknown time are not penalised
+    age_hours = np.nan_to_num((now - features["timestamp"]) / 3600.0, nan=0.0)
+    decay = 0.5 ** (np.clip(age_hours, 0, None) / RELEVANCE_HALF_LIFE_HOURS)
+    return np.where(score > 0, score * decay, score)
+
+
+def _lookup(values: np.ndarray, table: Dict[str, float]) -> np.ndarray:
+    """Map categorical values to weights (0 for unknown)."""
+    return np.fromiter((table.get(v, 0.0) for v in values), dtype=np.float64, count=len(values))
+
+
+def score_news_batch(news_items: List[Dict[str, Any]], weights: Optional[Dict[str, float]] = None,
+                     now: Optional[float] = None) -> np.ndarray:
+    """
+    Score a whole list of news items for fantasy relevance.
+
+    Args:
+        news_items: List of news items
+        weights: Feature weights (defaults to RELEVANCE_WEIGHTS)
+        now: Reference time for recency decay (defaults to now)
+
+    Returns:
+        Array of scores, one per item
+    """
+    return score_features(extract_features(news_items), weights, now)
+
+
+def select_by_score(news_items: List[Dict[str, Any]], scores: np.ndarray,
+                    threshold: Optional[float] = None, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Keep the items worth processing downstream, highest score first.
+
+    Args:
+        news_items: List of news items
+        scores: Scores from score_news_batch
+        threshold: Optional minimum score
+        top_k: Optional maximum number of items
+
+    Returns:
+        Selected news items ordered by descending score
+    """
+    candidates = np.arange(len(news_items))
+    if threshold is not None:
+        candidates = candidates[scores >= threshold]
+    if top_k is not None and top_k <= 0:
+        return []
+    if top_k is not None and top_k < len(candidates):
+        top = np.argpartition(scores[candidates], -top_k)[-top_k:]
+        candidates = candidates[top]
+    ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [news_items[i] for i in ordered]
@@ -0,0 +1,228 @@
+"""Cross-process coordination: lease-based file locks and atomic file writes."""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, IO, Optional
+
+from .config import RUN_LOCK_DIR, RUN_LOCK_LEASE_SECONDS, RUN_LOCK_WAIT_SECONDS
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', encoding: Optional[str] = 'utf-8') -> Iterator[IO]:
+    """
+    Write a file so readers see either the old or the new contents, never a mix.
+
+    Content goes to a temporary file in the same directory, which is
+    flushed to disk and renamed over the target when the block finishes.
+    If the block raises, the target is left untouched.
+
+    Args:
+        path: File to write
+        mode: 'w' for text or 'wb' for bytes
+        encoding: Text encoding (ignored for bytes)
+
+    Yields:
+        The open temporary file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs: Any):
+    """
+    Atomically write data as JSON (see atomic_write).
+
+    Args:
+        path: File to write
+        data: JSON-serializable data
+        dump_kwargs: Passed to json.dump (indent, default, ...)
+    """
+    with atomic_write(path) as f:
+        json.dump(data, f, **dump_kwargs)
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a lease can't be acquired in time."""
+
+
+class FileLease:
+    """
+    An advisory lock between processes, held as a lease.
+
+    The lock is a file in RUN_LOCK_DIR created with O_CREAT | O_EXCL, so
+    exactly one process can hold it. It records the holder and when the
+    lease expires; a background thread renews it while it is held. If the
+    holder dies or hangs, the lease runs out (or, on the same host, the
+    dead process is noticed right away) and the next process takes over,
+    so a crashed run never blocks the others for good.
+    """
+
+    def __init__(self, name: str, lease_seconds: float = RUN_LOCK_LEASE_SECONDS,
+                 directory: str = RUN_LOCK_DIR):
+        """
+        Args:
+            name: Lock name (one per shared resource or stage)
+            lease_seconds: How long the lease lasts without renewal
+            directory: Where lock files live
+        """
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.path = os.path.join(directory, f"{name}.lock")
+        self.token = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _record(self) -> Dict[str, Any]:
+        now = time.time()
+        return {"token": self.token, "pid": os.getpid(), "host": socket.gethostname(),
+                "acquired_at": now, "expires_at": now + self.lease_seconds}
+
+    def holder(self) -> Optional[Dict[str, Any]]:
+        """The current lease record, or None if the lock is free (or unreadable mid-write)."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_stale(self, record: Dict[str, Any]) -> bool:
+        if time.time() > record.get("expires_at", 0):
+            return True
+        if record.get("host") == socket.gethostname():
+            try:
+                os.kill(record.get("pid", 0), 0)
+            except ProcessLookupError:
+                return True
+            except (PermissionError, OSError):
+                pass
+        return False
+
+    def try_acquire(self) -> bool:
+        """
+        Take the lease if it is free or stale, without waiting.
+
+        Returns:
+            True if this process now holds the lease
+        """
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            record = self.holder()
+            if record is not None and self._is_stale(record):
+                print(f"Breaking stale lock {self.name} (pid {record.get('pid')} on {record.get('host')})")
+                self._remove_if(record.get("token"))
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._record(), f)
+        self._start_heartbeat()
+        return True
+
+    def acquire(self, timeout: float = RUN_LOCK_WAIT_SECONDS, poll_seconds: float = 0.2):
+        """
+        Wait for the lease.
+
+        Args:
+            timeout: Seconds to wait before giving up
+            poll_seconds: Delay between attempts
+
+        Raises:
+            LockTimeout: If another process still holds the lease after timeout seconds
+        """
+        deadline = time.monotonic() + timeout
+        while not self.try_acquire():
+            if time.monotonic() >= deadline:
+                record = self.holder() or {}
+                raise LockTimeout(f"Timed out after {timeout:.0f}s waiting for lock {self.name} "
+                                  f"(held by pid {record.get('pid')} on {record.get('host')})")
+            time.sleep(poll_seconds)
+
+    def renew(self):
+        """Extend the lease (only if this process still holds it)."""
+        record = self.holder()
+        if record is None or record.get("token") != self.token:
+            return
+        record["expires_at"] = time.time() + self.lease_seconds
+        try:
+            atomic_write_json(self.path, record)
+        except OSError as e:
+            print(f"Error renewing lock {self.name}: {e}")
+
+    def release(self):
+        """Give the lease up."""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        self._remove_if(self.token)
+
+    def _remove_if(self, token: Optional[str]):
+        """Delete the lock file if it still belongs to token."""
+        record = self.holder()
+        if record is not None and record.get("token") == token:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _start_heartbeat(self):
+        self._stop.clear()
+
+        def beat():
+            while not self._stop.wait(self.lease_seconds / 3):
+                self.renew()
+
+        self._heartbeat = threading.Thread(target=beat, name=f"lease-{self.name}", daemon=True)
+        self._heartbeat.start()
+
+    def __enter__(self) -> "FileLease":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+@contextmanager
+def lease(name: str, timeout: float = RUN_LOCK_WAIT_SECONDS,
+          lease_seconds: float = RUN_LOCK_LEASE_SECONDS, directory: str = RUN_LOCK_DIR) -> Iterator[FileLease]:
+    """
+    Hold a named lease for the duration of a block.
+
+    Args:
+        name: Lock name
+        timeout: Seconds to wait for it
+        lease_seconds: Lease length between renewals
+        directory: Where the lock file lives
+
+    Yields:
+        The held lease
+
+    Raises:
+        LockTimeout: If it couldn't be acquired in time
+    """
+    held = FileLease(name, lease_seconds, directory)
+    held.acquire(timeout)
+    try:
+        yield held
+    finally:
+        held.release()
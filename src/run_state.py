@@ -0,0 +1,293 @@
+"""Persisted run watermark for incremental runs and "what changed" digests."""
+
+import json
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .config import RUN_STATE_FILE, RUN_TREND_CHANGE_RATIO
+from .digest_renderer import DigestModel, digest_entry, simple_digest_section
+from .llm_cache import hash_text
+from .relevance_scoring import item_epoch
+from .run_coordination import atomic_write_json
+from .story_clustering import MinHasher, find_story_clusters, story_signature
+
+
+# Delta digest sections, in output order
+DELTA_SECTIONS = [
+    ("new", "New Since Last Run"),
+    ("updated", "Updated"),
+    ("resolved", "No Longer Trending"),
+]
+
+
+def story_key(item: Dict[str, Any]) -> str:
+    """
+    Identify an item across runs.
+
+    Trending entries are keyed by player and direction (their counts change
+    every poll), articles by URL, anything else by source and headline.
+
+    Args:
+        item: News item
+
+    Returns:
+        Stable key
+    """
+    if item.get("trend_type"):
+        return f"trend:{item['trend_type']}:{item.get('player_id') or item.get('player_name')}"
+    if item.get("url"):
+        return f"url:{item['url']}"
+    return "text:" + hash_text(item.get("source") or "", item.get("headline") or "")
+
+
+def story_fingerprint(item: Dict[str, Any]) -> str:
+    """
+    Hash of an item's content; a changed fingerprint means the story was updated.
+
+    Trending headlines carry the live count, so trending entries are
+    fingerprinted on team and direction only; whether their count moved
+    enough is left to RUN_TREND_CHANGE_RATIO.
+    """
+    if item.get("trend_type"):
+        return hash_text(item.get("team") or "", item["trend_type"])
+    return hash_text(item.get("headline") or "", item.get("summary") or "")
+
+
+class RunState:
+    """
+    What earlier runs today have already processed.
+
+    The state file holds the watermark (the start time of the last run)
+    and, per story key, its content fingerprint, latest trend count,
+    digest section and entry, and when it was first seen and last
+    changed. Each run reads it, passes only new or updated items
+    downstream (see changed), records what it reports and saves it, so
+    the next run starts where this one stopped. Reported articles also
+    keep their story signature, so a new report of a story told in an
+    earlier run is folded into that story (see match_reported) rather
+    than listed again. The state starts over each day.
+    """
+
+    def __init__(self, path: str = RUN_STATE_FILE, today: Optional[str] = None):
+        """
+        Load the state for today.
+
+        Args:
+            path: State file
+            today: Date in YYYY-MM-DD format (defaults to today)
+        """
+        self.path = path
+        self.today = today or datetime.now().strftime("%Y-%m-%d")
+        self.started_at = time.time()
+        self.watermark: Optional[float] = None
+        self.stories: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            saved = {}
+        except (OSError, ValueError) as e:
+            print(f"Error loading run state, starting fresh: {e}")
+            saved = {}
+        if saved.get("date") == self.today:
+            self.watermark = saved.get("watermark")
+            self.stories = saved.get("stories", {})
+
+        self.new: List[Dict[str, Any]] = []
+        self.updated: List[Dict[str, Any]] = []
+        self.skipped = 0
+        self._seen = set()
+        self._recorded = set()
+        self._previous_counts: Dict[str, Any] = {}
+
+    def changed(self, news_items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Pass on only the items that are new or updated since the last run.
+
+        Items already processed that are older than the watermark are
+        skipped without hashing; newer ones are compared by fingerprint,
+        and trending entries count as updated once their count moves by
+        RUN_TREND_CHANGE_RATIO.
+
+        Args:
+            news_items: News items (any iterable, including generators)
+
+        Yields:
+            New and updated items (also collected in self.new and self.updated)
+        """
+        for item in news_items:
+            key = story_key(item)
+            self._seen.add(key)
+            known = self.stories.get(key)
+            if known is None or known.get("resolved"):
+                status = "new"
+            elif self.watermark is not None and item_epoch(item) <= self.watermark:
+                status = None
+            elif story_fingerprint(item) != known["fingerprint"] or _trend_moved(known, item):
+                status = "updated"
+            else:
+                status = None
+
+            if status is None:
+                self.skipped += 1
+                continue
+            if known is not None and known.get("trend_count") is not None:
+                self._previous_counts[key] = known["trend_count"]
+            # Remember the story right away, so items that are dropped later
+            # (clustered away, under the score cut) are not re-reported next run
+            story = {"section": None, "entry": None, "first_seen": self.started_at}
+            story.update(known or {})
+            story.update(fingerprint=story_fingerprint(item), trend_count=item.get("trend_count"),
+                         changed_at=self.started_at, resolved=False)
+            self.stories[key] = story
+            (self.new if status == "new" else self.updated).append(item)
+            yield item
+
+    def match_reported(self, news_items: List[Dict[str, Any]]) -> int:
+        """
+        Fold new reports of stories reported by earlier runs today into those stories.
+
+        This run's new articles are clustered (see find_story_clusters)
+        together with the stored signatures of the articles earlier runs
+        reported. A new item that joins one of them counts as an update of
+        that story: it replaces the story's entry in the daily digest and
+        is listed under "Updated" in the delta digest.
+
+        Args:
+            news_items: This run's items, already clustered among themselves
+
+        Returns:
+            Number of items folded into earlier stories
+        """
+        new_ids = {id(item) for item in self.new}
+        fresh = [item for item in news_items if id(item) in new_ids and not item.get("trend_type")]
+        stored = [(key, story["match"]) for key, story in self.stories.items()
+                  if story.get("match") and story.get("entry") is not None
+                  and story.get("changed_at") != self.started_at]
+        if not fresh or not stored:
+            return 0
+
+        stubs = [{field: value for field, value in match.items() if field != "signature"} for _, match in stored]
+        signatures = {i: np.array(match["signature"], dtype=np.uint64) for i, (_, match) in enumerate(stored)}
+        folded = set()
+        for members in find_story_clusters(stubs + fresh, signatures):
+            targets = [stored[i][0] for i in members if i < len(stored)]
+            if not targets:
+                continue
+            for i in members:
+                if i >= len(stored):
+                    item = fresh[i - len(stored)]
+                    self.stories[story_key(item)]["same_as"] = targets[0]
+                    self.updated.append(item)
+                    folded.add(id(item))
+        self.new = [item for item in self.new if id(item) not in folded]
+        return len(folded)
+
+    def record(self, news_items: Iterable[Dict[str, Any]]):
+        """
+        Store the digest entries of the items this run reports.
+
+        Args:
+            news_items: The new and updated items that made it into the digest
+        """
+        hasher = MinHasher()
+        for item in news_items:
+            key = self._key(item)
+            section = simple_digest_section(item)
+            if key not in self.stories or section is None:
+                continue
+            self.stories[key].update(section=section, entry=digest_entry(item, section))
+            if not item.get("trend_type"):
+                # What later runs need to recognize another report of this story
+                self.stories[key]["match"] = {
+                    "headline": item.get("headline"), "player_name": item.get("player_name"),
+                    "source": item.get("source"), "url": item.get("url"),
+                    "signature": story_signature(item, hasher).tolist(),
+                }
+            self._recorded.add(key)
+
+    def resolved(self) -> List[str]:
+        """
+        Trending entries from earlier runs that this run no longer saw.
+
+        Only meaningful once the trending lists were fetched, so nothing is
+        resolved when this run saw no trending entries at all.
+
+        Returns:
+            Story keys
+        """
+        if not any(key.startswith("trend:") for key in self._seen):
+            return []
+        return [key for key, story in self.stories.items()
+                if key.startswith("trend:") and key not in self._seen and not story.get("resolved")]
+
+    def delta_digest(self) -> DigestModel:
+        """
+        Build the "what changed" digest for this run.
+
+        Returns:
+            Digest model with new, updated and resolved sections (close it when done)
+        """
+        since = datetime.fromtimestamp(self.watermark).strftime("%H:%M") if self.watermark else "start of day"
+        model = DigestModel(sections=DELTA_SECTIONS, title=f"NFL Fantasy Digest Update (since {since})")
+        listed = set()
+        for change, items in (("new", self.new), ("updated", self.updated)):
+            for item in items:
+                key = self._key(item)
+                if key not in self._recorded or key in listed:
+                    continue
+                listed.add(key)
+                entry = list(self.stories[key]["entry"])
+                previous = self._previous_counts.get(key)
+                if change == "updated" and previous is not None:
+                    entry[2] += f" (was {previous} earlier today)"
+                model.add(change, entry)
+        for key in self.resolved():
+            entry = self.stories[key]["entry"]
+            if entry is not None:
+                model.add("resolved", entry)
+        return model
+
+    def daily_digest(self) -> DigestModel:
+        """
+        Build the cumulative digest for the whole day from the stored entries.
+
+        Nothing is summarized again: each story's latest entry is reused,
+        and trending entries that fell off the lists are left out.
+
+        Returns:
+            Digest model (close it when done)
+        """
+        resolved = set(self.resolved())
+        model = DigestModel()
+        for key, story in self.stories.items():
+            if story.get("entry") is not None and key not in resolved and not story.get("resolved"):
+                model.add(story["section"], story["entry"])
+        return model
+
+    def _key(self, item: Dict[str, Any]) -> str:
+        """The story an item is recorded under: its own, or the earlier one it was folded into."""
+        key = story_key(item)
+        return self.stories.get(key, {}).get("same_as") or key
+
+    def save(self):
+        """Mark resolved stories, advance the watermark to this run's start and write the state."""
+        for key in self.resolved():
+            self.stories[key]["resolved"] = True
+        state = {"date": self.today, "watermark": self.started_at, "stories": self.stories}
+        try:
+            atomic_write_json(self.path, state)
+        except OSError as e:
+            print(f"Error saving run state: {e}")
+
+
+def _trend_moved(known: Dict[str, Any], item: Dict[str, Any]) -> bool:
+    """Whether a trending count changed enough since the last run to report again."""
+    before, now = known.get("trend_count"), item.get("trend_count")
+    if before is None or now is None:
+        return False
+    return abs(now - before) >= RUN_TREND_CHANGE_RATIO * max(before, 1)
@@ -0,0 +1,306 @@
+"""Group overlapping news items into stories with MinHash-LSH."""
+
+import re
+import zlib
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .config import (
+    CLUSTER_NUM_PERM,
+    CLUSTER_BANDS,
+    CLUSTER_SHINGLE_WORDS,
+    CLUSTER_SCAN_CHARS,
+    CLUSTER_SIMILARITY_THRESHOLD,
+    CLUSTER_ENTITY_SIMILARITY_THRESHOLD,
+    RELEVANCE_SCAN_CHARS,
+    EXTRACTIVE_SCAN_CHARS,
+)
+from .extractive_summarizer import split_sentences, is_prose
+from .relevance_scoring import score_news_batch
+
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9'’]*")
+_PRIME = np.uint64(4294967291)  # Largest prime below 2**32
+_EMPTY = np.uint64(np.iinfo(np.uint32).max)
+# The most of a summary that clustering, relevance scoring or the simple digest reads
+_COMPACT_SUMMARY_CHARS = max(CLUSTER_SCAN_CHARS, RELEVANCE_SCAN_CHARS, EXTRACTIVE_SCAN_CHARS)
+
+
+def shingles(text: str, size: int = CLUSTER_SHINGLE_WORDS) -> np.ndarray:
+    """
+    Hash the word n-grams of a text.
+
+    Args:
+        text: Text to shingle
+        size: Words per shingle
+
+    Returns:
+        Distinct 32-bit shingle hashes (as uint64)
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams),
+                                 dtype=np.uint64, count=len(grams)))
+
+
+class MinHasher:
+    """MinHash signatures from a fixed family of universal hash functions."""
+
+    def __init__(self, num_perm: int = CLUSTER_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        # a * h + b stays below 2**64 because a, b and h are all below 2**32
+        self.a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_hashes: np.ndarray) -> np.ndarray:
+        """
+        Compute the MinHash signature of a shingle set.
+
+        Args:
+            shingle_hashes: Shingle hashes from shingles()
+
+        Returns:
+            One minimum per hash function (all _EMPTY for an empty set)
+        """
+        if not len(shingle_hashes):
+            return np.full(len(self.a), _EMPTY)
+        hashed = (np.outer(shingle_hashes, self.a) + self.b) % _PRIME
+        return hashed.min(axis=0)
+
+
+def story_text(item: Dict[str, Any]) -> str:
+    """
+    The text two reports of a story are compared on.
+
+    That is the headline plus the prose sentences (see is_prose) from the
+    start of the text; navigation, bylines and link lists are left out
+    because every page of a site shares them.
+
+    Args:
+        item: News item
+
+    Returns:
+        Text to shingle
+    """
+    summary = (item.get("summary") or "")[:CLUSTER_SCAN_CHARS]
+    prose = [sentence for sentence in split_sentences(summary) if is_prose(sentence)]
+    return " ".join([item.get("headline") or ""] + prose)
+
+
+def story_signature(item: Dict[str, Any], hasher: Optional[MinHasher] = None) -> np.ndarray:
+    """
+    MinHash signature of an item's story text.
+
+    Args:
+        item: News item
+        hasher: MinHasher to use (defaults to the one find_story_clusters uses)
+
+    Returns:
+        Signature, comparable with the signatures of any other call
+    """
+    return (hasher or MinHasher()).signature(shingles(story_text(item)))
+
+
+def compact_stories(news_items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Pipeline stage: cut each item's summary to the part later local stages read.
+
+    Clustering needs every item at once; cutting the summaries as items
+    stream in keeps whole article bodies out of memory, while clustering,
+    relevance scoring and the simple digest still see exactly the same
+    text. The LLM reads more of each article, so it needs the full items.
+
+    Args:
+        news_items: News items (any iterable, including generators)
+
+    Yields:
+        The items, with the summary cut to its first
+        max(CLUSTER_SCAN_CHARS, RELEVANCE_SCAN_CHARS, EXTRACTIVE_SCAN_CHARS) characters
+    """
+    for item in news_items:
+        summary = item.get("summary")
+        if summary and len(summary) > _COMPACT_SUMMARY_CHARS:
+            item["summary"] = summary[:_COMPACT_SUMMARY_CHARS]
+        yield item
+
+
+def _primary_player(item: Dict[str, Any]) -> Optional[str]:
+    """The item's player as a lowercase full name; surname-only guesses are too ambiguous to use."""
+    name = " ".join((item.get("player_name") or "").lower().split())
+    return name if " " in name else None
+
+
+def _is_clusterable(item: Dict[str, Any]) -> bool:
+    """Trending add/drop entries are structured data, not stories; they stay separate."""
+    return "trend_type" not in item
+
+
+def _candidate_pairs(signatures: np.ndarray) -> set:
+    """Index pairs whose signatures agree on every row of at least one LSH band."""
+    rows = signatures.shape[1] // CLUSTER_BANDS
+    pairs = set()
+    for band in range(CLUSTER_BANDS):
+        buckets: Dict[bytes, List[int]] = {}
+        for k, key in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            buckets.setdefault(key.tobytes(), []).append(k)
+        for members in buckets.values():
+            pairs.update((members[x], members[y])
+                         for x in range(len(members)) for y in range(x + 1, len(members)))
+    return pairs
+
+
+def _entity_pairs(players: List[Optional[str]], headlines: List[str]) -> set:
+    """
+    Index pairs about the same player.
+
+    That is two items with the same player, or an item without a known
+    player whose headline names another item's player.
+    """
+    by_player: Dict[str, List[int]] = {}
+    for k, player in enumerate(players):
+        if player:
+            by_player.setdefault(player, []).append(k)
+    if not by_player:
+        return set()
+    names = re.compile("|".join(re.escape(name) for name in sorted(by_player, key=len, reverse=True)))
+    for k, player in enumerate(players):
+        if not player:
+            for name in {match.group() for match in names.finditer(headlines[k])}:
+                by_player[name].append(k)
+    return {(min(x, y), max(x, y))
+            for members in by_player.values()
+            for i, x in enumerate(members) for y in members[i + 1:]}
+
+
+def _distinct_pages(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """Two different URLs on one site: pages that share a template, not one story told twice."""
+    return (a.get("source") == b.get("source") and bool(a.get("url")) and bool(b.get("url"))
+            and a.get("url") != b.get("url"))
+
+
+def find_story_clusters(news_items: List[Dict[str, Any]],
+                        signatures: Optional[Dict[int, np.ndarray]] = None) -> List[List[int]]:
+    """
+    Group items that tell the same story.
+
+    Candidate pairs are items that share an LSH band of their MinHash
+    signatures (see story_text), plus items about the same player. A
+    candidate pair is merged when its estimated Jaccard similarity reaches
+    CLUSTER_SIMILARITY_THRESHOLD, or the lower
+    CLUSTER_ENTITY_SIMILARITY_THRESHOLD when both items are about the same
+    player. Trending entries and items with no words to compare (no
+    headline and no prose) stay alone. Items about two different known
+    players, and two different pages of the same source, are never
+    merged, not even through a third item similar to both: each cluster
+    remembers its player and its page per source, and merges that would
+    mix them are refused.
+
+    Args:
+        news_items: News items
+        signatures: Precomputed signatures (see story_signature) by item
+            index, e.g. of stories stored by an earlier run; the other
+            items' signatures are computed from their text
+
+    Returns:
+        Clusters as lists of item indices, in order of first appearance
+    """
+    n = len(news_items)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    candidates = [i for i, item in enumerate(news_items) if _is_clusterable(item)]
+    if len(candidates) > 1:
+        hasher = MinHasher()
+        known = signatures or {}
+        by_item = {i: known[i] if i in known else story_signature(news_items[i], hasher) for i in candidates}
+        # Items without any words to compare would all share the empty signature
+        candidates = [i for i in candidates if not (by_item[i] == _EMPTY).all()]
+    if len(candidates) > 1:
+        signatures = np.stack([by_item[i] for i in candidates])
+        players = [_primary_player(news_items[i]) for i in candidates]
+        headlines = [(news_items[i].get("headline") or "").lower() for i in candidates]
+
+        same_player = _entity_pairs(players, headlines)
+        # Per cluster root: its known player and its page (URL) per source
+        root_player = {i: player for i, player in zip(candidates, players)}
+        root_pages = {i: {news_items[i].get("source"): news_items[i]["url"]} if news_items[i].get("url") else {}
+                      for i in candidates}
+
+        for a, b in sorted(_candidate_pairs(signatures) | same_player):
+            if players[a] and players[b] and players[a] != players[b]:
+                continue
+            if _distinct_pages(news_items[candidates[a]], news_items[candidates[b]]):
+                continue
+            similarity = float(np.mean(signatures[a] == signatures[b]))
+            threshold = CLUSTER_ENTITY_SIMILARITY_THRESHOLD if (a, b) in same_player else CLUSTER_SIMILARITY_THRESHOLD
+            if similarity < threshold:
+                continue
+            root_a, root_b = find(candidates[a]), find(candidates[b])
+            if root_a == root_b:
+                continue
+            player_a, player_b = root_player[root_a], root_player[root_b]
+            if player_a and player_b and player_a != player_b:
+                continue
+            pages_a, pages_b = root_pages[root_a], root_pages[root_b]
+            if any(pages_a[source] != url for source, url in pages_b.items() if source in pages_a):
+                continue
+            root, child = min(root_a, root_b), max(root_a, root_b)
+            parent[child] = root
+            root_player[root] = player_a or player_b
+            root_pages[root] = {**pages_a, **pages_b}
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+
+def cluster_stories(news_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse each story to one representative item.
+
+    The representative is the cluster's highest-scoring item (see
+    score_news_batch). It gains cluster_size, cluster_sources (items per
+    source) and, when other items were folded into it, related_headlines.
+    Items that cluster alone are returned unchanged.
+
+    Args:
+        news_items: News items
+
+    Returns:
+        One item per story, in order of each story's first appearance
+    """
+    if not news_items:
+        return []
+    clusters = find_story_clusters(news_items)
+    if len(clusters) == len(news_items):
+        return list(news_items)
+
+    scores = score_news_batch(news_items)
+    stories = []
+    for members in clusters:
+        if len(members) == 1:
+            stories.append(news_items[members[0]])
+            continue
+        best = max(members, key=lambda i: (scores[i], -i))
+        representative = news_items[best]
+        sources: Dict[str, int] = {}
+        for i in members:
+            source = news_items[i].get("source", "unknown")
+            sources[source] = sources.get(source, 0) + 1
+        representative["cluster_size"] = len(members)
+        representative["cluster_sources"] = sources
+        representative["related_headlines"] = [
+            news_items[i].get("headline", "") for i in members if i != best
+        ]
+        stories.append(representative)
+    return stories
@@ -0,0 +1,158 @@
+"""Vectorized anomaly scoring for Sleeper trending add/drop counts."""
+
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from .config import (
+    TREND_EWMA_ALPHA,
+    TREND_COHORT_WEIGHT,
+    TREND_ANOMALY_MIN_POLLS,
+    TREND_ANOMALY_HISTORY_POLLS,
+)
+from .trend_store import TrendStore
+
+
+def ewma_baseline(history: np.ndarray, alpha: float = TREND_EWMA_ALPHA):
+    """
+    Compute exponentially weighted mean and standard deviation per row.
+
+    Args:
+        history: players x polls matrix of past counts (oldest poll first)
+        alpha: EWMA smoothing factor; higher weights recent polls more
+
+    Returns:
+        Tuple of (mean, std) arrays, one value per player
+    """
+    n_polls = history.shape[1]
+    weights = alpha * (1 - alpha) ** np.arange(n_polls - 1, -1, -1, dtype=np.float64)
+    weights /= weights.sum()
+
+    mean = history @ weights
+    var = ((history - mean[:, None]) ** 2) @ weights
+    return mean, np.sqrt(var)
+
+
+def cohort_zscores(values: np.ndarray, cohorts: np.ndarray) -> np.ndarray:
+    """
+    Z-score each value against the other members of its cohort.
+
+    Args:
+        values: One value per player
+        cohorts: Cohort label per player (e.g. position)
+
+    Returns:
+        Array of z-scores, 0 for single-member cohorts
+    """
+    labels, inverse = np.unique(cohorts, return_inverse=True)
+    sizes = np.bincount(inverse, minlength=len(labels)).astype(np.float64)
+    sums = np.bincount(inverse, weights=values, minlength=len(labels))
+    sq_sums = np.bincount(inverse, weights=values ** 2, minlength=len(labels))
+
+    means = sums / sizes
+    stds = np.sqrt(np.maximum(sq_sums / sizes - means ** 2, 0.0))
+    stds[stds == 0] = np.inf
+    return (values - means[inverse]) / stds[inverse]
+
+
+def score_trend_anomalies(counts: np.ndarray, cohorts: np.ndarray,
+                          alpha: float = TREND_EWMA_ALPHA,
+                          cohort_weight: float = TREND_COHORT_WEIGHT) -> np.ndarray:
+    """
+    Score how unusual each player's latest trending count is.
+
+    The latest poll is compared against the player's own EWMA baseline
+    (z-score), and the player's excess over that baseline is compared
+    against the rest of their position cohort. Players who are always
+    heavily added have a high baseline and so score low.
+
+    Args:
+        counts: players x polls matrix of counts (latest poll last)
+        cohorts: Cohort label per player (e.g. position)
+        alpha: EWMA smoothing factor
+        cohort_weight: Weight of the cohort z-score (own history gets 1 - weight)
+
+    Returns:
+        Anomaly score per player
+    """
+    latest = counts[:, -1]
+    mean, std = ewma_baseline(counts[:, :-1], alpha)
+
+    # Poisson-style floor so a flat history of small counts can't explode the z-score
+    own_z = (latest - mean) / np.maximum(std, np.sqrt(mean) + 1.0)
+
+    excess = np.log1p(latest) - np.log1p(mean)
+    cohort_z = cohort_zscores(excess, cohorts)
+
+    return (1 - cohort_weight) * own_z + cohort_weight * cohort_z
+
+
+def top_k_anomalies(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Get the indices of the K highest scores, highest first.
+
+    Args:
+        scores: Score per player
+        k: Number of indices to return
+
+    Returns:
+        Array of indices into scores
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    top = np.argpartition(scores, -k)[-k:]
+    return top[np.argsort(scores[top])[::-1]]
+
+
+def select_trending_players(store: TrendStore, trend_type: str, trends: List[Dict[str, Any]],
+                            player_details: Dict[str, Any], limit: int,
+                            history_polls: Optional[int] = TREND_ANOMALY_HISTORY_POLLS) -> List[Dict[str, Any]]:
+    """
+    Pick the trending players worth reporting from the latest poll.
+
+    With enough history, players are ranked by anomaly score; otherwise
+    this falls back to the raw counts in Sleeper's order.
+
+    Args:
+        store: Trend store that already contains the latest poll
+        trend_type: Either "add" or "drop"
+        trends: The latest Sleeper trending entries
+        player_details: Dictionary mapping player_id to player details
+        limit: Number of players to return
+        history_polls: How many past polls to use as the baseline
+
+    Returns:
+        Trending entries ({"player_id", "count", "anomaly_score"}), best first;
+        empty if the latest poll returned nothing
+    """
+    if not trends:
+        # A failed or empty poll adds nothing to the store, so its newest
+        # column is still the previous poll's list
+        return []
+
+    poll_times, counts = store.matrix(trend_type, max_polls=history_polls)
+    if len(poll_times) < TREND_ANOMALY_MIN_POLLS:
+        return trends[:limit]
+
+    player_ids = store.player_ids
+    positions = np.array([
+        (player_details.get(pid) or {}).get("position") or "Unknown" for pid in player_ids
+    ])
+
+    scores = score_trend_anomalies(counts, positions)
+    # Only players on this poll's trending list are candidates, with its counts
+    latest = {str(trend["player_id"]): int(trend.get("count", 0)) for trend in trends}
+    scores[~np.isin(np.array(player_ids, dtype=object), list(latest))] = -np.inf
+
+    selected = []
+    for idx in top_k_anomalies(scores, limit):
+        if not np.isfinite(scores[idx]):
+            break
+        selected.append({
+            "player_id": player_ids[idx],
+            "count": latest[player_ids[idx]],
+            "anomaly_score": round(float(scores[idx]), 2),
+        })
+    return selected
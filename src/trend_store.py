@@ -0,0 +1,239 @@
+"""Append-only time-series store for Sleeper trending add/drop counts."""
+
+import json
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .config import TREND_STORE_DIR, SLEEPER_TRENDING_LOOKBACK_HOURS
+from .run_coordination import atomic_write_json, lease
+
+
+# One fixed-width record per (poll, player, trend type)
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<i8"),  # Poll time, seconds since epoch
+    ("player", "<i4"),     # Index into the player ID table
+    ("kind", "i1"),        # Index into TREND_KINDS
+    ("count", "<i4"),      # Adds/drops in the lookback window
+])
+
+TREND_KINDS = ["add", "drop"]
+
+
+class TrendStore:
+    """
+    Compact, array-backed history of every Sleeper trending poll.
+
+    Records are appended to a flat binary file and read back as a single
+    NumPy structured array, so range queries are vectorized masks rather
+    than reparsing logs. Player IDs are mapped to integer indices in a
+    sidecar JSON file.
+    """
+
+    def __init__(self, directory: str = TREND_STORE_DIR):
+        self.directory = directory
+        self.records_file = os.path.join(directory, "trends.bin")
+        self.players_file = os.path.join(directory, "players.json")
+        self._player_ids: List[str] = []
+        self._player_index: Dict[str, int] = {}
+        self._records = np.empty(0, dtype=RECORD_DTYPE)
+        self._records_size = -1
+        self._load_players()
+
+    def _load_players(self):
+        """Load the player ID table from disk."""
+        if os.path.exists(self.players_file):
+            with open(self.players_file, 'r', encoding='utf-8') as f:
+                self._player_ids = json.load(f)
+            self._player_index = {pid: i for i, pid in enumerate(self._player_ids)}
+
+    def _save_players(self):
+        """Save the player ID table to disk."""
+        atomic_write_json(self.players_file, self._player_ids)
+
+    def _player_idx(self, player_id: str) -> int:
+        """Get (or assign) the integer index for a player ID."""
+        idx = self._player_index.get(player_id)
+        if idx is None:
+            idx = len(self._player_ids)
+            self._player_ids.append(player_id)
+            self._player_index[player_id] = idx
+        return idx
+
+    @property
+    def records(self) -> np.ndarray:
+        """All records, reloaded only when the file has grown."""
+        size = os.path.getsize(self.records_file) if os.path.exists(self.records_file) else 0
+        if size != self._records_size:
+            if size:
+                self._load_players()
+                self._records = np.fromfile(self.records_file, dtype=RECORD_DTYPE)
+            else:
+                self._records = np.empty(0, dtype=RECORD_DTYPE)
+            self._records_size = size
+        return self._records
+
+    @property
+    def player_ids(self) -> List[str]:
+        """Player IDs in index order."""
+        return self._player_ids
+
+    def append_poll(self, trend_type: str, trends: List[Dict[str, Any]],
+                    timestamp: Optional[float] = None) -> int:
+        """
+        Append one poll's full trending results.
+
+        Args:
+            trend_type: Either "add" or "drop"
+            trends: Sleeper trending entries ({"player_id": ..., "count": ...})
+            timestamp: Poll time in seconds since epoch (defaults to now)
+
+        Returns:
+            Number of records appended
+        """
+        if not trends:
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        kind = TREND_KINDS.index(trend_type)
+        poll_time = int(timestamp if timestamp is not None else time.time())
+
+        # Other processes append too: reload their player indices before
+        # assigning new ones, and write table and records under one lock
+        # The lock lives with the store, so stores in different directories don't contend
+        with lease("trend_store", directory=self.directory):
+            self._load_players()
+            batch = np.empty(len(trends), dtype=RECORD_DTYPE)
+            batch["timestamp"] = poll_time
+            batch["player"] = [self._player_idx(str(t["player_id"])) for t in trends]
+            batch["kind"] = kind
+            batch["count"] = [int(t.get("count", 0)) for t in trends]
+
+            # Player table first, so every appended record resolves to an ID
+            self._save_players()
+            with open(self.records_file, 'ab') as f:
+                batch.tofile(f)
+
+        return len(batch)
+
+    def series(self, player_id: str, trend_type: str,
+               since: Optional[float] = None, until: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get one player's trend counts over a time range.
+
+        Args:
+            player_id: Sleeper player ID
+            trend_type: Either "add" or "drop"
+            since: Optional start time (seconds since epoch, inclusive)
+            until: Optional end time (seconds since epoch, inclusive)
+
+        Returns:
+            Tuple of (timestamps, counts) arrays ordered by time
+        """
+        records = self.records
+        idx = self._player_index.get(str(player_id))
+        if idx is None or not len(records):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+
+        mask = (records["player"] == idx) & (records["kind"] == TREND_KINDS.index(trend_type))
+        if since is not None:
+            mask &= records["timestamp"] >= since
+        if until is not None:
+            mask &= records["timestamp"] <= until
+
+        selected = records[mask]
+        return selected["timestamp"], selected["count"]
+
+    def rate_per_hour(self, player_id: str, trend_type: str, days: float = 3,
+                      now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a player's adds/drops per hour at each poll over the last few days.
+
+        Args:
+            player_id: Sleeper player ID
+            trend_type: Either "add" or "drop"
+            days: How far back to look
+            now: Reference time (defaults to now)
+
+        Returns:
+            Tuple of (timestamps, rate per hour) arrays
+        """
+        now = now if now is not None else time.time()
+        timestamps, counts = self.series(player_id, trend_type, since=now - days * 86400)
+        return timestamps, counts / float(SLEEPER_TRENDING_LOOKBACK_HOURS)
+
+    def matrix(self, trend_type: str, max_polls: Optional[int] = None,
+               since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get trend counts for every player as a dense players x polls matrix.
+
+        Players absent from a poll's trending list get a count of 0.
+
+        Args:
+            trend_type: Either "add" or "drop"
+            max_polls: Keep only the most recent N polls
+            since: Optional start time (seconds since epoch)
+
+        Returns:
+            Tuple of (poll timestamps, counts[len(player_ids), n_polls])
+        """
+        records = self.records
+        mask = records["kind"] == TREND_KINDS.index(trend_type)
+        if since is not None:
+            mask &= records["timestamp"] >= since
+        selected = records[mask]
+
+        poll_times, poll_idx = np.unique(selected["timestamp"], return_inverse=True)
+        if max_polls is not None and len(poll_times) > max_polls:
+            offset = len(poll_times) - max_polls
+            keep = poll_idx >= offset
+            selected, poll_idx = selected[keep], poll_idx[keep] - offset
+            poll_times = poll_times[offset:]
+
+        counts = np.zeros((len(self._player_ids), len(poll_times)), dtype=np.float64)
+        counts[selected["player"], poll_idx] = selected["count"]
+        return poll_times, counts
+
+    def dynamics(self, trend_type: str) -> Dict[str, Tuple[float, float]]:
+        """
+        Get per-player velocity and acceleration over the last three polls.
+
+        Velocity is the change in the trending count per hour between the
+        last two polls; acceleration is the change in velocity per hour.
+
+        Args:
+            trend_type: Either "add" or "drop"
+
+        Returns:
+            Dictionary mapping player_id to (velocity, acceleration)
+        """
+        poll_times, counts = self.matrix(trend_type, max_polls=3)
+        if len(poll_times) < 2:
+            return {}
+
+        hours = np.diff(poll_times) / 3600.0
+        hours[hours == 0] = np.nan
+        velocity = np.diff(counts, axis=1) / hours
+        acceleration = np.zeros(len(counts))
+        if velocity.shape[1] == 2:
+            acceleration = np.diff(velocity, axis=1)[:, 0] / hours[-1]
+
+        latest_velocity = np.nan_to_num(velocity[:, -1])
+        acceleration = np.nan_to_num(acceleration)
+        return {
+            pid: (float(latest_velocity[i]), float(acceleration[i]))
+            for i, pid in enumerate(self._player_ids)
+        }
+
+
+_store: Optional[TrendStore] = None
+
+
+def get_trend_store() -> TrendStore:
+    """Get the process-wide trend store."""
+    global _store
+    if _store is None:
+        _store = TrendStore()
+    return _store
@@ -0,0 +1,235 @@
+"""Per-user watchlists: route each news item to the users watching its players or teams."""
+
+import json
+import os
+import re
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+from .config import WATCHLISTS_FILE, WATCHLIST_OUTPUT_DIR
+from .digest_renderer import DigestModel, digest_entry, render_digest, simple_digest_section
+from .keyword_matcher import KeywordMatcher
+from .run_coordination import atomic_write
+
+
+class WatchlistIndex:
+    """
+    Inverted index from watched players and teams to the users watching them.
+
+    Entities are keyed "player:<Sleeper ID>" and "team:<abbreviation>".
+    Each news item is matched once: its structured player ID when it has
+    one, otherwise the player names in its player_name and headline (a
+    KeywordMatcher over every rostered player and every team), plus its
+    team and the team names in those fields. The item's primary player's
+    news also counts as news about their team. The matched entities are
+    then looked up in the index, so routing costs one scan per item plus
+    one set per matched entity, however many users there are and however
+    long their lists.
+    """
+
+    def __init__(self, players: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            players: Sleeper player table (player_id -> details), as from
+                fetch_sleeper_player_details(); its DEF entries name the teams
+        """
+        self.players = players
+        self.subscribers: Dict[str, Set[str]] = defaultdict(set)
+        self.watchlists: Dict[str, Set[str]] = {}
+        self._ids_by_name: Dict[str, List[str]] = defaultdict(list)
+        names: Dict[str, List[str]] = {}
+        for pid, player in players.items():
+            team = player.get("team")
+            if not team:
+                continue
+            if player.get("position") == "DEF":
+                names[f"team:{team}"] = [_full_name(player), player.get("last_name") or ""]
+            elif _full_name(player):
+                names[f"player:{pid}"] = [_full_name(player)]
+                self._ids_by_name[_full_name(player).lower()].append(pid)
+        # No names (an empty player table) means only structured fields can match
+        self.matcher: Optional[KeywordMatcher] = None
+        if names:
+            self.matcher = KeywordMatcher({entity: [term for term in terms if term] for entity, terms in names.items()})
+        self.teams = {entity.split(":", 1)[1] for entity in names if entity.startswith("team:")}
+
+    def subscribe(self, user: str, players: Iterable[str] = (), teams: Iterable[str] = ()) -> List[str]:
+        """
+        Add players and teams to a user's watchlist.
+
+        Args:
+            user: User ID
+            players: Sleeper player IDs or full names (a name shared by
+                several players watches all of them)
+            teams: Team abbreviations (e.g. "KC")
+
+        Returns:
+            The players and teams that couldn't be resolved
+        """
+        entities, unresolved = set(), []
+        for player in players:
+            pids = [player] if player in self.players else self._ids_by_name.get(" ".join(player.lower().split()), [])
+            entities.update(f"player:{pid}" for pid in pids)
+            if not pids:
+                unresolved.append(player)
+        for team in teams:
+            if team.upper() in self.teams:
+                entities.add(f"team:{team.upper()}")
+            else:
+                unresolved.append(team)
+
+        self.watchlists.setdefault(user, set()).update(entities)
+        for entity in entities:
+            self.subscribers[entity].add(user)
+        return unresolved
+
+    def unsubscribe(self, user: str):
+        """Remove a user and their whole watchlist."""
+        for entity in self.watchlists.pop(user, ()):
+            watchers = self.subscribers.get(entity)
+            if watchers is not None:
+                watchers.discard(user)
+                if not watchers:
+                    del self.subscribers[entity]
+
+    def entities(self, item: Dict[str, Any]) -> Set[str]:
+        """
+        Find every player and team a news item is about.
+
+        Args:
+            item: News item
+
+        Returns:
+            Entity keys ("player:<id>", "team:<abbreviation>")
+        """
+        team = item.get("team")
+        found = {f"team:{team}"} if team in self.teams else set()
+        players: List[str] = []
+        if self.matcher is not None:
+            # Article bodies name far too many players to route on; the
+            # player_name field and the headline say who the item is about
+            for text in (item.get("player_name"), item.get("headline")):
+                for term in self.matcher.terms_found(text or ""):
+                    labels = self.matcher.term_labels[term]
+                    found.update(label for label in labels if label.startswith("team:"))
+                    pids = [label[7:] for label in labels if label.startswith("player:")]
+                    if len(pids) > 1:
+                        # Several players share the name: only the one on the item's team qualifies
+                        pids = [pid for pid in pids if self.players[pid].get("team") == team]
+                    if len(pids) == 1 and pids[0] not in players:
+                        players.append(pids[0])
+        if item.get("player_id") in self.players:
+            players = [item["player_id"]]
+
+        found.update(f"player:{pid}" for pid in players)
+        if players and self.players[players[0]].get("team"):
+            found.add(f"team:{self.players[players[0]]['team']}")
+        return found
+
+    def match(self, item: Dict[str, Any]) -> Set[str]:
+        """
+        Find the users watching anything a news item is about.
+
+        Args:
+            item: News item
+
+        Returns:
+            User IDs
+        """
+        subscribers = self.subscribers
+        watchers = [subscribers[entity] for entity in self.entities(item) if entity in subscribers]
+        return set().union(*watchers)
+
+    def route(self, news_items: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Split news items into per-user lists.
+
+        Args:
+            news_items: News items (any iterable)
+
+        Returns:
+            Dictionary mapping user ID to their matching items, in input order
+            (users with no matches are absent)
+        """
+        routes: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for item in news_items:
+            for user in self.match(item):
+                routes[user].append(item)
+        return dict(routes)
+
+    @classmethod
+    def load(cls, players: Dict[str, Dict[str, Any]], path: str = WATCHLISTS_FILE) -> "WatchlistIndex":
+        """
+        Build the index from a watchlists file.
+
+        Args:
+            players: Sleeper player table
+            path: JSON file mapping user ID to {"players": [...], "teams": [...]}
+
+        Returns:
+            WatchlistIndex with every user subscribed (empty if the file is missing or unreadable)
+        """
+        index = cls(players)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                watchlists = json.load(f)
+        except FileNotFoundError:
+            print(f"No watchlists file found at {path}")
+            return index
+        except (OSError, ValueError) as e:
+            print(f"Error loading watchlists: {e}")
+            return index
+
+        for user, watchlist in watchlists.items():
+            unresolved = index.subscribe(str(user), watchlist.get("players", []), watchlist.get("teams", []))
+            if unresolved:
+                print(f"  Watchlist of {user}: unknown players/teams {', '.join(unresolved)}")
+        return index
+
+
+def write_watchlist_digests(routes: Dict[str, List[Dict[str, Any]]], filename: str,
+                            digest_format: str = "markdown", output_dir: str = WATCHLIST_OUTPUT_DIR) -> int:
+    """
+    Write each user's matching items as a simple digest.
+
+    Each item's digest entry (including its article summary) is built once
+    and shared by every user who receives it.
+
+    Args:
+        routes: User ID -> news items, from WatchlistIndex.route()
+        filename: File name for each digest (e.g. the main digest's)
+        digest_format: "markdown", "html" or "json"
+        output_dir: Folder holding one subfolder per user
+
+    Returns:
+        Number of digests written
+    """
+    written = 0
+    entries: Dict[int, Optional[Tuple[str, List[Any]]]] = {}
+    for user, items in routes.items():
+        directory = os.path.join(output_dir, _safe_filename(user))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with DigestModel() as model:
+                for item in items:
+                    # The routes hold every item, so id() is stable for the whole loop
+                    if id(item) not in entries:
+                        section = simple_digest_section(item)
+                        entries[id(item)] = (section, digest_entry(item, section)) if section else None
+                    if entries[id(item)] is not None:
+                        model.add(*entries[id(item)])
+                with atomic_write(os.path.join(directory, filename)) as f:
+                    for chunk in render_digest(model, digest_format):
+                        f.write(chunk)
+            written += 1
+        except OSError as e:
+            print(f"Error writing watchlist digest for {user}: {e}")
+    return written
+
+
+def _full_name(player: Dict[str, Any]) -> str:
+    return f"{player.get('first_name') or ''} {player.get('last_name') or ''}".strip()
+
+
+def _safe_filename(user: str) -> str:
+    return re.sub(r"[^\w.-]", "_", user) or "_"
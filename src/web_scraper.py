@@ -1,10 +1,10 @@
 """Web scraper for FantasyPros articles."""
 
-import requests
 import time
 import os
 import re
 import json
+import threading
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
@@ -16,6 +16,9 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
+from .config import HTTP_USER_AGENT
+from .http_clients import get_session
+from .run_coordination import atomic_write, lease
 
 
 class FantasyProsScraper:
@@ -23,10 +26,7 @@ class FantasyProsScraper:
     
     def __init__(self, base_url: str = "https://www.fantasypros.com/nfl/"):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session = get_session("fantasypros")
         self.articles_dir = "scraped_articles"
         self.scraped_urls_file = "scraped_urls.json"
         self.section_mapping = {
@@ -60,15 +60,25 @@ class FantasyProsScraper:
             print("No previous scraped URLs found, starting fresh")
     
     def _save_scraped_urls(self):
-        """Save scraped URLs to file."""
+        """
+        Save scraped URLs to file.
+
+        Other scrapers may have saved URLs since this one loaded the file,
+        so under the file's lock the saved URLs are merged in before the
+        file is replaced.
+        """
         try:
-            data = {
-                'urls': list(self.scraped_urls),
-                'last_updated': datetime.now().isoformat(),
-                'total_urls': len(self.scraped_urls)
-            }
-            with open(self.scraped_urls_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            with lease("scraped_urls"):
+                if os.path.exists(self.scraped_urls_file):
+                    with open(self.scraped_urls_file, 'r', encoding='utf-8') as f:
+                        self.scraped_urls.update(json.load(f).get('urls', []))
+                data = {
+                    'urls': list(self.scraped_urls),
+                    'last_updated': datetime.now().isoformat(),
+                    'total_urls': len(self.scraped_urls)
+                }
+                with atomic_write(self.scraped_urls_file) as f:
+                    json.dump(data, f, indent=2)
         except Exception as e:
             print(f"Error saving scraped URLs: {e}")
     
@@ -88,7 +98,7 @@ class FantasyProsScraper:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        chrome_options.add_argument(f"--user-agent={HTTP_USER_AGENT}")
         
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=chrome_options)
@@ -516,7 +526,7 @@ class FantasyProsScraper:
             date_dir = os.path.join(section_dir, date_folder)
             
             if not os.path.exists(date_dir):
-                os.makedirs(date_dir)
+                os.makedirs(date_dir, exist_ok=True)
                 print(f"Created directory: {date_dir}")
             
             # Create safe filename from title
@@ -529,7 +539,7 @@ class FantasyProsScraper:
             filename = f"{safe_title}_{timestamp}.txt"
             filepath = os.path.join(date_dir, filename)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with atomic_write(filepath) as f:
                 f.write(f"Title: {article_data.get('title', 'N/A')}\n")
                 f.write(f"Author: {article_data.get('author', 'N/A')}\n")
                 f.write(f"Date: {article_data.get('date', 'N/A')}\n")
@@ -700,3 +710,16 @@ class FantasyProsScraper:
         # This could be enhanced to clean old URLs based on timestamps
         # For now, we'll keep all URLs to avoid re-scraping
         print(f"URL cleaning not implemented yet - keeping all {len(self.scraped_urls)} URLs")
+
+
+_scraper: Optional[FantasyProsScraper] = None
+_scraper_lock = threading.Lock()
+
+
+def get_fantasypros_scraper() -> FantasyProsScraper:
+    """Get the process-wide scraper, so its scraped-URL set is loaded only once."""
+    global _scraper
+    with _scraper_lock:
+        if _scraper is None:
+            _scraper = FantasyProsScraper()
+        return _scraper
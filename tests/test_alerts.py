@@ -0,0 +1,127 @@
+"""Tests for the real-time alert monitor."""
+
+import json
+
+from src.alerts import AlertLog, AlertMonitor, LatencyHistogram
+
+LISTING = """<html><body>
+<a href="/nfl/news/">All news</a>
+<a href="/nfl/news/111/brock-bowers-injury.php">Brock Bowers (hamstring) ruled out for Week 6</a>
+<a href="/nfl/news/112/jayden-reed-notes.php">Jayden Reed catches passes in walkthrough session</a>
+{extra}
+</body></html>"""
+
+PLAYERS = {
+    "4866": {"first_name": "Brock", "last_name": "Bowers", "team": "LV", "position": "TE",
+             "status": "Active", "injury_status": None},
+    "9488": {"first_name": "Jaxon", "last_name": "Smith-Njigba", "team": "SEA", "position": "WR",
+             "status": "Active", "injury_status": None},
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Serves a mutable body per URL path, honouring If-None-Match like a real server."""
+
+    def __init__(self):
+        self.bodies = {}
+        self.requests = []
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append((url, dict(headers or {})))
+        path = url.split(".com", 1)[-1].split("/v1", 1)[-1]
+        body = self.bodies[path]
+        etag = f'"{hash(body)}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, body, {"ETag": etag})
+
+
+def cached_player_table(session):
+    """Stands in for the shared player cache: the same dict until the table changes."""
+    cache = {}
+
+    def player_table():
+        body = session.bodies["/players/nfl"]
+        if cache.get("body") != body:
+            cache.update(body=body, players=json.loads(body))
+        return cache["players"]
+    return player_table
+
+
+def make_monitor(tmp_path, session, **kwargs):
+    emitted = []
+    monitor = AlertMonitor(AlertLog(str(tmp_path / "alerts.jsonl")), sinks=[emitted.append],
+                           sleeper_session=session, news_session=session,
+                           player_table=cached_player_table(session), **kwargs)
+    return monitor, emitted
+
+
+def test_news_and_status_alerts_after_baseline(tmp_path):
+    """Test that only new categorized headlines and real status changes alert, once each."""
+    session = FakeSession()
+    session.bodies["/players/nfl"] = json.dumps(PLAYERS).encode()
+    session.bodies["/nfl/news/"] = LISTING.format(extra="").encode()
+    monitor, emitted = make_monitor(tmp_path, session)
+
+    assert monitor.poll_players() == [] and monitor.poll_news() == []
+
+    session.bodies["/nfl/news/"] = LISTING.format(
+        extra='<a href="/nfl/news/113/jsn.php">Jaxon Smith-Njigba placed on injured reserve</a>'
+              '<a href="/nfl/news/114/x.php">Week 6 start/sit advice for every game</a>').encode()
+    baseline_started = monitor._poll_started["news"]
+    [news] = monitor.poll_news()
+    assert (news["kind"], news["player"], news["team"]) == ("injury", "Jaxon Smith-Njigba", "SEA")
+    # Without Last-Modified, the headline may have appeared any time since the previous poll
+    assert news["observed_at"] == baseline_started <= monitor._poll_started["news"]
+    assert news["url"] == "https://www.fantasypros.com/nfl/news/113/jsn.php"
+
+    players = json.loads(json.dumps(PLAYERS))
+    players["4866"]["injury_status"] = "Out"
+    session.bodies["/players/nfl"] = json.dumps(players).encode()
+    [status] = monitor.poll_players()
+    assert status["kind"] == "status_change" and status["headline"] == "injury none -> Out"
+
+    # An unrefreshed player table and an unchanged listing (revalidated with a 304) raise nothing
+    assert monitor.poll_players() == [] and monitor.poll_news() == []
+    assert monitor.news.not_modified == 1 and session.requests[-1][1].get("If-None-Match")
+    assert not any(url.endswith("/players/nfl") for url, _ in session.requests)
+    assert len(emitted) == 2 and monitor.detection_latency.total == 2
+
+    # A restarted monitor remembers what was already raised
+    restarted, emitted = make_monitor(tmp_path, session, news_baseline=False)
+    restarted.poll_players()
+    assert [a["url"] for a in restarted.poll_news()] == ["https://www.fantasypros.com/nfl/news/111/brock-bowers-injury.php"]
+
+
+def test_trending_spikes_realert_at_each_doubling(tmp_path):
+    """Test the spike threshold and that a climbing count alerts again only after doubling."""
+    session = FakeSession()
+    session.bodies["/players/nfl"] = json.dumps(PLAYERS).encode()
+    session.bodies["/players/nfl/trending/drop"] = b"[]"
+    monitor, _ = make_monitor(tmp_path, session)
+    monitor.poll_players()
+
+    counts = []
+    for count in (400, 1200, 1900, 2100, 4500):
+        session.bodies["/players/nfl/trending/add"] = json.dumps([{"player_id": "4866", "count": count}]).encode()
+        counts += [a["trend_count"] for a in monitor.poll_trending()]
+    assert counts == [1200, 2100, 4500]
+
+
+def test_latency_histogram_percentiles():
+    """Test bucketed percentiles and the overflow bucket."""
+    histogram = LatencyHistogram()
+    for seconds in [0.05] * 90 + [3] * 9 + [2000]:
+        histogram.record(seconds)
+    assert (histogram.percentile(50), histogram.percentile(95), histogram.percentile(100)) == (0.1, 5, 2000)
+    assert histogram.summary().startswith("n=100  p50<=0.1s")
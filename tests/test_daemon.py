@@ -0,0 +1,51 @@
+"""Tests for the daemon-mode scheduler."""
+
+import random
+
+from src.daemon import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_jobs_run_on_their_own_intervals():
+    """Test that each job runs when due and is rescheduled from when it finishes."""
+    clock = FakeClock()
+    scheduler = Scheduler(jitter_ratio=0, clock=clock)
+    runs = []
+    scheduler.add("digest", 60, lambda: runs.append(("digest", clock.now)))
+    scheduler.add("poll", 25, lambda: runs.append(("poll", clock.now)), first_delay=25)
+
+    for clock.now in range(0, 121, 5):
+        scheduler.run_due()
+
+    assert runs == [("digest", 0), ("poll", 25), ("poll", 50), ("digest", 60),
+                    ("poll", 75), ("poll", 100), ("digest", 120)]
+    assert scheduler.seconds_until_next() == 5
+
+
+def test_jitter_stays_within_ratio_and_failures_keep_schedule():
+    """Test that jittered waits stay in range and a failing job still runs again."""
+    clock = FakeClock()
+    scheduler = Scheduler(jitter_ratio=0.1, clock=clock, rng=random.Random(7))
+    delays = [scheduler.next_delay(100) for _ in range(200)]
+    assert all(90 <= d <= 110 for d in delays)
+    assert max(delays) - min(delays) > 10
+
+    calls = []
+
+    def flaky():
+        calls.append(clock.now)
+        raise RuntimeError("source down")
+
+    scheduler.add("flaky", 100, flaky)
+    scheduler.run_due()
+    clock.now = 111
+    scheduler.run_due()
+
+    assert len(calls) == 2
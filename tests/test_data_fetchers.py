@@ -1,8 +1,11 @@
 """Tests for data fetching functionality."""
 
+import time
 import pytest
 from unittest.mock import patch, Mock
-from src.data_fetchers import fetch_sleeper_news, fetch_fantasypros_news, fetch_all_news
+from src.data_fetchers import (
+    fetch_sleeper_news, fetch_fantasypros_news, fetch_all_news, iter_fantasypros_news, run_concurrently,
+)
 
 
 def test_fetch_sleeper_news():
@@ -76,3 +79,44 @@ def test_fetch_all_news():
     assert isinstance(news, list)
     # Should have at least Sleeper news (our placeholder)
     assert len(news) >= 1
+
+
+def test_run_concurrently_returns_partial_results():
+    """Test that a slow or failing task doesn't block or break the others."""
+    def slow():
+        time.sleep(1)
+        return ["late"]
+    
+    def broken():
+        raise RuntimeError("source down")
+    
+    start = time.monotonic()
+    results = run_concurrently(
+        {"fast": lambda: ["item"], "slow": slow, "broken": broken},
+        timeouts={"slow": 0.1},
+    )
+    
+    assert results == {"fast": ["item"]}
+    assert time.monotonic() - start < 0.9
+
+
+def test_fantasypros_scrape_skipped_while_previous_one_runs(monkeypatch):
+    """Test that a second scrape falls back to saved articles while the first is unfinished."""
+    scrapes = []
+    scraper = Mock()
+    scraper.scrape_fantasypros_articles.side_effect = lambda max_articles: scrapes.append(1) or [
+        {"title": "Scraped", "url": "https://example.com/a"}, {"title": "Scraped 2", "url": "https://example.com/b"}]
+    monkeypatch.setattr("src.web_scraper.get_fantasypros_scraper", lambda: scraper)
+    monkeypatch.setattr("src.data_fetchers.iter_existing_scraped_articles",
+                        lambda date: iter([{"title": "Saved", "url": "https://example.com/c"}]))
+    monkeypatch.setattr("src.data_fetchers.article_to_news_item", lambda article: article["title"])
+    
+    # The first scrape is still being consumed (e.g. by an abandoned source thread)
+    running = iter_fantasypros_news()
+    assert next(running) == "Scraped"
+    assert list(iter_fantasypros_news()) == ["Saved"]
+    assert len(scrapes) == 1
+    
+    running.close()
+    assert list(iter_fantasypros_news()) == ["Scraped", "Scraped 2"]
+    assert len(scrapes) == 2
@@ -0,0 +1,62 @@
+"""Tests for progressive digest writing."""
+
+import src.digest_formatter as formatter
+from src.digest_formatter import write_digest_progressive
+
+
+def test_progressive_write_renames_when_complete(tmp_path, monkeypatch):
+    """Test that a complete stream lands at the digest path with no partial left."""
+    monkeypatch.setattr(formatter, "OUTPUT_DIR", str(tmp_path))
+    chunks = ["# Dig", "est\n\nIntro\n\n#", "# Injuries\n- A is out\n", "\n## Pickups\n- B"]
+    
+    path = write_digest_progressive(chunks)
+    
+    assert open(path, encoding="utf-8").read() == "".join(chunks)
+    assert not any(p.name.endswith(".partial") for p in tmp_path.iterdir())
+
+
+def test_progressive_write_keeps_partial_on_failure(tmp_path, monkeypatch):
+    """Test that finished sections survive a broken stream and the digest is not replaced."""
+    monkeypatch.setattr(formatter, "OUTPUT_DIR", str(tmp_path))
+    seen = []
+    
+    def chunks():
+        yield "# Digest\n\n## Injuries\n- A is out\n"
+        yield "\n## Pickups\n- B"
+        # The first section must already be on disk before the stream breaks
+        seen.append(open(partial, encoding="utf-8").read())
+        raise TimeoutError("read timed out")
+    
+    partial = formatter.digest_filepath() + ".partial"
+    assert write_digest_progressive(chunks()) == ""
+    
+    assert seen[0].startswith("# Digest\n\n## Injuries\n- A is out\n")
+    content = open(partial, encoding="utf-8").read()
+    assert "- B" in content
+    assert "Stream interrupted" in content and "read timed out" in content
+    # Time to first text and first section survive the failure
+    assert "first text after 0.0s, first section after 0.0s" in content
+    assert [p.name for p in tmp_path.iterdir()] == [partial.rsplit("/", 1)[-1]]
+
+
+def test_progressive_write_removes_empty_partial(tmp_path, monkeypatch):
+    """Test that a stream failing before any text leaves nothing behind."""
+    monkeypatch.setattr(formatter, "OUTPUT_DIR", str(tmp_path))
+    
+    def chunks():
+        raise RuntimeError("quota exceeded")
+        yield
+    
+    assert write_digest_progressive(chunks()) == ""
+    assert not list(tmp_path.iterdir())
+
+
+def test_simple_digest_line_notes_clustered_reports():
+    """Test that a story collapsed from several reports lists its sources."""
+    item = {"player_name": "Brock Bowers", "team": "LV", "headline": "Bowers misses practice",
+            "source": "sleeper", "cluster_size": 3, "cluster_sources": {"sleeper": 1, "fantasypros_scraped": 2}}
+    
+    line = formatter.format_simple_digest_line(item, "other_sleeper")
+    
+    assert line == "- **Brock Bowers** (LV) - Bowers misses practice _(3 reports: fantasypros_scraped 2, sleeper 1)_\n"
+    assert formatter.format_simple_digest_line({"headline": "Solo"}, "other_sleeper") == "- **Unknown** (Unknown) - Solo\n"
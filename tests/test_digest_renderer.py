@@ -0,0 +1,68 @@
+"""Tests for the multi-format digest renderer."""
+
+import json
+from datetime import datetime
+
+import src.digest_renderer as renderer
+from src.digest_renderer import DigestModel, render_digest
+
+
+ITEMS = [
+    {"source": "sleeper", "trend_type": "add", "player_name": "A <1>", "team": "KC", "trend_count": 9},
+    {"source": "sleeper", "player_name": "B", "team": "BUF", "headline": "Limited & sore",
+     "cluster_size": 2, "cluster_sources": {"sleeper": 1, "fantasypros_scraped": 1}},
+    {"source": "sleeper", "trend_type": "add", "player_name": "C", "team": "SF", "trend_count": 4},
+    {"source": "other", "headline": "Not shown"},
+]
+
+
+def render(items, digest_format):
+    with DigestModel(iter(items), date=datetime(2025, 10, 8)) as model:
+        return "".join(render_digest(model, digest_format))
+
+
+def test_markdown_groups_sections_in_order():
+    """Test that items are grouped by section, keeping arrival order inside each."""
+    assert render(ITEMS, "markdown") == (
+        "# NFL Daily Fantasy Digest — October 08, 2025\n\n"
+        "## Trending Up (Sleeper)\n\n"
+        "- **A <1>** (KC) - 9 adds in 24h\n"
+        "- **C** (SF) - 4 adds in 24h\n\n"
+        "## Other Sleeper News\n\n"
+        "- **B** (BUF) - Limited & sore _(2 reports: fantasypros_scraped 1, sleeper 1)_\n\n"
+        "*(Data aggregated from Sleeper + FantasyPros)*\n"
+    )
+
+
+def test_html_escapes_fields():
+    """Test that HTML output escapes item text."""
+    page = render(ITEMS, "html")
+
+    assert "<li><strong>A &lt;1&gt;</strong> (KC) - 9 adds in 24h</li>" in page
+    assert "Limited &amp; sore <em>(2 reports: fantasypros_scraped 1, sleeper 1)</em>" in page
+    assert page.endswith("</html>\n")
+
+
+def test_json_is_valid_across_batches(monkeypatch):
+    """Test that JSON output parses, including when sections are written in several batches."""
+    monkeypatch.setattr(renderer, "DIGEST_RENDER_BATCH", 1)
+
+    digest = json.loads(render(ITEMS, "json"))
+
+    assert digest["date"] == "2025-10-08"
+    assert digest["item_count"] == 4
+    assert [s["key"] for s in digest["sections"]] == ["trending_up", "other_sleeper"]
+    assert [i["player"] for i in digest["sections"][0]["items"]] == ["A <1>", "C"]
+    assert digest["sections"][1]["items"][0]["sources"] == {"sleeper": 1, "fantasypros_scraped": 1}
+    assert json.loads(render([], "json"))["sections"] == []
+
+
+def test_model_spills_and_renders_repeatedly(monkeypatch):
+    """Test that a spilled model renders the same output every time."""
+    monkeypatch.setattr(renderer, "DIGEST_SPOOL_BYTES", 1)
+    items = [dict(ITEMS[0], trend_count=i) for i in range(50)]
+
+    with DigestModel(items) as model:
+        first = "".join(render_digest(model, "markdown"))
+        assert "".join(render_digest(model, "markdown")) == first
+    assert first.count("adds in 24h") == 50
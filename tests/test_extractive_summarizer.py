@@ -0,0 +1,56 @@
+"""Tests for the local extractive summarizer."""
+
+import numpy as np
+
+from src.extractive_summarizer import split_sentences, summarize, textrank
+
+
+ARTICLE = """Waiver Wire Picks
+Weekly Fantasy Football Expert Rankings
+Start/Sit Advice
+It has been a strange season for fantasy managers across the league this year.
+The Ravens will lean on
+Derrick Henry
+. Henry is questionable with an ankle injury but expects to practice fully by Friday.
+Backup Justice Hill would take over the starter role and see most of the snaps if Henry sits out.
+Fans enjoyed the halftime show and the weather was mild.
+Andrew Swanson | 4 min read Fantasy Football Week 6 Running Back Rankings (2025) by
+"""
+
+
+def test_split_sentences_joins_wrapped_links():
+    """Test that link-wrapped lines are joined and nav headings split off."""
+    sentences = split_sentences(ARTICLE)
+    
+    assert sentences[:3] == ["Waiver Wire Picks", "Weekly Fantasy Football Expert Rankings", "Start/Sit Advice"]
+    assert "The Ravens will lean on Derrick Henry." in sentences
+
+
+def test_summarize_prefers_player_news_over_boilerplate():
+    """Test that injury/role sentences beat filler and navigation, in original order."""
+    summary = summarize(ARTICLE, player_name="Derrick Henry", max_sentences=2)
+    
+    assert summary == ("Henry is questionable with an ankle injury but expects to practice fully by Friday. "
+                       "Backup Justice Hill would take over the starter role and see most of the snaps if Henry sits out.")
+
+
+def test_summarize_edge_cases():
+    """Test empty text and text with no prose sentences."""
+    assert summarize("") == ""
+    assert summarize("Buy Low\nSell High") == "Buy Low"
+    assert summarize("word " * 200, max_chars=50).endswith("...")
+
+
+def test_textrank_ranks_hub_highest():
+    """Test that the sentence similar to all others ranks first."""
+    similarity = np.array([
+        [0.0, 0.5, 0.5, 0.5],
+        [0.5, 0.0, 0.0, 0.0],
+        [0.5, 0.0, 0.0, 0.1],
+        [0.5, 0.0, 0.1, 0.0],
+    ])
+    
+    rank = textrank(similarity)
+    
+    assert np.isclose(rank.sum(), 1.0)
+    assert rank.argmax() == 0
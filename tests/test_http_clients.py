@@ -0,0 +1,24 @@
+"""Tests for the shared HTTP client registry."""
+
+from src.config import HTTP_TIMEOUT_SECONDS
+from src.http_clients import get_session, close_all
+
+
+def test_get_session_is_shared_per_service():
+    """Test that each service name maps to one reused session."""
+    close_all()
+    sleeper = get_session("sleeper")
+    
+    assert get_session("sleeper") is sleeper
+    assert get_session("fantasypros") is not sleeper
+    close_all()
+
+
+def test_session_defaults():
+    """Test that sessions carry the unified timeout and headers."""
+    session = get_session("sleeper")
+    
+    assert session.timeout == HTTP_TIMEOUT_SECONDS
+    assert "User-Agent" in session.headers
+    assert session.get_adapter("https://api.sleeper.app")._pool_maxsize > 1
+    close_all()
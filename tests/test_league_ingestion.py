@@ -0,0 +1,102 @@
+"""Tests for league roster ingestion against a local fake Sleeper server."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from src.league_ingestion import LeagueRosterIngestor, LeagueAvailability
+
+
+ROSTERS = {
+    "L1": [{"players": ["100", "200"], "reserve": ["300"]}],
+    "L2": [{"players": ["200"], "taxi": None}],
+}
+
+
+class FakeSleeperHandler(BaseHTTPRequestHandler):
+    """Serves /v1/league/<id>/rosters with ETag support."""
+    
+    requests_seen = []
+    
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        league_id = parts[2] if len(parts) == 4 else None
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        
+        if league_id not in ROSTERS:
+            self.send_response(404)
+            self.end_headers()
+            return
+        
+        etag = f'"{league_id}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        
+        body = json.dumps(ROSTERS[league_id]).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_sleeper():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSleeperHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    FakeSleeperHandler.requests_seen = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_ingest_builds_availability(fake_sleeper):
+    """Test concurrent ingestion and vectorized availability filtering."""
+    ingestor = LeagueRosterIngestor(base_url=fake_sleeper, cache_file=None)
+    availability = ingestor.ingest(["L1", "L2", "missing"])
+    
+    assert availability.league_ids == ["L1", "L2"]
+    assert list(availability.available_mask("L1", ["100", "300", "999", None])) == [False, False, True, True]
+    assert list(availability.available_mask("L2", ["100", "200"])) == [True, False]
+    
+    items = [{"player_id": "100"}, {"player_id": "400"}, {"headline": "no id"}]
+    assert availability.filter_available(items, "L1") == items[1:]
+
+
+def test_roster_cache_ttl_and_etag(fake_sleeper):
+    """Test that fresh entries skip the network and stale ones revalidate."""
+    ingestor = LeagueRosterIngestor(base_url=fake_sleeper, cache_file=None)
+    ingestor.fetch_rostered_players("L1")
+    ingestor.fetch_rostered_players("L1")
+    assert len(FakeSleeperHandler.requests_seen) == 1
+    
+    ingestor.ttl_seconds = 0
+    assert ingestor.fetch_rostered_players("L1") == ["100", "200", "300"]
+    assert FakeSleeperHandler.requests_seen[-1][1] == '"L1-v1"'
+
+
+def test_unknown_league_keeps_everything():
+    """Test that a league without roster data filters nothing."""
+    availability = LeagueAvailability({"L1": ["100"]})
+    
+    assert list(availability.available_mask("other", ["100"])) == [True]
+
+
+def test_available_in_any_league():
+    """Test that a player rostered in one league but free in another is kept, batch by batch."""
+    availability = LeagueAvailability({"L1": ["100", "200"], "L2": ["200"]})
+    
+    assert list(availability.available_in_any_mask(["L1", "L2"], ["100", "200", "300", None])) == [
+        True, False, True, True]
+    assert list(availability.available_in_any_mask(["L1", "missing"], ["200"])) == [True]
+    
+    items = [{"player_id": pid} for pid in ("200", "100", "200", "300")] + [{"headline": "no id"}]
+    assert list(availability.iter_available(iter(items), ["L1", "L2"], batch_size=2)) == [
+        items[1], items[3], items[4]]
@@ -0,0 +1,134 @@
+"""Tests for the LLM response cache."""
+
+import json
+import os
+import time
+
+import src.llm_integration as llm
+from src.llm_cache import ResponseCache, digest_cache_key
+
+
+ITEMS = [
+    {"player_name": "A", "headline": "A signed", "source": "sleeper", "timestamp": "2024-01-01T10:00:00"},
+    {"player_name": "B", "headline": "B injured", "source": "sleeper", "timestamp": "2024-01-01T10:00:00"},
+]
+
+
+def test_key_ignores_order_and_fetch_time():
+    """Test that the same news in another order or fetched later hits the same key, on the same day."""
+    later = [dict(item, timestamp="2024-01-01T11:00:00") for item in reversed(ITEMS)]
+    
+    key = digest_cache_key("m", "p", ITEMS, "2024-01-01")
+    assert key == digest_cache_key("m", "p", later, "2024-01-01")
+    assert key != digest_cache_key("other", "p", ITEMS, "2024-01-01")
+    assert key != digest_cache_key("m", "p", ITEMS[:1], "2024-01-01")
+    # The digest title carries its date, so the next day's digest isn't reused
+    assert key != digest_cache_key("m", "p", ITEMS, "2024-01-02")
+
+
+
+def test_key_ignores_small_trending_count_changes():
+    """Test that a trending count ticking up keeps the key, and a real move changes it."""
+    def trending(count):
+        return [{"player_name": "C", "source": "sleeper", "trend_type": "add", "trend_count": count,
+                 "headline": f"Trending up: {count} adds in last 24 hours",
+                 "summary": f"Player is being added to {count} rosters in the last 24 hours. Status: Active"}]
+
+    key = digest_cache_key("m", "p", trending(1510), "2024-01-01")
+    assert key == digest_cache_key("m", "p", trending(1530), "2024-01-01")
+    assert key != digest_cache_key("m", "p", trending(3000), "2024-01-01")
+
+
+def test_ttl_expiry(tmp_path):
+    """Test that expired entries are ignored and removed."""
+    cache = ResponseCache(str(tmp_path), ttl_seconds=60)
+    cache.put("k", "digest")
+    assert cache.get("k") == "digest"
+    
+    path = tmp_path / "k.json"
+    path.write_text(json.dumps({"created_at": time.time() - 120, "response": "digest"}))
+    
+    assert cache.get("k") is None
+    assert not path.exists()
+
+
+def test_size_eviction_is_lru(tmp_path):
+    """Test that the least recently used entry goes first."""
+    cache = ResponseCache(str(tmp_path), max_bytes=400)
+    cache.put("a", "x" * 100)
+    cache.put("b", "y" * 100)
+    os.utime(tmp_path / "a.json", (time.time() - 10, time.time() - 10))
+    cache.get("a")  # a is now the most recently used
+    os.utime(tmp_path / "b.json", (time.time() - 5, time.time() - 5))
+    
+    cache.put("c", "z" * 100)
+    
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_generate_digest_uses_cache(tmp_path, monkeypatch):
+    """Test that an exact rerun returns the cached digest without an LLM call."""
+    calls = []
+    monkeypatch.setattr(llm, "get_response_cache", lambda: ResponseCache(str(tmp_path)))
+    monkeypatch.setattr(llm, "request_digest", lambda items: calls.append(items) or "# Digest")
+    
+    assert llm.generate_digest(ITEMS) == "# Digest"
+    assert llm.generate_digest(list(reversed(ITEMS))) == "# Digest"
+    assert len(calls) == 1
+    
+    assert llm.generate_digest(ITEMS, use_cache=False) == "# Digest"
+    assert len(calls) == 2
+
+
+def test_no_cache_bypasses_and_refresh_replaces(tmp_path, monkeypatch):
+    """Test that use_cache=False leaves the cache alone and refresh_cache overwrites it."""
+    responses = iter(["# First", "# Bypassed", "# Refreshed"])
+    monkeypatch.setattr(llm, "get_response_cache", lambda: ResponseCache(str(tmp_path)))
+    monkeypatch.setattr(llm, "request_digest", lambda items: next(responses))
+    
+    assert llm.generate_digest(ITEMS) == "# First"
+    assert llm.generate_digest(ITEMS, use_cache=False) == "# Bypassed"
+    assert llm.generate_digest(ITEMS) == "# First"
+    
+    assert llm.generate_digest(ITEMS, refresh_cache=True) == "# Refreshed"
+    assert llm.generate_digest(ITEMS) == "# Refreshed"
+
+
+def test_failed_digest_is_not_cached(tmp_path, monkeypatch):
+    """Test that fallback digests are never cached."""
+    def fail(items):
+        raise RuntimeError("Request timed out")
+    monkeypatch.setattr(llm, "get_response_cache", lambda: ResponseCache(str(tmp_path)))
+    monkeypatch.setattr(llm, "request_digest", fail)
+    
+    llm.generate_digest(ITEMS)
+    
+    assert not list(tmp_path.iterdir())
+
+
+def test_condense_articles_memoizes_by_content(tmp_path, monkeypatch):
+    """Test that only new or changed articles are sent for summarization."""
+    sent = []
+    
+    async def fake_summarize(articles):
+        sent.append([a["headline"] for a in articles])
+        return [f"Condensed {a['headline']}." for a in articles]
+    
+    monkeypatch.setattr(llm, "get_article_summary_cache", lambda: ResponseCache(str(tmp_path)))
+    monkeypatch.setattr(llm, "_summarize_articles", fake_summarize)
+    body = "He was limited in practice. " * 100
+    articles = [{"headline": f"Article {i}", "summary": body, "source": "fantasypros_scraped"} for i in range(3)]
+    short = {"headline": "Trending", "summary": "Short.", "source": "sleeper"}
+    
+    first = llm.condense_articles(articles + [short])
+    assert [item["summary"] for item in first] == ["Condensed Article 0.", "Condensed Article 1.",
+                                                   "Condensed Article 2.", "Short."]
+    assert articles[0]["summary"] == body  # Originals are untouched
+    
+    changed = dict(articles[1], summary=body + "Now questionable.")
+    second = llm.condense_articles([articles[0], changed, articles[2], short])
+    
+    assert sent == [["Article 0", "Article 1", "Article 2"], ["Article 1"]]
+    assert second[0]["summary"] == "Condensed Article 0."
@@ -0,0 +1,48 @@
+"""Tests for deadline-bounded digest generation."""
+
+import time
+
+import src.llm_integration as llm
+from src.llm_integration import generate_digest_by_deadline
+
+
+ITEMS = [{"player_name": "A", "team": "KC", "headline": "A signed", "source": "sleeper",
+          "trend_type": "add", "trend_count": 10, "timestamp": "2024-01-01T10:00:00"}]
+
+
+def test_llm_done_before_deadline(monkeypatch):
+    """Test that an LLM digest finished in time wins."""
+    monkeypatch.setattr(llm, "generate_llm_digest", lambda items, map_reduce, use_cache, refresh_cache: "# LLM")
+    
+    digest, pending = generate_digest_by_deadline(ITEMS, time.monotonic() + 5)
+    
+    assert digest == "# LLM"
+    assert pending is None
+
+
+def test_local_digest_at_deadline_then_upgrade(monkeypatch):
+    """Test that the local digest is returned at the deadline and the LLM can still finish."""
+    def slow(items, map_reduce, use_cache, refresh_cache):
+        time.sleep(0.5)
+        return "# LLM"
+    monkeypatch.setattr(llm, "generate_llm_digest", slow)
+    
+    start = time.monotonic()
+    digest, pending = generate_digest_by_deadline(ITEMS, start + 0.1)
+    
+    assert time.monotonic() - start < 0.4
+    assert digest.startswith("# NFL Daily Fantasy Digest")
+    assert pending.result(timeout=5) == "# LLM"
+
+
+def test_llm_failure_returns_local_without_waiting(monkeypatch):
+    """Test that an LLM error falls back immediately, with nothing to upgrade."""
+    def fail(items, map_reduce, use_cache, refresh_cache):
+        raise RuntimeError("quota exceeded")
+    monkeypatch.setattr(llm, "generate_llm_digest", fail)
+    
+    start = time.monotonic()
+    digest, pending = generate_digest_by_deadline(ITEMS, start + 5)
+    
+    assert time.monotonic() - start < 1
+    assert "A" in digest and pending is None
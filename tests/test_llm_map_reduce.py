@@ -0,0 +1,98 @@
+"""Tests for map-reduce digest generation."""
+
+import asyncio
+from types import SimpleNamespace
+
+import src.llm_integration as llm
+from src.llm_integration import summarize_map_reduce, MAP_SYSTEM_PROMPT
+
+
+class FakeStatusError(Exception):
+    """Stand-in for openai.APIStatusError."""
+
+    def __init__(self, status_code):
+        super().__init__(f"error code {status_code}")
+        self.status_code = status_code
+
+
+class FakeCompletions:
+    """Async stand-in for client.chat.completions that records calls."""
+
+    def __init__(self, fail_on=None, status_code=500):
+        self.calls = []
+        self.fail_on = fail_on
+        self.status_code = status_code
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, messages):
+        self.calls.append(messages)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            is_map = messages[0]["content"] == MAP_SYSTEM_PROMPT
+            if is_map and self.fail_on and self.fail_on in messages[1]["content"]:
+                raise FakeStatusError(self.status_code)
+            kind = "notes" if is_map else "digest"
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=kind))])
+        finally:
+            self.in_flight -= 1
+
+
+def fake_client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+def make_items(n):
+    return [{"player_name": f"Player {i}", "headline": f"Player {i} questionable",
+             "summary": "", "source": "sleeper", "timestamp": "2024-01-01T12:00:00"} for i in range(n)]
+
+
+def test_map_reduce_bounds_concurrency():
+    """Test that chunks are mapped concurrently within the limit, then reduced once."""
+    completions = FakeCompletions()
+    
+    digest = asyncio.run(summarize_map_reduce(make_items(10), fake_client(completions), chunk_size=2, concurrency=3))
+    
+    assert digest == "digest"
+    assert len(completions.calls) == 6  # 5 map calls + 1 reduce
+    assert completions.max_in_flight == 3
+    assert completions.calls[-1][1]["content"].count("\nnotes") == 5
+
+
+def test_map_reduce_retries_and_passes_failed_chunk_through(monkeypatch):
+    """Test that a failing chunk is retried alone, then sent raw to the reduce step."""
+    monkeypatch.setattr(llm, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    completions = FakeCompletions(fail_on="Player 0")
+    
+    digest = asyncio.run(summarize_map_reduce(make_items(4), fake_client(completions),
+                                              chunk_size=2, concurrency=1, retries=1))
+    
+    assert digest == "digest"
+    assert len(completions.calls) == 4  # 2 attempts for the failing chunk, 1 for the other, 1 reduce
+    reduce_prompt = completions.calls[-1][1]["content"]
+    assert "raw items" in reduce_prompt
+    assert "Player 0" in reduce_prompt
+    assert reduce_prompt.count("\nnotes") == 1
+
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    """Test that a 4xx other than 429 fails at once, while 429 is retried."""
+    monkeypatch.setattr(llm, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    for status, attempts in ((400, 1), (429, 3)):
+        completions = FakeCompletions(fail_on="Player 0", status_code=status)
+        asyncio.run(summarize_map_reduce(make_items(4), fake_client(completions),
+                                         chunk_size=2, concurrency=1, retries=2))
+        assert len(completions.calls) == attempts + 2  # Plus the other chunk and the reduce
+
+
+def test_single_chunk_skips_reduce():
+    """Test that a small day is summarized in a single request."""
+    completions = FakeCompletions()
+    
+    digest = asyncio.run(summarize_map_reduce(make_items(3), fake_client(completions), chunk_size=10))
+    
+    assert digest == "digest"
+    assert len(completions.calls) == 1
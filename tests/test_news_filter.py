@@ -1,7 +1,7 @@
 """Tests for news filtering functionality."""
 
 import pytest
-from src.news_filter import is_fantasy_relevant, filter_relevant_news, categorize_news
+from src.news_filter import is_fantasy_relevant, filter_relevant_news, categorize_news, categorize_item, keyword_hits
 
 
 def test_is_fantasy_relevant_injury():
@@ -106,3 +106,53 @@ def test_categorize_news():
     assert len(categories["role_changes"]) == 1
     assert categories["injuries"][0]["player_name"] == "Injured Player"
     assert categories["role_changes"][0]["player_name"] == "Promoted Player"
+
+
+def test_keywords_match_whole_words_only():
+    """Test that short keywords don't match inside longer words."""
+    news_item = {
+        "headline": "Coach talks about feedback from camp",
+        "summary": "Nothing notable",
+        "source": "test",
+    }
+    
+    assert is_fantasy_relevant(news_item) == False
+
+
+def test_keyword_matcher_scan():
+    """Test single-pass hits across categories and multi-word terms."""
+    from src.keyword_matcher import KeywordMatcher
+    
+    matcher = KeywordMatcher({
+        "injuries": ["out", "knee"],
+        "role_changes": ["depth", "depth chart"],
+    })
+    
+    hits = matcher.scan("Ruled OUT with a knee issue; moved up the depth  chart", "about")
+    assert hits == {"injuries": 2, "role_changes": 1}
+    assert matcher.scan("Moved up the depth chart, then ruled out with a knee issue", stop_at="injuries") == {
+        "role_changes": 1, "injuries": 1}
+    assert matcher.terms_found("Depth chart: out, knee") == ["depth chart", "out", "knee"]
+    # Plurals and third-person verbs match their term
+    assert matcher.terms_found("Depth charts show he is out; both knees sore") == ["depth chart", "out", "knee"]
+
+
+def test_inflected_keywords_are_relevant():
+    """Test that a keyword with a trailing "s" still makes news relevant."""
+    assert is_fantasy_relevant({"headline": "Player trades to Bills", "summary": "", "source": "test"})
+
+
+def test_one_scan_gives_relevance_and_category():
+    """Test that classifying from one keyword_hits scan matches the separate checks."""
+    items = [
+        {"headline": "Signed to the practice squad", "summary": "He was also ruled out with a knee injury.", "source": "test"},
+        {"headline": "Coach talks about feedback", "summary": "Nothing notable", "source": "test"},
+        {"headline": "Promoted to starter", "summary": "", "source": "test"},
+        {"source": "sleeper", "trend_type": "drop", "headline": ""},
+    ]
+    
+    for item in items:
+        hits = keyword_hits(item)
+        assert is_fantasy_relevant(item, hits) == is_fantasy_relevant(item)
+        assert categorize_item(item, hits) == categorize_item(item)
+    assert keyword_hits(items[3]) is None
@@ -0,0 +1,64 @@
+"""Tests for the slotted NewsItem record."""
+
+import json
+from src.news_item import NewsItem, json_default
+
+
+def test_news_item_behaves_like_dict():
+    """Test the dict-compatible interface used by existing call sites."""
+    item = NewsItem.from_dict({
+        "player_name": "Test Player",
+        "team": "KC",
+        "source": "sleeper",
+        "trend_type": "add",
+        "timestamp": "2024-01-01T12:30:00",
+        "custom": 1,
+    })
+    
+    assert item["player_name"] == "Test Player"
+    assert item.get("position", "Unknown") == "Unknown"
+    assert "trend_type" in item
+    assert "url" not in item
+    assert item["timestamp"] == "2024-01-01T12:30:00"
+    assert item["custom"] == 1
+    
+    item.setdefault("position", "RB")
+    item["category"] = "trending_up"
+    assert item["position"] == "RB"
+    assert item.to_dict()["category"] == "trending_up"
+    assert not hasattr(item, "__dict__")
+
+
+def test_news_item_interns_and_serializes():
+    """Test interning of categorical fields and JSON serialization."""
+    a = NewsItem(source="".join(["fantasypros", "_scraped"]), headline="a")
+    b = NewsItem(source="fantasypros_scraped", headline="b")
+    
+    assert a["source"] is b["source"]
+    assert json.loads(json.dumps([a], default=json_default)) == [{"headline": "a", "source": "fantasypros_scraped"}]
+    assert a == {"headline": "a", "source": "fantasypros_scraped"}
+
+
+def test_unparseable_timestamp_kept():
+    """Test that odd timestamps round-trip unchanged."""
+    item = NewsItem(timestamp="yesterday")
+    
+    assert item["timestamp"] == "yesterday"
+    assert item.epoch is None
+
+
+def test_timestamp_keeps_its_utc_offset():
+    """Test that an offset timestamp reads back unchanged and parses to the right instant."""
+    item = NewsItem(timestamp="2024-01-01T12:30:00-05:00")
+    
+    assert item["timestamp"] == "2024-01-01T12:30:00-05:00"
+    assert item.epoch == 1704130200.0
+    utc = NewsItem(timestamp="2024-01-01T17:30:00Z")
+    assert utc.epoch == item.epoch
+    assert utc["timestamp"] == "2024-01-01T17:30:00+00:00"
+    # Stored as epoch and offset; the string is rebuilt on read
+    assert item._timestamp == 1704130200.0 and item._utc_offset == -300
+    assert item.to_dict() == {"timestamp": "2024-01-01T12:30:00-05:00"}
+    
+    del item["timestamp"]
+    assert item.epoch is None and "timestamp" not in item
@@ -0,0 +1,66 @@
+"""Tests for the lazy streaming news pipeline."""
+
+import time
+from src.pipeline import iter_sources, build_pipeline
+from src.digest_formatter import render_simple_digest
+from src.keyword_matcher import KeywordMatcher, get_news_matcher
+
+
+def test_iter_sources_interleaves_and_drops_slow_sources():
+    """Test fan-in across sources with a per-source timeout."""
+    def fast():
+        yield {"headline": "a"}
+        yield {"headline": "b"}
+    
+    def slow():
+        time.sleep(1)
+        yield {"headline": "late"}
+    
+    def broken():
+        yield {"headline": "partial"}
+        raise RuntimeError("source down")
+    
+    start = time.monotonic()
+    items = list(iter_sources({"fast": fast, "slow": slow, "broken": broken}, timeouts={"slow": 0.2}))
+    
+    assert sorted(i["headline"] for i in items) == ["a", "b", "partial"]
+    assert time.monotonic() - start < 0.9
+
+
+def test_iter_sources_is_bounded():
+    """Test that a producer can't run ahead of the consumer by more than the buffer."""
+    produced = []
+    
+    def many():
+        for i in range(1000):
+            produced.append(i)
+            yield {"headline": str(i)}
+    
+    stream = iter_sources({"many": many}, timeouts={}, buffer_size=4)
+    next(stream)
+    time.sleep(0.2)
+    
+    assert len(produced) <= 7
+    stream.close()
+
+
+def test_pipeline_renders_stream(monkeypatch):
+    """Test the full lazy chain through rendering, scanning each article's text once."""
+    matcher = get_news_matcher()
+    scans = []
+    monkeypatch.setattr(matcher, "scan", lambda *texts, **kwargs: scans.append(texts) or KeywordMatcher.scan(matcher, *texts, **kwargs))
+    
+    def source():
+        yield {"source": "wire", "headline": "Ruled out with knee injury", "summary": ""}
+        yield {"source": "wire", "headline": "Charity event", "summary": "Nice day"}
+        yield {"source": "sleeper", "trend_type": "add", "player_name": "X", "team": "KC", "trend_count": 9}
+    
+    items = list(build_pipeline({"test": source}))
+    
+    assert [i["headline"] for i in items] == ["Ruled out with knee injury", ""]
+    assert [i["category"] for i in items] == ["injuries", "trending_up"]
+    assert len(scans) == 2
+    
+    digest = "".join(render_simple_digest(iter(items)))
+    assert "## Trending Up (Sleeper)" in digest
+    assert "- **X** (KC) - 9 adds in 24h" in digest
@@ -0,0 +1,84 @@
+"""Tests for the per-player timeline index."""
+
+import time
+
+from src.player_timeline import PlayerTimeline
+
+
+DAY = 86400
+
+
+def news(headline, ts, url, name="Brock Bowers"):
+    return {"player_name": name, "team": "LV", "headline": headline, "source": "fantasypros_scraped",
+            "url": url, "timestamp": ts + DAY / 2}  # Noon, so dates match in any time zone
+
+
+def test_range_queries_and_recent_context(tmp_path):
+    """Test that events come back newest first within the range, and context skips the item itself."""
+    timeline = PlayerTimeline(str(tmp_path / "timeline.db"))
+    items = [news("Bowers limited in practice", 10 * DAY, "u1"),
+             news("Bowers ruled out", 20 * DAY, "u2"),
+             news("Bowers back at practice", 30 * DAY, "u3"),
+             news("Mayer full participant", 25 * DAY, "u4", name="Michael Mayer")]
+    list(timeline.track(items, digest_ref="2025-10-08"))
+
+    key = timeline.player_key(items[0])
+    assert [e["headline"] for e in timeline.events(key, kinds=("news",))] == [
+        "Bowers back at practice", "Bowers ruled out", "Bowers limited in practice"]
+    assert [e["headline"] for e in timeline.events(key, start=15 * DAY, end=30 * DAY, kinds=("news",))] == [
+        "Bowers ruled out"]
+    assert len(timeline.events(key, kinds=("digest",))) == 3
+
+    assert timeline.recent_context(items[2], before=31 * DAY, days=28) == [
+        "Jan 21: Bowers ruled out", "Jan 11: Bowers limited in practice"]
+
+
+def test_context_skips_events_from_the_same_run(tmp_path):
+    """Test that an item doesn't cite another item recorded earlier in the same run."""
+    timeline = PlayerTimeline(str(tmp_path / "timeline.db"))
+    base = (time.time() // DAY - 10) * DAY
+
+    def headlines(item):
+        return [line.split(": ", 1)[1] for line in item.get("recent_context", [])]
+
+    list(timeline.track([news("Bowers limited in practice", base, "u1")]))
+    same_run = list(timeline.track([news("Bowers ruled out", base + DAY, "u2"),
+                                    news("Bowers back at practice", base + 2 * DAY, "u3")]))
+    assert headlines(same_run[0]) == headlines(same_run[1]) == ["Bowers limited in practice"]
+
+    # Re-seeing an earlier story doesn't hide it from later items of the run
+    rerun = list(timeline.track([news("Bowers limited in practice", base, "u1"),
+                                 news("Bowers questionable", base + 3 * DAY, "u5")]))
+    assert headlines(rerun[1]) == ["Bowers back at practice", "Bowers ruled out", "Bowers limited in practice"]
+
+
+def test_rerun_into_the_same_digest_adds_no_context(tmp_path):
+    """Test that a same-day rerun doesn't cite the news the earlier run put in that day's digest."""
+    timeline = PlayerTimeline(str(tmp_path / "timeline.db"))
+    base = (time.time() // DAY - 10) * DAY
+    earlier = news("Bowers limited in practice", base - DAY, "u0")
+    list(timeline.track([earlier], digest_ref="yesterday"))
+    items = [news("Bowers out Sunday", base, "u1"), news("Bowers limited", base, "u2")]
+
+    first = [item.get("recent_context") for item in timeline.track([dict(i) for i in items], digest_ref="today")]
+    second = [item.get("recent_context") for item in timeline.track([dict(i) for i in items], digest_ref="today")]
+    assert first == second
+    assert [line.split(": ", 1)[1] for line in second[0]] == ["Bowers limited in practice"]
+
+
+def test_rerecording_is_idempotent_and_names_link_to_ids(tmp_path):
+    """Test that re-runs don't duplicate events and a trending entry moves name-keyed history to the ID."""
+    timeline = PlayerTimeline(str(tmp_path / "timeline.db"))
+    article = news("Bowers ruled out", 20 * DAY, "u2")
+    timeline.record(article)
+    timeline.record(article)
+    trend = {"player_name": "Brock Bowers", "player_id": "4866", "source": "sleeper", "trend_type": "add",
+             "trend_count": 120, "headline": "Trending up", "timestamp": 21 * DAY}
+    timeline.record(trend)
+    timeline.commit()
+
+    assert timeline.player_key(article) == "id:4866"
+    assert [e["kind"] for e in timeline.events("id:4866")] == ["trend", "news"]
+    assert timeline.events("name:brock bowers") == []
+    # Surname-only names are not identifiable
+    assert timeline.player_key({"player_name": "Allen"}) is None
@@ -0,0 +1,74 @@
+"""Tests for the token-budgeted prompt builder."""
+
+import json
+
+from src.prompt_builder import (
+    count_tokens, estimate_json_tokens, top_sentences, format_prompt_row, build_news_table, PROMPT_COLUMNS,
+)
+
+
+def make_article(i):
+    """Build a long FantasyPros-style item."""
+    filler = "The weather was mild and fans filled the stadium early. " * 40
+    return {
+        "player_name": "Unknown",
+        "team": "Unknown",
+        "position": "Unknown",
+        "headline": f"Article {i}",
+        "summary": filler + f"Player {i} is questionable with a hamstring injury. " + filler,
+        "source": "fantasypros_scraped",
+        "timestamp": "2024-01-01T12:00:00",
+    }
+
+
+def test_top_sentences_keeps_relevant_in_order():
+    """Test that keyword-heavy sentences win and keep their original order."""
+    text = ("The team flew to Denver. He was promoted to starter. "
+            "Lunch was served. He is questionable with an ankle injury.")
+    
+    result = top_sentences(text, max_sentences=2)
+    
+    assert result == "He was promoted to starter. He is questionable with an ankle injury."
+
+
+def test_prompt_row_is_single_line():
+    """Test the compact row format."""
+    row = format_prompt_row({
+        "player_name": "Test Player", "team": "KC", "position": "WR", "source": "sleeper",
+        "trend_type": "add", "trend_count": 120, "headline": "A | B", "summary": "Line one.\nLine two.",
+    })
+    
+    assert "\n" not in row
+    assert row.split("|") == ["Test Player", "KC", "WR", "sleeper", "add 120", "A / B", "Line one. Line two.", ""]
+
+
+def test_build_news_table_respects_budget():
+    """Test packing under the token budget and the savings report."""
+    items = [make_article(i) for i in range(50)]
+    
+    table, stats = build_news_table(items, token_budget=400)
+    
+    assert table.splitlines()[0] == "|".join(PROMPT_COLUMNS)
+    assert count_tokens(table) <= 400
+    assert 0 < stats["items_included"] < 50
+    assert stats["items_included"] + stats["items_dropped"] == 50
+    assert "hamstring injury" in table
+    assert stats["tokens_saved"] > stats["prompt_tokens"]
+
+
+def test_build_news_table_empty():
+    """Test an empty day."""
+    table, stats = build_news_table([])
+    
+    assert table == "|".join(PROMPT_COLUMNS)
+    assert stats["items_included"] == 0
+
+
+def test_raw_json_estimate_tracks_serialized_size():
+    """Test that the raw-JSON estimate is close to the pretty-printed JSON's size."""
+    items = [make_article(i) for i in range(5)] + [{"player_name": "A", "trend_count": 120, "summary": ""}]
+    
+    estimate = sum(estimate_json_tokens(item) for item in items)
+    actual = len(json.dumps(items, indent=2)) / 4
+    
+    assert abs(estimate - actual) < 0.05 * actual
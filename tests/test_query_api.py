@@ -0,0 +1,115 @@
+"""Tests for the local query API."""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from src.player_timeline import PlayerTimeline
+from src.query_api import QueryServer, QueryStore
+
+NOON = datetime(2025, 10, 8, 12).timestamp()
+
+
+def write_article(directory, name, title, url, content):
+    path = directory / "news" / "2025-10-08"
+    path.mkdir(parents=True, exist_ok=True)
+    (path / name).write_text(
+        f"Title: {title}\nAuthor: Staff\nDate: 2025-10-08\nURL: {url}\nSection: news\n"
+        f"Source URL: N/A\nTags: \nScraped: 2025-10-08T12:00:00\n\n{'=' * 50}\n\n{content}\n",
+        encoding="utf-8")
+
+
+def make_store(tmp_path):
+    articles = tmp_path / "scraped_articles"
+    write_article(articles, "a.txt", "Bowers limited with hamstring tightness",
+                  "https://www.fantasypros.com/nfl/news/1/", "Brock Bowers was limited in practice. " * 10)
+    write_article(articles, "b.txt", "Waiver wire targets for Week 6",
+                  "https://www.fantasypros.com/nfl/news/2/", "Pick up these running backs before Sunday. " * 10)
+
+    timeline = PlayerTimeline(str(tmp_path / "timeline.db"))
+    timeline.record({"source": "sleeper", "trend_type": "add", "player_id": "4866", "player_name": "Brock Bowers",
+                     "team": "LV", "trend_count": 900, "timestamp": NOON - 3600})
+    timeline.record({"source": "fantasypros_scraped", "url": "https://www.fantasypros.com/nfl/news/1/",
+                     "player_name": "Brock Bowers", "headline": "Bowers limited with hamstring tightness",
+                     "timestamp": NOON})
+    timeline.close()
+
+    digests = tmp_path / "digests"
+    digests.mkdir()
+    (digests / "daily_digest_20251008.md").write_text("# Digest\n\n- **Brock Bowers** (LV) - hamstring\n")
+
+    store = QueryStore(str(articles), str(tmp_path / "timeline.db"), str(digests))
+    assert store.refresh()
+    return store
+
+
+def get_json(server, target, headers=None):
+    status, response_headers, body = server.respond("GET", target, headers or {})
+    return status, response_headers, json.loads(body) if body else None
+
+
+def test_queries_filter_and_paginate(tmp_path):
+    """Test filters, keyword search, the article-to-player link and paging."""
+    server = QueryServer(make_store(tmp_path))
+
+    _, _, trends = get_json(server, "/trends?player=4866")
+    assert [(t["player"], t["team"], t["count"]) for t in trends["items"]] == [("Brock Bowers", "LV", 900)]
+
+    _, _, articles = get_json(server, "/articles?q=hamstring&team=lv&date=2025-10-08")
+    assert [a["headline"] for a in articles["items"]] == ["Bowers limited with hamstring tightness"]
+    assert articles["items"][0]["player"] == "Brock Bowers"
+
+    _, _, everything = get_json(server, "/search?player=Brock%20Bowers&limit=2")
+    assert everything["total"] == 3 and everything["next_offset"] == 2
+    assert [d["kind"] for d in everything["items"]] == ["article", "news"]
+    _, _, rest = get_json(server, "/search?player=Brock%20Bowers&limit=2&offset=2")
+    assert [d["kind"] for d in rest["items"]] == ["trend"] and rest["next_offset"] is None
+
+    _, _, digests = get_json(server, "/digests?q=hamstring")
+    assert [d["name"] for d in digests["items"]] == ["daily_digest_20251008.md"]
+    status, headers, body = server.respond("GET", "/digests/daily_digest_20251008.md", {})
+    assert status == 200 and headers["Content-Type"].startswith("text/markdown") and body.startswith(b"# Digest")
+
+    assert get_json(server, "/news?limit=0")[0] == 400
+    assert get_json(server, "/news?teams=KC")[0] == 400
+    assert get_json(server, "/nope")[0] == 404
+
+
+def test_etag_revalidation_and_refresh(tmp_path):
+    """Test 304 responses for unchanged data and new ETags once new data is indexed."""
+    store = make_store(tmp_path)
+    server = QueryServer(store)
+
+    status, headers, _ = get_json(server, "/articles")
+    assert get_json(server, "/articles", {"if-none-match": headers["ETag"]})[0] == 304
+
+    assert not store.refresh()
+    write_article(tmp_path / "scraped_articles", "c.txt", "Another story", "https://x/3", "Details here. " * 20)
+    assert store.refresh()
+    status, new_headers, page = get_json(server, "/articles", {"if-none-match": headers["ETag"]})
+    assert status == 200 and new_headers["ETag"] != headers["ETag"] and page["total"] == 3
+
+
+def test_server_keeps_connections_alive(tmp_path):
+    """Test several requests over one HTTP/1.1 connection through the real socket server."""
+    server = QueryServer(make_store(tmp_path))
+
+    async def scenario():
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        statuses = []
+        for target in ("/health", "/news", "/news"):
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            length = int(next(line.split(":")[1] for line in head.split("\r\n")
+                              if line.lower().startswith("content-length")))
+            body = await reader.readexactly(length)
+            statuses.append((head.split(" ")[1], json.loads(body).get("total")))
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return statuses
+
+    assert asyncio.run(scenario()) == [("200", None), ("200", 1), ("200", 1)]
@@ -0,0 +1,62 @@
+"""Tests for batch relevance scoring."""
+
+import time
+import numpy as np
+from src.relevance_scoring import score_news_batch, select_by_score, item_section
+
+
+def make_item(headline, source="fantasypros_scraped", age_hours=0.0, **extra):
+    item = {
+        "headline": headline,
+        "summary": "",
+        "source": source,
+        "timestamp": time.time() - age_hours * 3600,
+    }
+    item.update(extra)
+    return item
+
+
+def test_scores_rank_keyword_hits_and_trends():
+    """Test that injury news and big trends outrank fluff."""
+    items = [
+        make_item("Attends charity event"),
+        make_item("Ruled out with a knee injury"),
+        make_item("Trending up", source="sleeper", trend_count=4000),
+    ]
+    
+    scores = score_news_batch(items)
+    
+    assert scores[1] > scores[0]
+    assert scores[2] > scores[0]
+
+
+def test_recency_decay():
+    """Test that older items score lower than identical fresh ones."""
+    items = [make_item("Questionable with ankle injury"), make_item("Questionable with ankle injury", age_hours=24)]
+    
+    scores = score_news_batch(items)
+    
+    assert scores[0] > scores[1] > 0
+
+    # A negative score doesn't decay toward 0, so age never helps an item
+    falling = [make_item("Attends charity event", source="other", anomaly_score=-3, age_hours=age)
+               for age in (0, 48)]
+    assert score_news_batch(falling)[1] <= score_news_batch(falling)[0] < 0
+
+
+def test_select_by_score_threshold_and_top_k():
+    """Test threshold and top-K selection order."""
+    items = [{"id": i} for i in range(5)]
+    scores = np.array([0.1, 5.0, 3.0, 4.0, 1.0])
+    
+    assert [i["id"] for i in select_by_score(items, scores, top_k=2)] == [1, 3]
+    assert [i["id"] for i in select_by_score(items, scores, threshold=2.0)] == [1, 3, 2]
+    assert [i["id"] for i in select_by_score(items, scores, threshold=4.5, top_k=3)] == [1]
+    assert select_by_score(items, scores, top_k=0) == []
+
+
+def test_item_section_from_url():
+    """Test section detection from the article URL."""
+    assert item_section({"url": "https://www.fantasypros.com/nfl/news/123/x.php"}) == "news"
+    assert item_section({"section": "advice"}) == "advice"
+    assert item_section({}) == "unknown"
@@ -0,0 +1,62 @@
+"""Tests for lease locks and atomic writes."""
+
+import json
+import os
+import time
+
+import pytest
+
+from src.run_coordination import FileLease, LockTimeout, atomic_write, atomic_write_json
+
+
+def test_lease_is_exclusive_until_released(tmp_path):
+    """Test that a second holder can't take a held lease, and can once it is released."""
+    first = FileLease("stage", directory=str(tmp_path))
+    second = FileLease("stage", directory=str(tmp_path))
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    with pytest.raises(LockTimeout):
+        second.acquire(timeout=0.3, poll_seconds=0.05)
+
+    first.release()
+    assert second.try_acquire()
+    second.release()
+    assert not os.path.exists(second.path)
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    """Test that a lease whose holder stopped renewing it can be taken over."""
+    path = tmp_path / "stage.lock"
+    path.write_text(json.dumps({"token": "gone", "pid": 1, "host": "elsewhere",
+                                "acquired_at": time.time() - 120, "expires_at": time.time() - 60}))
+    lease = FileLease("stage", directory=str(tmp_path))
+
+    lease.acquire(timeout=1, poll_seconds=0.05)
+
+    assert lease.holder()["token"] == lease.token
+    lease.release()
+
+
+def test_heartbeat_renews_lease(tmp_path):
+    """Test that a held lease keeps getting extended."""
+    lease = FileLease("stage", lease_seconds=0.3, directory=str(tmp_path))
+    with lease:
+        first_expiry = lease.holder()["expires_at"]
+        time.sleep(0.5)
+        assert lease.holder()["expires_at"] > first_expiry
+        assert not FileLease("stage", directory=str(tmp_path)).try_acquire()
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    """Test that a failed write leaves the previous contents and no temporary files."""
+    path = tmp_path / "state.json"
+    atomic_write_json(str(path), {"version": 1})
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write('{"version": ')
+            raise RuntimeError("interrupted")
+
+    assert json.loads(path.read_text()) == {"version": 1}
+    assert os.listdir(tmp_path) == ["state.json"]
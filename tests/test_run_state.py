@@ -0,0 +1,113 @@
+"""Tests for incremental run state and delta digests."""
+
+import json
+
+from src.digest_renderer import render_digest
+from src.run_state import RunState
+
+
+def trending(player_id, count):
+    return {"source": "sleeper", "trend_type": "add", "player_id": player_id, "player_name": f"Player {player_id}",
+            "team": "KC", "headline": "Trending up", "trend_count": count, "timestamp": 2e9}
+
+
+ARTICLE = {"source": "fantasypros_scraped", "url": "https://www.fantasypros.com/nfl/news/1/",
+           "player_name": "Brock Bowers", "team": "LV", "headline": "Bowers out",
+           "summary": "", "timestamp": 1e9}
+
+
+def run(path, items):
+    state = RunState(path, today="2025-10-08")
+    changed = list(state.changed(items))
+    state.record(changed)
+    with state.delta_digest() as delta:
+        delta_text = "".join(render_digest(delta))
+    with state.daily_digest() as daily:
+        daily_text = "".join(render_digest(daily))
+    state.save()
+    return state, changed, delta_text, daily_text
+
+
+def test_second_run_only_processes_changes(tmp_path):
+    """Test that unchanged items are skipped and moved counts are reported as updates."""
+    path = str(tmp_path / "run_state.json")
+    run(path, [trending("1", 100), trending("2", 50), ARTICLE])
+
+    state, changed, delta, daily = run(path, [trending("1", 105), trending("2", 80), ARTICLE])
+
+    assert [item["player_id"] for item in changed] == ["2"]
+    assert state.skipped == 2
+    assert "## Updated" in delta and "80 adds in 24h (was 50 earlier today)" in delta
+    assert "100 adds in 24h" not in delta
+    # The cumulative digest keeps everything seen today, with the latest entries
+    assert "100 adds in 24h" in daily and "80 adds in 24h" in daily and "Bowers out" in daily
+
+
+def test_small_count_change_in_headline_is_not_an_update(tmp_path):
+    """Test that a trending headline carrying the live count doesn't make every run an update."""
+    path = str(tmp_path / "run_state.json")
+    run(path, [dict(trending("1", 1000), headline="Trending up: 1000 adds in 24h")])
+
+    _, changed, delta, _ = run(path, [dict(trending("1", 1001), headline="Trending up: 1001 adds in 24h")])
+
+    assert changed == [] and "## Updated" not in delta
+
+
+def test_missing_trending_entries_are_resolved(tmp_path):
+    """Test that players who fell off the trending list are resolved once, and return as new."""
+    path = str(tmp_path / "run_state.json")
+    run(path, [trending("1", 100), trending("2", 50)])
+
+    _, _, delta, daily = run(path, [trending("1", 100)])
+    assert "## No Longer Trending\n\n- **Player 2** (KC) - 50 adds in 24h" in delta
+    assert "Player 2" not in daily
+
+    _, _, delta, _ = run(path, [trending("1", 100)])
+    assert "No Longer Trending" not in delta
+
+    _, changed, delta, _ = run(path, [trending("1", 100), trending("2", 60)])
+    assert [item["player_id"] for item in changed] == ["2"]
+    assert "## New Since Last Run" in delta
+
+
+def test_state_starts_over_each_day(tmp_path):
+    """Test that yesterday's state is ignored."""
+    path = tmp_path / "run_state.json"
+    path.write_text(json.dumps({"date": "2025-10-07", "watermark": 3e9,
+                                "stories": {"url:https://www.fantasypros.com/nfl/news/1/": {}}}))
+
+    state, changed, _, _ = run(str(path), [ARTICLE])
+
+    assert changed == [ARTICLE]
+    assert json.loads(path.read_text())["date"] == "2025-10-08"
+
+
+def test_new_report_of_earlier_story_updates_it(tmp_path):
+    """Test that another source's report of a story from an earlier run replaces it instead of repeating it."""
+    path = str(tmp_path / "run_state.json")
+    body = "Brock Bowers suffered a hamstring injury in practice and has been ruled out for Sunday's game. "
+    first = dict(ARTICLE, headline="Bowers ruled out with hamstring injury", summary=body, timestamp=2e9)
+    second = {"source": "sleeper", "url": "https://example.com/bowers", "player_name": "Brock Bowers",
+              "team": "LV", "headline": "Raiders rule out Bowers (hamstring)", "summary": body, "timestamp": 2e9}
+    other = dict(second, url="https://example.com/mahomes", player_name="Patrick Mahomes", team="KC",
+                 headline="Mahomes limited in practice", summary="Patrick Mahomes was limited with an ankle issue.")
+    run(path, [first])
+
+    state = RunState(path, today="2025-10-08")
+    changed = list(state.changed([first, second, other]))
+    assert state.match_reported(changed) == 1
+    assert state.new == [other] and state.updated == [second]
+    state.record(changed)
+    with state.delta_digest() as delta:
+        delta_text = "".join(render_digest(delta))
+    with state.daily_digest() as daily:
+        daily_text = "".join(render_digest(daily))
+    state.save()
+
+    assert "## Updated" in delta_text and "Raiders rule out Bowers" in delta_text
+    assert "Raiders rule out Bowers" in daily_text and "Bowers ruled out with hamstring" not in daily_text
+    assert "Mahomes limited" in daily_text
+
+    # The folded report stays folded on the next run
+    _, changed, _, daily_text = run(path, [first, second, other])
+    assert changed == [] and daily_text.count("Brock Bowers") == 1
@@ -0,0 +1,98 @@
+"""Tests for MinHash-LSH story clustering."""
+
+import numpy as np
+
+from src.news_item import NewsItem
+from src.digest_renderer import digest_entry
+from src.story_clustering import MinHasher, shingles, find_story_clusters, cluster_stories, compact_stories
+
+
+STORY = ("Brock Bowers is not participating in practice on Wednesday. "
+         "He is trying to recover from a knee injury that has been nagging him since the season opener. "
+         "It looks like he may be sidelined in Week 6, and fantasy managers should prepare a backup plan.")
+
+OTHER = ("The Chargers signed Nyheim Hines to their practice squad on Tuesday. "
+         "He has not played a regular season snap since tearing his ACL two years ago. "
+         "Hines is unlikely to have any fantasy relevance this season unless injuries pile up.")
+
+
+def test_minhash_estimates_jaccard():
+    """Test that signature agreement tracks shingle overlap."""
+    hasher = MinHasher(num_perm=256)
+    same = hasher.signature(shingles(STORY))
+    reworded = hasher.signature(shingles(STORY.replace("Wednesday", "Thursday")))
+    different = hasher.signature(shingles(OTHER))
+
+    assert np.array_equal(same, hasher.signature(shingles(STORY)))
+    assert np.mean(same == reworded) > 0.7
+    assert np.mean(same == different) < 0.1
+
+
+def test_reports_of_one_story_are_merged():
+    """Test that the same story from two sources clusters, and unrelated news doesn't."""
+    items = [
+        {"player_name": "Brock Bowers", "headline": "Bowers misses practice", "summary": STORY, "source": "sleeper"},
+        {"player_name": "Nyheim Hines", "headline": "Hines signs", "summary": OTHER, "source": "sleeper"},
+        {"player_name": "Unknown", "headline": "Brock Bowers (knee) not practicing Wednesday",
+         "summary": STORY.replace("Week 6", "the next game"), "source": "fantasypros_scraped",
+         "url": "https://www.fantasypros.com/nfl/news/1/"},
+    ]
+
+    assert find_story_clusters(items) == [[0, 2], [1]]
+
+
+def test_never_merge_different_players_or_pages():
+    """Test that identical text about two players, or on two pages of one site, stays separate."""
+    template = {"headline": "Practice report", "summary": STORY, "source": "fantasypros_scraped"}
+    players = [dict(template, player_name="Brock Bowers"), dict(template, player_name="Michael Mayer")]
+    pages = [dict(template, url="https://www.fantasypros.com/nfl/news/1/"),
+             dict(template, url="https://www.fantasypros.com/nfl/news/2/")]
+    trending = [dict(template, trend_type="add", trend_count=10), dict(template, trend_type="add", trend_count=20)]
+
+    assert find_story_clusters(players) == [[0], [1]]
+    assert find_story_clusters(pages) == [[0], [1]]
+    assert find_story_clusters(trending) == [[0], [1]]
+    # Items with no words at all have nothing in common
+    empty = [{"headline": "", "summary": "", "source": "sleeper"},
+             {"headline": "", "summary": "Nav | Menu", "source": "fantasypros_scraped"}]
+    assert find_story_clusters(empty + players[:1]) == [[0], [1], [2]]
+
+    # Not even through a third item similar to both
+    bridge = dict(template, player_name="Unknown", source="sleeper")
+    assert find_story_clusters([players[0], bridge, players[1]]) == [[0, 1], [2]]
+    assert find_story_clusters([pages[0], bridge, pages[1]]) == [[0, 1], [2]]
+
+
+def test_cluster_stories_keeps_best_report_with_source_counts():
+    """Test that one representative per story carries the cluster's size and sources."""
+    items = [NewsItem.from_dict({"player_name": "Brock Bowers", "headline": "Bowers update",
+                                 "summary": STORY, "source": "fantasypros_scraped"}),
+             NewsItem.from_dict({"player_name": "Brock Bowers", "headline": "Bowers ruled out with knee injury",
+                                 "summary": STORY, "source": "sleeper"}),
+             NewsItem.from_dict({"player_name": "Nyheim Hines", "headline": "Hines signs",
+                                 "summary": OTHER, "source": "sleeper"})]
+
+    stories = cluster_stories(items)
+
+    assert [story["headline"] for story in stories] == ["Bowers ruled out with knee injury", "Hines signs"]
+    assert stories[0]["cluster_size"] == 2
+    assert stories[0]["cluster_sources"] == {"fantasypros_scraped": 1, "sleeper": 1}
+    assert stories[0]["related_headlines"] == ["Bowers update"]
+    assert "cluster_size" not in stories[1]
+    assert cluster_stories([]) == []
+
+
+def test_compact_stories_drop_long_bodies_without_changing_the_digest():
+    """Test that cut summaries cluster and summarize exactly like the full articles."""
+    def items():
+        return [{"player_name": "Brock Bowers", "headline": "Bowers misses practice",
+                 "summary": STORY + " Filler text about the league." * 2000, "source": "fantasypros_scraped"},
+                {"player_name": "Brock Bowers", "headline": "Bowers (knee) not practicing",
+                 "summary": STORY, "source": "sleeper"}]
+
+    compact = list(compact_stories(items()))
+
+    assert all(len(item["summary"]) < 20000 for item in compact)
+    assert compact[1]["summary"] == STORY
+    assert find_story_clusters(compact) == find_story_clusters(items())
+    assert [digest_entry(item, "injuries") for item in compact] == [digest_entry(item, "injuries") for item in items()]
@@ -0,0 +1,60 @@
+"""Tests for trending anomaly detection."""
+
+import numpy as np
+from src.trend_anomaly import score_trend_anomalies, top_k_anomalies, select_trending_players
+from src.trend_store import TrendStore
+
+
+def test_breakout_beats_steady_star():
+    """Test that a sudden riser outscores a player who is always heavily added."""
+    counts = np.array([
+        [5000, 5200, 4900, 5100, 5050],  # Star, always added
+        [10, 12, 8, 11, 900],            # Breakout
+        [20, 25, 22, 18, 21],            # Quiet
+    ], dtype=float)
+    positions = np.array(["RB", "RB", "RB"])
+    
+    scores = score_trend_anomalies(counts, positions)
+    
+    assert scores.argmax() == 1
+    assert scores[0] < scores[1]
+
+
+def test_top_k_anomalies_sorted():
+    """Test that top-K indices come back highest score first."""
+    scores = np.array([0.5, 3.0, -1.0, 2.0, 1.0])
+    
+    assert list(top_k_anomalies(scores, 3)) == [1, 3, 4]
+    assert list(top_k_anomalies(scores, 10)) == [1, 3, 4, 0, 2]
+
+
+def test_select_trending_players_falls_back_without_history(tmp_path):
+    """Test that raw Sleeper order is used until enough polls exist."""
+    store = TrendStore(str(tmp_path))
+    trends = [{"player_id": "1", "count": 300}, {"player_id": "2", "count": 100}]
+    store.append_poll("add", trends, timestamp=0)
+    
+    assert select_trending_players(store, "add", trends, {}, limit=1) == trends[:1]
+
+
+def test_select_trending_players_uses_anomaly_scores(tmp_path):
+    """Test that with history, the breakout player is selected first."""
+    store = TrendStore(str(tmp_path))
+    for poll in range(5):
+        trends = [
+            {"player_id": "star", "count": 5000},
+            {"player_id": "breakout", "count": 900 if poll == 4 else 10},
+        ]
+        store.append_poll("add", trends, timestamp=poll * 3600)
+    details = {"star": {"position": "WR"}, "breakout": {"position": "WR"}}
+    
+    selected = select_trending_players(store, "add", trends, details, limit=2)
+    
+    assert [s["player_id"] for s in selected] == ["breakout", "star"]
+    assert selected[0]["count"] == 900
+    
+    # A failed poll reports nothing rather than the previous poll's list,
+    # and only players on this poll's list are candidates
+    assert select_trending_players(store, "add", [], details, limit=2) == []
+    selected = select_trending_players(store, "add", trends[:1], details, limit=2)
+    assert [(s["player_id"], s["count"]) for s in selected] == [("star", 5000)]
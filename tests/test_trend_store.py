@@ -0,0 +1,41 @@
+"""Tests for the Sleeper trending time-series store."""
+
+import numpy as np
+from src.trend_store import TrendStore
+
+
+def test_append_and_series(tmp_path, monkeypatch):
+    """Test that polls are appended and read back per player, leaving nothing outside the store."""
+    monkeypatch.chdir(tmp_path)
+    store = TrendStore(str(tmp_path / "store"))
+    store.append_poll("add", [{"player_id": "100", "count": 240}, {"player_id": "200", "count": 48}], timestamp=0)
+    store.append_poll("add", [{"player_id": "100", "count": 480}], timestamp=3600)
+    store.append_poll("drop", [{"player_id": "100", "count": 5}], timestamp=3600)
+    
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["store"]
+    
+    timestamps, counts = store.series("100", "add")
+    assert list(timestamps) == [0, 3600]
+    assert list(counts) == [240, 480]
+    
+    # A fresh store instance reads the same history from disk
+    reopened = TrendStore(str(tmp_path / "store"))
+    timestamps, rates = reopened.rate_per_hour("100", "add", days=1, now=3600)
+    assert list(rates) == [10.0, 20.0]
+    assert len(reopened.series("unknown", "add")[0]) == 0
+
+
+def test_matrix_and_dynamics(tmp_path):
+    """Test dense matrix building and velocity/acceleration."""
+    store = TrendStore(str(tmp_path))
+    store.append_poll("add", [{"player_id": "1", "count": 10}, {"player_id": "2", "count": 50}], timestamp=0)
+    store.append_poll("add", [{"player_id": "1", "count": 20}], timestamp=3600)
+    store.append_poll("add", [{"player_id": "1", "count": 50}], timestamp=7200)
+    
+    poll_times, counts = store.matrix("add")
+    assert list(poll_times) == [0, 3600, 7200]
+    np.testing.assert_array_equal(counts, [[10, 20, 50], [50, 0, 0]])
+    
+    dynamics = store.dynamics("add")
+    assert dynamics["1"] == (30.0, 20.0)
+    assert dynamics["2"] == (0.0, 50.0)
@@ -0,0 +1,72 @@
+"""Tests for watchlist matching."""
+
+import json
+
+from src.watchlists import WatchlistIndex, write_watchlist_digests
+
+PLAYERS = {
+    "4866": {"first_name": "Brock", "last_name": "Bowers", "team": "LV", "position": "TE"},
+    "4046": {"first_name": "Patrick", "last_name": "Mahomes", "team": "KC", "position": "QB"},
+    "9999": {"first_name": "Mike", "last_name": "Williams", "team": "NYJ", "position": "WR"},
+    "8888": {"first_name": "Mike", "last_name": "Williams", "team": "PIT", "position": "WR"},
+    "1111": {"first_name": "Retired", "last_name": "Player", "team": None, "position": "RB"},
+    "1": {"first_name": "Josh", "last_name": "Allen", "team": "BUF", "position": "QB"},
+    "2": {"first_name": "Josh", "last_name": "Allen", "team": "JAX", "position": "LB"},
+    "KC": {"first_name": "Kansas City", "last_name": "Chiefs", "team": "KC", "position": "DEF"},
+    "LV": {"first_name": "Las Vegas", "last_name": "Raiders", "team": "LV", "position": "DEF"},
+}
+
+
+def test_items_reach_only_matching_watchlists():
+    """Test matching by ID, name in text, team name and a player's team."""
+    index = WatchlistIndex(PLAYERS)
+    assert index.subscribe("ana", players=["4866"]) == []
+    assert index.subscribe("ben", teams=["kc"]) == []
+    assert index.subscribe("cy", players=["mike  williams", "Nobody Here"], teams=["XYZ"]) == ["Nobody Here", "XYZ"]
+    index.subscribe("dee", teams=["LV"])
+
+    sleeper = {"player_id": "4866", "player_name": "Brock Bowers", "team": "LV", "headline": "Trending add"}
+    article = {"player_name": "Unknown", "headline": "Patrick Mahomes throws for 300 yards"}
+    team_news = {"headline": "Chiefs sign a veteran kicker"}
+    both = {"headline": "Mike Williams traded to the Raiders", "team": "NYJ"}
+    unrelated = {"headline": "Waiver wire targets for Week 6",
+                 "summary": "Add Brock Bowers and Patrick Mahomes' backups everywhere."}
+
+    routes = index.route([sleeper, article, team_news, both, unrelated])
+    assert routes == {"ana": [sleeper], "ben": [article, team_news], "cy": [both], "dee": [sleeper, both]}
+    assert index.entities(both) == {"player:9999", "team:NYJ", "team:LV"}
+
+    # A structured player ID wins over the name it shares with another player
+    index.subscribe("eve", players=["2"])
+    qb = {"player_id": "1", "player_name": "Josh Allen", "team": "BUF", "headline": "Josh Allen trending"}
+    assert index.entities(qb) == {"player:1", "team:BUF"} and index.match(qb) == set()
+    assert index.entities({"headline": "Josh Allen limited in practice"}) == set()
+
+    index.unsubscribe("ben")
+    assert index.match(article) == set() and "team:KC" not in index.subscribers
+
+
+def test_load_and_write_digests(tmp_path, monkeypatch):
+    """Test building the index from a watchlists file and writing per-user digests."""
+    path = tmp_path / "watchlists.json"
+    path.write_text(json.dumps({"ana": {"players": ["Brock Bowers"]}, "b/c": {"teams": ["KC"]}}))
+    index = WatchlistIndex.load(PLAYERS, str(path))
+
+    item = {"player_name": "Brock Bowers", "team": "LV", "position": "TE", "source": "sleeper",
+            "trend_type": "add", "trend_count": 900, "headline": "Brock Bowers trending up", "summary": ""}
+    routes = index.route([item])
+    assert write_watchlist_digests(routes, "daily_digest_20251008.md", output_dir=str(tmp_path / "out")) == 1
+    assert "Brock Bowers" in (tmp_path / "out" / "ana" / "daily_digest_20251008.md").read_text()
+    assert not (tmp_path / "out" / "b_c").exists()
+
+    # An article routed to several users is summarized once
+    summaries = []
+    monkeypatch.setattr("src.digest_renderer.summarize", lambda text, name=None: summaries.append(text) or text)
+    article = {"player_name": "Patrick Mahomes", "team": "KC", "source": "fantasypros_scraped",
+               "headline": "Patrick Mahomes leads comeback", "summary": "Mahomes threw three touchdowns."}
+    index.subscribe("dee", players=["Patrick Mahomes"])
+    routes = index.route([article])
+    assert write_watchlist_digests(routes, "d.md", output_dir=str(tmp_path / "out")) == 2 and len(summaries) == 1
+    assert "three touchdowns" in (tmp_path / "out" / "dee" / "d.md").read_text()
+
+    assert WatchlistIndex.load(PLAYERS, str(tmp_path / "missing.json")).watchlists == {}